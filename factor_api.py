@@ -34,13 +34,278 @@
 
 from __future__ import annotations
 
+import ast
+import functools
+import importlib.util
 import json
+import marshal
+import os
+import threading
+import types
 import warnings
 from pathlib import Path
-from typing import Optional, Dict, List, Any
+from typing import Callable, Optional, Dict, List, Any, Tuple
 
+import numpy as np
 import pandas as pd
 
+from project.factors import fast_ops
+
+
+@functools.lru_cache(maxsize=256)
+def _read_meta(path_str: str, mtime: float) -> Dict[str, Any]:
+    """读取并解析元数据 JSON，按 (路径, 修改时间) 缓存。
+
+    mtime 参与缓存键，元数据文件被重写后自动失效。
+
+    Args:
+        path_str: 元数据文件路径
+        mtime: 文件修改时间戳
+
+    Returns:
+        元数据字典
+    """
+    with open(path_str, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+@functools.lru_cache(maxsize=32)
+def _scan_factor_dirs(store_path_str: str, mtime: float) -> Tuple[str, ...]:
+    """扫描因子库根目录下的因子目录名，按 (路径, 修改时间) 缓存。
+
+    Args:
+        store_path_str: 因子库根目录路径
+        mtime: 根目录修改时间戳
+
+    Returns:
+        排序后的因子名称元组
+    """
+    store_path = Path(store_path_str)
+    return tuple(sorted(d.name for d in store_path.iterdir() if d.is_dir()))
+
+
+# 滚动运算名 -> fast_ops.grouped_rolling 的 op 参数
+_ROLLING_OPS = ("mean", "std", "min", "max", "sum", "skew", "kurt")
+
+
+def _match_groupby_code(node: ast.AST, df_name: str) -> Optional[str]:
+    """匹配 df[<col>].groupby(level="code") 形式的子树，返回列名。
+
+    Args:
+        node: 待匹配的 AST 节点
+        df_name: 因子函数中 DataFrame 形参的名字
+
+    Returns:
+        匹配成功时返回列名，否则返回 None
+    """
+    if not (isinstance(node, ast.Call) and isinstance(node.func, ast.Attribute)):
+        return None
+    if node.func.attr != "groupby" or node.args:
+        return None
+    kw = {k.arg: k.value for k in node.keywords}
+    level = kw.get("level")
+    if not (isinstance(level, ast.Constant) and level.value == "code"):
+        return None
+    target = node.func.value
+    if not (
+        isinstance(target, ast.Subscript)
+        and isinstance(target.value, ast.Name)
+        and target.value.id == df_name
+        and isinstance(target.slice, ast.Constant)
+        and isinstance(target.slice.value, str)
+    ):
+        return None
+    return target.slice.value
+
+
+def _match_factor_shape(node: ast.AST, df_name: str) -> Optional[tuple]:
+    """匹配常见因子表达式形态，返回可直接派发到 fast_ops 的描述元组。
+
+    识别的形态（可带一层取负）：
+    - df[C].groupby(level="code").pct_change(N)
+      -> ("pct_change", C, N)
+    - df[C].groupby(level="code").rolling(window=W).<op>().droplevel(0)
+      -> ("rolling", C, W, op)
+
+    Args:
+        node: return 语句的值表达式
+        df_name: 因子函数中 DataFrame 形参的名字
+
+    Returns:
+        (运算描述..., 是否取负) 元组，不匹配时返回 None
+    """
+    negate = False
+    if isinstance(node, ast.UnaryOp) and isinstance(node.op, ast.USub):
+        negate = True
+        node = node.operand
+
+    if not (isinstance(node, ast.Call) and isinstance(node.func, ast.Attribute)):
+        return None
+
+    # pct_change 形态
+    if node.func.attr == "pct_change" and len(node.args) == 1 and not node.keywords:
+        periods = node.args[0]
+        if not (isinstance(periods, ast.Constant) and isinstance(periods.value, int)):
+            return None
+        col = _match_groupby_code(node.func.value, df_name)
+        if col is None:
+            return None
+        return ("pct_change", col, periods.value, negate)
+
+    # rolling 形态：最外层应为 .droplevel(0)
+    if node.func.attr != "droplevel":
+        return None
+    if not (
+        len(node.args) == 1
+        and isinstance(node.args[0], ast.Constant)
+        and node.args[0].value == 0
+        and not node.keywords
+    ):
+        return None
+    op_call = node.func.value
+    if not (
+        isinstance(op_call, ast.Call)
+        and isinstance(op_call.func, ast.Attribute)
+        and op_call.func.attr in _ROLLING_OPS
+        and not op_call.args
+        and not op_call.keywords
+    ):
+        return None
+    rolling_call = op_call.func.value
+    if not (
+        isinstance(rolling_call, ast.Call)
+        and isinstance(rolling_call.func, ast.Attribute)
+        and rolling_call.func.attr == "rolling"
+    ):
+        return None
+    rkw = {k.arg: k.value for k in rolling_call.keywords}
+    window = rkw.get("window") if rkw else (
+        rolling_call.args[0] if len(rolling_call.args) == 1 else None
+    )
+    if not (isinstance(window, ast.Constant) and isinstance(window.value, int)):
+        return None
+    col = _match_groupby_code(rolling_call.func.value, df_name)
+    if col is None:
+        return None
+    return ("rolling", col, window.value, op_call.func.attr, negate)
+
+
+def _precompile_factor(
+    factor_expr: str, func_name: str
+) -> Optional[Callable[[pd.DataFrame], pd.Series]]:
+    """尝试把因子表达式预编译为对 fast_ops 内核的直接调用。
+
+    在 AST 层识别 factors.py 中最常见的几种因子形态
+    （分组 pct_change、分组 rolling 统计），匹配成功时返回
+    绕过 pandas GroupBy 的闭包；不匹配时返回 None，
+    调用方回退到 exec 路径。
+
+    Args:
+        factor_expr: 因子表达式源代码
+        func_name: 因子函数名（qualname）
+
+    Returns:
+        重写后的因子函数，无法识别时为 None
+    """
+    try:
+        tree = ast.parse(factor_expr)
+    except SyntaxError:
+        return None
+
+    func_def = None
+    for node in ast.walk(tree):
+        if isinstance(node, ast.FunctionDef) and node.name == func_name:
+            func_def = node
+            break
+    if func_def is None or not func_def.args.args:
+        return None
+    df_name = func_def.args.args[0].arg
+
+    # 函数体须是（跳过 docstring 后的）单条 return 语句
+    body = [
+        stmt for stmt in func_def.body
+        if not (isinstance(stmt, ast.Expr) and isinstance(stmt.value, ast.Constant))
+    ]
+    if len(body) != 1 or not isinstance(body[0], ast.Return) or body[0].value is None:
+        return None
+
+    shape = _match_factor_shape(body[0].value, df_name)
+    if shape is None:
+        return None
+
+    if shape[0] == "pct_change":
+        _, col, periods, negate = shape
+
+        def compiled(df: pd.DataFrame) -> pd.Series:
+            result = fast_ops.grouped_pct_change(df[col], periods)
+            return -result if negate else result
+
+    else:
+        _, col, window, op, negate = shape
+
+        def compiled(df: pd.DataFrame) -> pd.Series:
+            result = fast_ops.grouped_rolling(df[col], window, op)
+            return -result if negate else result
+
+    return compiled
+
+
+class FactorGraph:
+    """延迟执行的批量因子计算任务。
+
+    build_graph 返回的轻量句柄：收集一批因子请求后延迟到
+    execute() 一次性计算。执行发生在 fast_ops.memoized_run
+    上下文内，各因子共享的中间量（收益率、滚动统计等）
+    按 (列, 运算, 参数) 去重，只物化一次——公共子表达式
+    消除由运行级缓存完成，无需构建符号表达式树。
+
+    Attributes:
+        factor_names: 待计算的因子名称列表
+    """
+
+    def __init__(
+        self,
+        api: "FactorAPI",
+        factor_names: List[str],
+        data: pd.DataFrame,
+        **compute_kwargs: Any,
+    ) -> None:
+        """初始化计算图。
+
+        Args:
+            api: 所属的 FactorAPI 实例
+            factor_names: 因子名称列表
+            data: 输入数据 DataFrame
+            **compute_kwargs: 透传给 compute_factors 的其余参数
+        """
+        self._api = api
+        self.factor_names = list(factor_names)
+        self._data = data
+        self._compute_kwargs = compute_kwargs
+
+    def add(self, factor_name: str) -> "FactorGraph":
+        """追加一个待计算因子（去重），返回自身便于链式调用。
+
+        Args:
+            factor_name: 因子名称
+
+        Returns:
+            当前 FactorGraph 实例
+        """
+        if factor_name not in self.factor_names:
+            self.factor_names.append(factor_name)
+        return self
+
+    def execute(self) -> Dict[str, pd.Series] | pd.DataFrame:
+        """执行整个批次的因子计算。
+
+        Returns:
+            与 compute_factors 一致的结果（字典或 DataFrame）
+        """
+        return self._api.compute_factors(
+            self.factor_names, self._data, **self._compute_kwargs
+        )
+
 
 class FactorAPI:
     """因子库对外API接口。
@@ -63,6 +328,11 @@ class FactorAPI:
                 f"因子库路径不存在: {self.factor_store_path}\n"
                 f"请先运行因子评价流程生成因子库。"
             )
+        # 编译后的因子函数缓存：键为 (因子名, 版本, 代码哈希)
+        # 避免每次调用 compute_factor 都重新 exec 因子源码
+        self._func_cache: Dict[Tuple[str, str, str], Callable[[pd.DataFrame], pd.Series]] = {}
+        self._module_cache: Dict[Tuple[str, str, str], types.ModuleType] = {}
+        self._func_cache_lock = threading.Lock()
     
     def list_factors(self, include_versions: bool = False) -> List[str] | Dict[str, List[str]]:
         """获取所有已入库的因子名称列表。
@@ -87,22 +357,23 @@ class FactorAPI:
         """
         if not self.factor_store_path.exists():
             return {} if include_versions else []
-        
-        factor_dirs = [d for d in self.factor_store_path.iterdir() if d.is_dir()]
-        
+
+        factor_names = _scan_factor_dirs(
+            str(self.factor_store_path), self.factor_store_path.stat().st_mtime
+        )
+
         if not include_versions:
-            return sorted([d.name for d in factor_dirs])
-        
+            return list(factor_names)
+
         # 包含版本信息
         factor_versions = {}
-        for factor_dir in factor_dirs:
-            factor_name = factor_dir.name
-            meta_dir = factor_dir / "meta"
+        for factor_name in factor_names:
+            meta_dir = self.factor_store_path / factor_name / "meta"
             if meta_dir.exists():
                 versions = sorted([p.stem for p in meta_dir.glob("*.json")])
                 if versions:
                     factor_versions[factor_name] = versions
-        
+
         return dict(sorted(factor_versions.items()))
     
     def get_factor_info(
@@ -163,28 +434,33 @@ class FactorAPI:
                 f"可用版本: {', '.join(versions)}"
             )
         
-        with meta_path.open("r", encoding="utf-8") as f:
-            metadata = json.load(f)
-        
-        return metadata
+        # 按 (路径, mtime) 缓存解析结果，避免重复的 stat+read+parse
+        metadata = _read_meta(str(meta_path), meta_path.stat().st_mtime)
+
+        # 返回浅拷贝，防止调用方修改污染缓存
+        return dict(metadata)
     
     def compute_factor(
         self, 
-        factor_name: str, 
+        factor_name: str,
         data: pd.DataFrame,
         version: Optional[str] = None,
-        validate_fields: bool = True
+        validate_fields: bool = True,
+        dtype_downcast: bool = True
     ) -> pd.Series:
         """计算单个因子的值。
-        
+
         使用因子库中存储的表达式对输入数据计算因子值。
-        
+
         Args:
             factor_name: 因子名称
             data: 输入数据 DataFrame，需包含因子所需字段
                   索引应为 MultiIndex (date, code) 或 DatetimeIndex
             version: 版本号，None 时使用最新版本
             validate_fields: 是否验证输入数据包含所需字段
+            dtype_downcast: 是否将 float64 输入列降为 float32 再计算。
+                因子值下游按秩使用，float32 精度足够，
+                带宽减半可明显加速滚动类计算
         
         Returns:
             因子值 Series，索引与输入数据一致
@@ -217,38 +493,44 @@ class FactorAPI:
         factor_expr = metadata.get("expr")
         if not factor_expr:
             raise RuntimeError(f"因子 '{factor_name}' 缺少表达式代码")
+
+        # 入口处排序一次，后续所有分组/滚动运算都在连续内存上进行
+        if not data.index.is_monotonic_increasing:
+            data = data.sort_index()
+
+        # 降精度：float64 -> float32，滚动计算带宽减半
+        if dtype_downcast:
+            candidates = metadata.get("required_fields") or list(data.columns)
+            downcast_map = {
+                c: "float32"
+                for c in candidates
+                if c in data.columns and data[c].dtype == "float64"
+            }
+            if downcast_map:
+                data = data.astype(downcast_map)
         
         # 执行因子计算
         try:
-            # 创建执行环境
-            # 定义一个空的 register_factor 装饰器（只返回函数本身）
-            def dummy_register_factor(**kwargs):
-                def decorator(func):
-                    return func
-                return decorator
-            
-            exec_globals = {
-                "pd": pd,
-                "register_factor": dummy_register_factor,
-                "__name__": "__main__",
-            }
-            
-            # 执行因子代码（定义函数）
-            exec(factor_expr, exec_globals)
-            
-            # 获取因子函数（使用 qualname）
-            func_name = metadata.get("qualname", factor_name)
-            if func_name not in exec_globals:
-                raise RuntimeError(f"无法找到因子函数 '{func_name}'")
-            
-            factor_func = exec_globals[func_name]
-            
+            # 获取因子函数（缓存命中时跳过 exec）
+            factor_func = self._get_factor_func(factor_name, metadata, factor_expr)
+
             # 计算因子值
             result = factor_func(data)
-            
-            if not isinstance(result, pd.Series):
+
+            # 因子函数可以返回与 data.index 对齐的 ndarray，
+            # 由 API 层统一包装一次，省去每个因子内部的 Series 构造
+            if isinstance(result, np.ndarray):
+                if result.shape != (len(data),):
+                    raise RuntimeError(
+                        f"因子函数返回的数组长度 {result.shape} "
+                        f"与输入数据行数 {len(data)} 不一致"
+                    )
+                result = pd.Series(
+                    result, index=data.index, name=factor_name, copy=False
+                )
+            elif not isinstance(result, pd.Series):
                 raise RuntimeError(
-                    f"因子函数返回类型错误: {type(result)}，应为 pd.Series"
+                    f"因子函数返回类型错误: {type(result)}，应为 pd.Series 或 np.ndarray"
                 )
             
             return result
@@ -257,17 +539,132 @@ class FactorAPI:
             raise RuntimeError(
                 f"计算因子 '{factor_name}' 时发生错误: {str(e)}"
             ) from e
-    
+
+    def _get_factor_func(
+        self,
+        factor_name: str,
+        metadata: Dict[str, Any],
+        factor_expr: str,
+    ) -> Callable[[pd.DataFrame], pd.Series]:
+        """获取因子函数，按 (因子名, 版本, 代码哈希) 缓存编译结果。
+
+        首次调用时编译并执行因子源码提取函数对象，
+        后续调用直接复用缓存的函数，避免重复 exec 开销。
+
+        Args:
+            factor_name: 因子名称
+            metadata: 因子元数据字典
+            factor_expr: 因子表达式源代码
+
+        Returns:
+            因子计算函数
+
+        Raises:
+            RuntimeError: 当无法从表达式中找到因子函数时
+        """
+        version = metadata.get("version", "")
+        key = (factor_name, version, metadata.get("code_hash", ""))
+
+        with self._func_cache_lock:
+            cached = self._func_cache.get(key)
+            if cached is not None:
+                return cached
+
+            func_name = metadata.get("qualname", factor_name)
+
+            # 先尝试 AST 预编译：常见因子形态直接重写为 fast_ops
+            # 内核调用，跳过 exec 和 pandas GroupBy
+            compiled = _precompile_factor(factor_expr, func_name)
+            if compiled is not None:
+                self._func_cache[key] = compiled
+                return compiled
+
+            # 定义一个空的 register_factor 装饰器（只返回函数本身）
+            def dummy_register_factor(**kwargs):
+                def decorator(func):
+                    return func
+                return decorator
+
+            # 每个因子使用一个轻量模块作为执行环境（只构建一次），
+            # 后续调用无需重建 globals 字典
+            module = types.ModuleType(f"factor_{factor_name}_{version}")
+            module.pd = pd
+            module.fast_ops = fast_ops
+            module.register_factor = dummy_register_factor
+
+            # 取预编译字节码（无则编译并落盘），再执行定义函数
+            code_obj = self._load_or_compile(
+                factor_name, version, metadata.get("code_hash", ""), factor_expr
+            )
+            exec(code_obj, module.__dict__)
+
+            # 获取因子函数（使用 qualname）
+            factor_func = getattr(module, func_name, None)
+            if factor_func is None:
+                raise RuntimeError(f"无法找到因子函数 '{func_name}'")
+
+            # 保留模块引用，保证函数的 __globals__ 持续有效
+            self._func_cache[key] = factor_func
+            self._module_cache[key] = module
+            return factor_func
+
+    def _load_or_compile(
+        self,
+        factor_name: str,
+        version: str,
+        code_hash: str,
+        factor_expr: str,
+    ):
+        """加载预编译的因子字节码，没有或失效时编译并落盘。
+
+        字节码以 marshal 格式存放在元数据旁的 {version}.pyc 文件中，
+        连同解释器魔数和代码哈希一起序列化；魔数或哈希不匹配
+        （解释器升级 / 表达式变更）时自动重新编译并覆盖。
+        写入采用临时文件 + os.replace，保证原子性。
+
+        Args:
+            factor_name: 因子名称
+            version: 版本号
+            code_hash: 因子代码哈希（用于失效判断）
+            factor_expr: 因子表达式源代码
+
+        Returns:
+            可直接 exec 的 code 对象
+        """
+        pyc_path = self.factor_store_path / factor_name / "meta" / f"{version}.pyc"
+        if pyc_path.exists():
+            try:
+                magic, stored_hash, code_obj = marshal.loads(pyc_path.read_bytes())
+                if magic == importlib.util.MAGIC_NUMBER and stored_hash == code_hash:
+                    return code_obj
+            except (ValueError, EOFError, TypeError):
+                pass  # 文件损坏，走重新编译路径
+
+        code_obj = compile(factor_expr, f"<factor:{factor_name}:{version}>", "exec")
+        try:
+            payload = marshal.dumps(
+                (importlib.util.MAGIC_NUMBER, code_hash, code_obj)
+            )
+            tmp_path = pyc_path.with_suffix(".pyc.tmp")
+            tmp_path.write_bytes(payload)
+            os.replace(tmp_path, pyc_path)
+        except OSError:
+            pass  # 只读存储时退化为每进程编译
+        return code_obj
+
     def compute_factors(
         self,
         factor_names: List[str],
         data: pd.DataFrame,
         version: Optional[str] = None,
         validate_fields: bool = True,
-        skip_errors: bool = False
-    ) -> Dict[str, pd.Series]:
+        skip_errors: bool = False,
+        dtype_downcast: bool = True,
+        n_jobs: int = 1,
+        output_mode: str = "dict"
+    ) -> Dict[str, pd.Series] | pd.DataFrame:
         """批量计算多个因子的值。
-        
+
         Args:
             factor_names: 因子名称列表
             data: 输入数据 DataFrame
@@ -276,9 +673,18 @@ class FactorAPI:
             skip_errors: 是否跳过计算失败的因子
                 - False (默认): 遇到错误时抛出异常
                 - True: 跳过失败的因子，继续计算其他因子
-        
+            dtype_downcast: 是否将 float64 输入列降为 float32。
+                批量计算时在入口处统一降一次，保证运行级缓存可命中
+            n_jobs: 并行线程数，1 表示串行。pandas/NumPy/numba 内核
+                执行时释放 GIL，多线程可获得接近线性的加速
+            output_mode: 输出格式
+                - "dict" (默认): 因子名 -> Series 字典
+                - "frame": 预分配的 float32 DataFrame（每列一个因子），
+                  各因子结果直接写入列缓冲区，避免逐个构造 Series
+                  后再 concat 的重复索引重建
+
         Returns:
-            字典，键为因子名称，值为因子值 Series
+            字典（键为因子名称，值为因子值 Series）或 DataFrame（"frame" 模式）
             
         Example:
             >>> results = api.compute_factors(
@@ -288,19 +694,52 @@ class FactorAPI:
             >>> for name, values in results.items():
             ...     print(f"{name}: {len(values)} 个值")
         """
+        if output_mode not in ("dict", "frame"):
+            raise ValueError(f"未知的 output_mode: {output_mode}")
+
         results = {}
         errors = {}
-        
-        for factor_name in factor_names:
+
+        # 整批只排序一次，各因子调用入口的单调性检查直接命中
+        if not data.index.is_monotonic_increasing:
+            data = data.sort_index()
+
+        # "frame" 模式：预分配一个 (样本数, 因子数) 的 float32 缓冲区
+        buffer = None
+        col_index = {name: j for j, name in enumerate(factor_names)}
+        if output_mode == "frame":
+            buffer = np.full(
+                (len(data), len(factor_names)), np.nan, dtype=np.float32
+            )
+
+        # 在入口处统一降精度，使各因子调用共享同一份数据和缓存
+        if dtype_downcast:
+            downcast_map = {
+                c: "float32" for c in data.columns if data[c].dtype == "float64"
+            }
+            if downcast_map:
+                data = data.astype(downcast_map)
+
+        def _compute_one(factor_name: str) -> pd.Series:
+            return self.compute_factor(
+                factor_name,
+                data,
+                version=version,
+                validate_fields=validate_fields,
+                dtype_downcast=False
+            )
+
+        def _collect(factor_name: str, getter) -> None:
             try:
-                result = self.compute_factor(
-                    factor_name, 
-                    data, 
-                    version=version,
-                    validate_fields=validate_fields
-                )
-                results[factor_name] = result
-                
+                result = getter()
+                if buffer is not None:
+                    # 直接写入预分配的列缓冲区，不保留中间 Series
+                    if not result.index.equals(data.index):
+                        result = result.reindex(data.index)
+                    buffer[:, col_index[factor_name]] = result.to_numpy()
+                    results[factor_name] = True
+                else:
+                    results[factor_name] = result
             except Exception as e:
                 if skip_errors:
                     errors[factor_name] = str(e)
@@ -310,14 +749,64 @@ class FactorAPI:
                     )
                 else:
                     raise
+
+        # 批量计算期间共享分组运算缓存，相同的中间量（如收益率）只算一次
+        with fast_ops.memoized_run(data):
+            if n_jobs == 1:
+                for factor_name in factor_names:
+                    _collect(factor_name, lambda name=factor_name: _compute_one(name))
+            else:
+                from concurrent.futures import ThreadPoolExecutor
+
+                with ThreadPoolExecutor(max_workers=n_jobs) as pool:
+                    futures = [
+                        (name, pool.submit(_compute_one, name))
+                        for name in factor_names
+                    ]
+                    # 按提交顺序收集，保持结果字典与输入顺序一致
+                    for factor_name, future in futures:
+                        _collect(factor_name, future.result)
         
         if errors and skip_errors:
             print(f"\n警告: {len(errors)} 个因子计算失败:")
             for name, error in errors.items():
                 print(f"  - {name}: {error}")
-        
+
+        if buffer is not None:
+            frame = pd.DataFrame(buffer, index=data.index, columns=list(factor_names))
+            if errors:
+                frame = frame.drop(columns=list(errors))
+            return frame
+
         return results
     
+    def build_graph(
+        self,
+        factor_names: List[str],
+        data: pd.DataFrame,
+        **compute_kwargs: Any,
+    ) -> FactorGraph:
+        """构建延迟执行的批量因子计算图。
+
+        图句柄可以继续 add() 因子，最终 execute() 时整批计算；
+        批内共享的中间量由运行级缓存合并，只算一次。
+
+        Args:
+            factor_names: 初始因子名称列表
+            data: 输入数据 DataFrame
+            **compute_kwargs: 透传给 compute_factors 的其余参数
+                （version、skip_errors、n_jobs、output_mode 等）
+
+        Returns:
+            FactorGraph 实例
+
+        Example:
+            >>> graph = api.build_graph(["volatility_20d"], market_data)
+            >>> graph.add("skewness_20d").add("kurtosis_20d")
+            >>> results = graph.execute()
+        """
+        return FactorGraph(self, factor_names, data, **compute_kwargs)
+
     def get_factor_expression(
         self,
         factor_name: str,
@@ -491,8 +980,16 @@ if __name__ == "__main__":
                 parser.error("compute 命令需要 --data 参数")
             
             print(f"加载数据: {args.data}")
-            data = pd.read_parquet(args.data)
-            
+            # 只读因子需要的列，宽表下大幅减少 IO 和解压
+            required_fields = api.get_factor_info(
+                args.factor, args.version
+            ).get("required_fields")
+            try:
+                data = pd.read_parquet(args.data, columns=required_fields)
+            except (KeyError, ValueError):
+                # 列名不匹配（如索引列未单独存储）时回退到全量读取
+                data = pd.read_parquet(args.data)
+
             print(f"计算因子: {args.factor}")
             result = api.compute_factor(args.factor, data, args.version)
             
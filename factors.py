@@ -25,10 +25,64 @@
         return df["close"].pct_change(20)
 """
 
+import numpy as np
 import pandas as pd
+from project.factors import fast_ops
 from project.factors.registry import register_factor
 
 
+# 日收益率缓存：多个因子对同一个 DataFrame 重复计算
+# close 的日收益率，按 df 对象缓存一次（持有 df 引用保证
+# id 在缓存期间不被复用）
+_returns_cache: dict = {}
+_RETURNS_CACHE_MAX = 4
+
+
+def _daily_returns(df: pd.DataFrame) -> pd.Series:
+    """计算（或从缓存取出）close 的按 code 分组日收益率。
+
+    Args:
+        df: 包含 close 列的 DataFrame
+
+    Returns:
+        日收益率 Series，索引与输入一致
+    """
+    key = id(df)
+    entry = _returns_cache.get(key)
+    if entry is not None and entry[0] is df:
+        return entry[1]
+    returns = fast_ops.grouped_pct_change(df["close"], 1)
+    if len(_returns_cache) >= _RETURNS_CACHE_MAX:
+        _returns_cache.pop(next(iter(_returns_cache)))
+    _returns_cache[key] = (df, returns)
+    return returns
+
+
+# 动量族共用的标准期数：一次调用算齐，三个因子各取一项
+_PRICE_LAGS = (5, 20, 60)
+_price_lags_cache: dict = {}
+
+
+def _price_lags(df: pd.DataFrame) -> dict:
+    """计算（或从缓存取出）close 的 5/20/60 日百分比变化。
+
+    Args:
+        df: 包含 close 列的 DataFrame
+
+    Returns:
+        期数 -> 百分比变化 Series 的字典
+    """
+    key = id(df)
+    entry = _price_lags_cache.get(key)
+    if entry is not None and entry[0] is df:
+        return entry[1]
+    lags = fast_ops.grouped_pct_change_multi(df["close"], list(_PRICE_LAGS))
+    if len(_price_lags_cache) >= _RETURNS_CACHE_MAX:
+        _price_lags_cache.pop(next(iter(_price_lags_cache)))
+    _price_lags_cache[key] = (df, lags)
+    return lags
+
+
 # ============================================================================
 # 动量因子（Momentum Factors）
 # ============================================================================
@@ -51,7 +105,7 @@ def momentum_20d(df: pd.DataFrame) -> pd.Series:
     Returns:
         20日累计收益率 Series
     """
-    return df["close"].groupby(level="code").pct_change(20)
+    return _price_lags(df)[20]
 
 
 @register_factor(
@@ -72,7 +126,7 @@ def momentum_60d(df: pd.DataFrame) -> pd.Series:
     Returns:
         60日累计收益率 Series
     """
-    return df["close"].groupby(level="code").pct_change(60)
+    return _price_lags(df)[60]
 
 
 # ============================================================================
@@ -97,7 +151,7 @@ def reversal_5d(df: pd.DataFrame) -> pd.Series:
     Returns:
         5日累计收益率的负值 Series
     """
-    return -df["close"].groupby(level="code").pct_change(5)
+    return -_price_lags(df)[5]
 
 
 # ============================================================================
@@ -122,8 +176,8 @@ def volatility_20d(df: pd.DataFrame) -> pd.Series:
     Returns:
         20日收益率标准差 Series
     """
-    returns = df["close"].pct_change()
-    return returns.groupby(level="code").rolling(window=20).std().droplevel(0)
+    returns = _daily_returns(df)
+    return fast_ops.grouped_rolling(returns, 20, "std")
 
 
 @register_factor(
@@ -144,8 +198,8 @@ def volatility_60d(df: pd.DataFrame) -> pd.Series:
     Returns:
         60日收益率标准差 Series
     """
-    returns = df["close"].pct_change()
-    return returns.groupby(level="code").rolling(window=60).std().droplevel(0)
+    returns = _daily_returns(df)
+    return fast_ops.grouped_rolling(returns, 60, "std")
 
 
 # ============================================================================
@@ -170,7 +224,7 @@ def volume_ratio_20d(df: pd.DataFrame) -> pd.Series:
     Returns:
         成交量比率 Series
     """
-    vol_ma20 = df["volume"].groupby(level="code").rolling(window=20).mean().droplevel(0)
+    vol_ma20 = fast_ops.grouped_rolling(df["volume"], 20, "mean")
     return df["volume"] / vol_ma20
 
 
@@ -193,7 +247,11 @@ def turnover_rate(df: pd.DataFrame) -> pd.Series:
         换手率代理指标 Series
     """
     # 简化计算：使用成交量/成交额比率作为代理
-    return df["volume"] / (df["amount"] + 1e-6)
+    # 直接在 ndarray 上计算，绕过 pandas 广播/对齐开销，结果只包一次
+    # 掩码除法：零成交额处输出 NaN 而非扰动后的伪值
+    volume = df["volume"].to_numpy()
+    amount = df["amount"].to_numpy()
+    return pd.Series(fast_ops.safe_div(volume, amount), index=df.index)
 
 
 # ============================================================================
@@ -218,7 +276,7 @@ def price_to_ma20(df: pd.DataFrame) -> pd.Series:
     Returns:
         价格/均线比率 Series
     """
-    ma20 = df["close"].groupby(level="code").rolling(window=20).mean().droplevel(0)
+    ma20 = fast_ops.grouped_rolling(df["close"], 20, "mean")
     return df["close"] / ma20
 
 
@@ -240,7 +298,14 @@ def high_low_spread(df: pd.DataFrame) -> pd.Series:
     Returns:
         日内振幅比率 Series
     """
-    return (df["high"] - df["low"]) / df["close"]
+    # 直接在 ndarray 上计算，绕过 pandas 广播/对齐开销；减法结果
+    # 被除法原地覆盖，两步运算只分配一个缓冲区
+    high = df["high"].to_numpy()
+    low = df["low"].to_numpy()
+    close = df["close"].to_numpy()
+    out = np.subtract(high, low)
+    np.divide(out, close, out=out)
+    return pd.Series(out, index=df.index)
 
 
 # ============================================================================
@@ -266,14 +331,11 @@ def residual_momentum(df: pd.DataFrame) -> pd.Series:
     Returns:
         残差动量 Series
     """
-    returns = df["close"].groupby(level="code").pct_change(20)
-    # 计算每日市场平均收益率（简化版，实际应使用市值加权）
-    market_returns = returns.groupby(level="date").mean()
+    returns = fast_ops.grouped_pct_change(df["close"], 20)
+    # 计算每日市场平均收益率并广播回每行（简化版，实际应使用市值加权）
+    market_returns = returns.groupby(level="date").transform("mean")
     # 计算残差
-    residual = returns.groupby(level="date", group_keys=False).apply(
-        lambda x: x - market_returns.loc[x.name]
-    )
-    return residual
+    return returns - market_returns
 
 
 @register_factor(
@@ -295,8 +357,8 @@ def momentum_acceleration(df: pd.DataFrame) -> pd.Series:
     Returns:
         动量加速度 Series
     """
-    mom_10 = df["close"].groupby(level="code").pct_change(10)
-    mom_20 = df["close"].groupby(level="code").pct_change(20)
+    mom_10 = fast_ops.grouped_pct_change(df["close"], 10)
+    mom_20 = fast_ops.grouped_pct_change(df["close"], 20)
     return mom_10 - mom_20
 
 
@@ -319,9 +381,8 @@ def reversal_momentum_combo(df: pd.DataFrame) -> pd.Series:
     Returns:
         组合因子 Series
     """
-    reversal = -df["close"].groupby(level="code").pct_change(5)
-    momentum = df["close"].groupby(level="code").pct_change(60)
-    return reversal * 0.3 + momentum * 0.7  # 权重组合
+    # 权重组合：反转(-5日)权重0.3，动量(60日)权重0.7，单次排序融合计算
+    return fast_ops.grouped_pct_change_combo(df["close"], [(5, -0.3), (60, 0.7)])
 
 
 # ============================================================================
@@ -346,10 +407,10 @@ def downside_volatility(df: pd.DataFrame) -> pd.Series:
     Returns:
         20日下行波动率 Series
     """
-    returns = df["close"].groupby(level="code").pct_change()
+    returns = _daily_returns(df)
     # 只保留负收益
     downside_returns = returns.where(returns < 0, 0)
-    return downside_returns.groupby(level="code").rolling(window=20).std().droplevel(0)
+    return fast_ops.grouped_rolling(downside_returns, 20, "std")
 
 
 @register_factor(
@@ -370,8 +431,8 @@ def skewness_20d(df: pd.DataFrame) -> pd.Series:
     Returns:
         20日偏度 Series
     """
-    returns = df["close"].groupby(level="code").pct_change()
-    return returns.groupby(level="code").rolling(window=20).skew().droplevel(0)
+    returns = _daily_returns(df)
+    return fast_ops.grouped_rolling(returns, 20, "skew")
 
 
 @register_factor(
@@ -392,8 +453,8 @@ def kurtosis_20d(df: pd.DataFrame) -> pd.Series:
     Returns:
         20日峰度 Series
     """
-    returns = df["close"].groupby(level="code").pct_change()
-    return returns.groupby(level="code").rolling(window=20).kurt().droplevel(0)
+    returns = _daily_returns(df)
+    return fast_ops.grouped_rolling(returns, 20, "kurt")
 
 # ============================================================================
 # 区间/形态/突破类因子
@@ -417,7 +478,7 @@ def breakout_20d(df: pd.DataFrame) -> pd.Series:
     Returns:
         突破幅度 Series（0表示未突破，>0表示突破程度）
     """
-    high_20 = df["high"].groupby(level="code").shift(1).rolling(window=20).max().droplevel(0)
+    high_20 = fast_ops.grouped_rolling(fast_ops.grouped_shift(df["high"], 1), 20, "max")
     # 突破幅度 = (当前价 - 20日最高) / 20日最高
     return (df["close"] - high_20) / high_20
 
@@ -440,10 +501,10 @@ def support_resistance(df: pd.DataFrame) -> pd.Series:
     Returns:
         区间位置指标（0-1之间）Series
     """
-    low_20 = df["low"].groupby(level="code").rolling(window=20).min().droplevel(0)
-    high_20 = df["high"].groupby(level="code").rolling(window=20).max().droplevel(0)
-    # 归一化位置 = (当前价 - 最低) / (最高 - 最低)
-    return (df["close"] - low_20) / (high_20 - low_20 + 1e-6)
+    low_20, high_20 = fast_ops.grouped_rolling_min_max(df["low"], df["high"], 20)
+    # 归一化位置 = (当前价 - 最低) / (最高 - 最低)；零区间处为 NaN
+    position = fast_ops.safe_div(df["close"] - low_20, high_20 - low_20)
+    return pd.Series(position, index=df.index)
 
 
 @register_factor(
@@ -466,12 +527,14 @@ def pattern_flag(df: pd.DataFrame) -> pd.Series:
         旗形信号强度 Series
     """
     # 前期上涨幅度
-    prior_gain = df["close"].groupby(level="code").pct_change(10)
+    prior_gain = fast_ops.grouped_pct_change(df["close"], 10)
     # 近期振幅
     recent_range = (df["high"] - df["low"]) / df["close"]
-    recent_range_avg = recent_range.groupby(level="code").rolling(window=5).mean().droplevel(0)
+    recent_range_avg = fast_ops.grouped_rolling(recent_range, 5, "mean")
     # 旗形信号 = 前期涨幅 * (1 / 近期振幅)，振幅越小信号越强
-    return prior_gain / (recent_range_avg + 1e-6)
+    # 零振幅处为 NaN，不再用扰动项防零除
+    signal = fast_ops.safe_div(prior_gain, recent_range_avg)
+    return pd.Series(signal, index=df.index)
 
 
 @register_factor(
@@ -492,8 +555,8 @@ def ma_crossover(df: pd.DataFrame) -> pd.Series:
     Returns:
         均线距离比率 Series
     """
-    ma5 = df["close"].groupby(level="code").rolling(window=5).mean().droplevel(0)
-    ma20 = df["close"].groupby(level="code").rolling(window=20).mean().droplevel(0)
+    ma5 = fast_ops.grouped_rolling(df["close"], 5, "mean")
+    ma20 = fast_ops.grouped_rolling(df["close"], 20, "mean")
     return (ma5 - ma20) / ma20
 
 
@@ -519,14 +582,11 @@ def price_volume_correlation(df: pd.DataFrame) -> pd.Series:
     Returns:
         20日量价相关系数 Series
     """
-    price_chg = df["close"].groupby(level="code").pct_change()
-    vol_chg = df["volume"].groupby(level="code").pct_change()
-    
-    def rolling_corr(group):
-        return group["price"].rolling(window=20).corr(group["volume"])
-    
-    temp_df = pd.DataFrame({"price": price_chg, "volume": vol_chg})
-    return temp_df.groupby(level="code", group_keys=False).apply(rolling_corr)
+    price_chg = df["close"].groupby(level="code").pct_change(fill_method=None)
+    vol_chg = df["volume"].groupby(level="code").pct_change(fill_method=None)
+    # 由滚动均值/标准差原语组合的分组滚动相关，
+    # 免去逐组 apply 和临时 DataFrame
+    return fast_ops.grouped_rolling_corr(price_chg, vol_chg, 20)
 
 
 @register_factor(
@@ -547,8 +607,9 @@ def volume_price_trend(df: pd.DataFrame) -> pd.Series:
     Returns:
         VPT指标 Series
     """
-    price_chg = df["close"].groupby(level="code").pct_change()
-    vpt = (price_chg * df["volume"]).groupby(level="code").cumsum()
+    price_chg = df["close"].groupby(level="code").pct_change(fill_method=None)
+    # 累计和链条用 float64 累加，避免 float32 输入下的漂移
+    vpt = (price_chg * df["volume"]).astype(np.float64).groupby(level="code").cumsum()
     return vpt
 
 
@@ -570,12 +631,20 @@ def obv_normalized(df: pd.DataFrame) -> pd.Series:
     Returns:
         归一化OBV Series
     """
-    price_chg = df["close"].groupby(level="code").diff()
-    # 价格上涨计为正成交量，下跌为负
-    signed_volume = df["volume"] * price_chg.apply(lambda x: 1 if x > 0 else (-1 if x < 0 else 0))
-    obv = signed_volume.groupby(level="code").cumsum()
+    price_chg = fast_ops.grouped_diff(df["close"], 1)
+    # 价格上涨计为正成交量，下跌为负；np.sign 单次向量化扫描，
+    # 避免逐元素的 Python lambda 调用。首日 diff 为 NaN，
+    # 与原实现一致计为 0
+    sign = np.sign(price_chg.to_numpy())
+    sign[np.isnan(sign)] = 0.0
+    # 累计和链条用 float64 累加，避免 float32 输入下的漂移
+    signed_volume = pd.Series(
+        df["volume"].to_numpy(dtype=np.float64) * sign, index=df.index
+    )
+    # 块偏移技巧的分组累计和：一次全局 cumsum 减去组前缀
+    obv = fast_ops.grouped_cumsum(signed_volume)
     # 标准化：除以20日移动平均
-    obv_ma20 = obv.groupby(level="code").rolling(window=20).mean().droplevel(0)
+    obv_ma20 = fast_ops.grouped_rolling(obv, 20, "mean")
     return obv / (obv_ma20.abs() + 1e-6)
 
 
@@ -602,20 +671,8 @@ def money_flow_index(df: pd.DataFrame) -> pd.Series:
     # 资金流量
     money_flow = typical_price * df["volume"]
     
-    # 价格变动方向
-    price_diff = typical_price.groupby(level="code").diff()
-    
-    def calc_mfi(group):
-        if len(group) < 14:
-            return pd.Series(index=group.index, dtype=float)
-        
-        pos_flow = (group * (price_diff.loc[group.index] > 0)).rolling(14).sum()
-        neg_flow = (group * (price_diff.loc[group.index] < 0)).rolling(14).sum()
-        
-        mfi = 100 - (100 / (1 + pos_flow / (neg_flow.abs() + 1e-6)))
-        return mfi
-    
-    return money_flow.groupby(level="code", group_keys=False).apply(calc_mfi)
+    # 单遍内核维护正/负资金流运行和，取代逐组 apply + 两次滚动求和
+    return fast_ops.grouped_mfi(typical_price, money_flow, 14)
 
 
 # ============================================================================
@@ -641,11 +698,11 @@ def amihud_illiquidity(df: pd.DataFrame) -> pd.Series:
     Returns:
         Amihud非流动性指标 Series
     """
-    returns = df["close"].groupby(level="code").pct_change().abs()
+    returns = _daily_returns(df).abs()
     # 非流动性 = |收益率| / 成交额
     illiq = returns / (df["amount"] + 1e-6)
     # 取20日平均
-    return illiq.groupby(level="code").rolling(window=20).mean().droplevel(0)
+    return fast_ops.grouped_rolling(illiq, 20, "mean")
 
 
 @register_factor(
@@ -668,7 +725,7 @@ def turnover_volatility(df: pd.DataFrame) -> pd.Series:
     """
     # 简化换手率
     turnover = df["volume"] / (df["amount"] + 1e-6)
-    return turnover.groupby(level="code").rolling(window=20).std().droplevel(0)
+    return fast_ops.grouped_rolling(turnover, 20, "std")
 
 
 @register_factor(
@@ -689,21 +746,9 @@ def volume_trend(df: pd.DataFrame) -> pd.Series:
     Returns:
         成交量趋势斜率 Series
     """
-    def calc_slope(series):
-        if len(series) < 2:
-            return 0
-        x = range(len(series))
-        y = series.values
-        # 简单线性回归斜率
-        x_mean = sum(x) / len(x)
-        y_mean = sum(y) / len(y)
-        numerator = sum((x[i] - x_mean) * (y[i] - y_mean) for i in range(len(x)))
-        denominator = sum((x[i] - x_mean) ** 2 for i in range(len(x)))
-        return numerator / (denominator + 1e-6)
-    
-    return df["volume"].groupby(level="code").rolling(window=20).apply(
-        calc_slope, raw=False
-    ).droplevel(0)
+    # 闭式解滚动 OLS 斜率：单遍运行和增量更新，
+    # 取代逐窗口调用 Python 回归函数的 rolling.apply
+    return fast_ops.grouped_rolling_slope(df["volume"], 20)
 
 
 @register_factor(
@@ -729,7 +774,7 @@ def bid_ask_spread_proxy(df: pd.DataFrame) -> pd.Series:
     vol_adj = df["volume"] ** (1/3) + 1e-6
     spread_proxy = range_hl / vol_adj
     # 标准化：除以20日均值
-    spread_ma20 = spread_proxy.groupby(level="code").rolling(window=20).mean().droplevel(0)
+    spread_ma20 = fast_ops.grouped_rolling(spread_proxy, 20, "mean")
     return spread_proxy / (spread_ma20 + 1e-6)
 
 
@@ -751,8 +796,11 @@ def zero_volume_days(df: pd.DataFrame) -> pd.Series:
     Returns:
         零成交日比例 Series
     """
-    zero_vol = (df["volume"] == 0).astype(int)
-    return zero_vol.groupby(level="code").rolling(window=20).mean().droplevel(0)
+    # 布尔掩码只占 1 字节/元素，到滚动核前才升为 float32，
+    # 避免 astype(int) 生成 int64 中间列（8 字节/元素）
+    mask = df["volume"].to_numpy() == 0
+    zero_vol = pd.Series(mask.astype(np.float32), index=df.index)
+    return fast_ops.grouped_rolling(zero_vol, 20, "mean")
 
 
 # ============================================================================
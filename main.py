@@ -34,6 +34,7 @@
 """
 
 import argparse
+import hashlib
 import sys
 from datetime import datetime
 from pathlib import Path
@@ -126,8 +127,8 @@ class FactorPipeline:
         print(f"   因子库: {library_root}")
         
         # 评价历史记录
-        self.history = EvaluationHistory("factor_evaluation_history.json")
-        print(f"   评价历史: factor_evaluation_history.json")
+        self.history = EvaluationHistory("factor_evaluation_history.db")
+        print(f"   评价历史: factor_evaluation_history.db")
         print()
         
     def run(
@@ -137,10 +138,11 @@ class FactorPipeline:
         mode: str = "admit",
         factor_names: Optional[List[str]] = None,
         skip_evaluated: bool = True,
-        force_factors: Optional[List[str]] = None
+        force_factors: Optional[List[str]] = None,
+        n_jobs: int = 1
     ) -> pd.DataFrame:
         """运行因子全流程
-        
+
         Args:
             start: 开始日期 (YYYY-MM-DD)
             end: 结束日期 (YYYY-MM-DD)
@@ -148,7 +150,10 @@ class FactorPipeline:
             factor_names: 指定因子列表（None 表示全部）
             skip_evaluated: 是否跳过已评价的因子（默认 True）
             force_factors: 强制重新评价的因子列表（即使已评价过）
-            
+            n_jobs: 并行线程数，1 表示串行。各因子的计算+评价相互
+                独立，底层 numpy/numba 内核执行时释放 GIL，
+                多线程即可跨核并行；并行时各因子的日志会交错输出
+
         Returns:
             结果汇总 DataFrame
         """
@@ -241,10 +246,11 @@ class FactorPipeline:
             print(f"   日期范围: {market_data.index.get_level_values('date').min()} 至 "
                   f"{market_data.index.get_level_values('date').max()}")
             
-            fwd_returns = build_forward_returns(
-                df=market_data,
+            fwd_returns = self._load_or_build_forward_returns(
+                market_data=market_data,
                 horizons=all_horizons,
-                price_col="close"
+                start=start_ts,
+                end=end_ts
             )
             print(f"   ✓ 已构建 {len(all_horizons)} 个窗口的前瞻收益: {all_horizons}")
             print()
@@ -256,13 +262,8 @@ class FactorPipeline:
         universe_mask = self.universe.mask(market_data)
         
         # 批量处理因子
-        results = []
-        for i, factor_name in enumerate(factors_to_process, 1):
-            print("-" * 80)
-            print(f"[{i}/{len(factors_to_process)}] 处理因子: {factor_name}")
-            print("-" * 80)
-            
-            result = self._process_single_factor(
+        def _process(factor_name: str) -> dict:
+            return self._process_single_factor(
                 factor_name=factor_name,
                 start=start_ts,
                 end=end_ts,
@@ -270,10 +271,32 @@ class FactorPipeline:
                 universe_mask=universe_mask,
                 mode=mode
             )
+
+        results = []
+        date_range = f"{start} to {end}"
+        if n_jobs == 1:
+            pending = [
+                (name, None) for name in factors_to_process
+            ]
+        else:
+            # 前瞻收益和 universe 掩码通过闭包共享，无需拷贝；
+            # 历史记录在收集阶段串行写入
+            from concurrent.futures import ThreadPoolExecutor
+
+            pool = ThreadPoolExecutor(max_workers=n_jobs)
+            pending = [
+                (name, pool.submit(_process, name)) for name in factors_to_process
+            ]
+
+        for i, (factor_name, future) in enumerate(pending, 1):
+            print("-" * 80)
+            print(f"[{i}/{len(factors_to_process)}] 处理因子: {factor_name}")
+            print("-" * 80)
+
+            result = _process(factor_name) if future is None else future.result()
             results.append(result)
-            
+
             # 记录评价历史
-            date_range = f"{start} to {end}"
             self.history.record_evaluation(
                 factor_name=factor_name,
                 status=result["status"],
@@ -286,13 +309,124 @@ class FactorPipeline:
                 error=result.get("error")
             )
             print()
-        
+
+        if n_jobs != 1:
+            pool.shutdown()
+
+        # 历史记录按批落盘，收尾时确保剩余记录写入
+        self.history.flush()
+
         # 生成汇总报告
         summary_df = self._generate_summary(results)
         self._print_summary(summary_df, mode)
         
         return summary_df
     
+    def _load_or_build_forward_returns(
+        self,
+        market_data: pd.DataFrame,
+        horizons: List[int],
+        start: Optional[pd.Timestamp],
+        end: Optional[pd.Timestamp],
+    ) -> Dict[int, pd.Series]:
+        """加载（或构建并缓存）前瞻收益。
+
+        前瞻收益只依赖 close 列和窗口列表，因子开发迭代中通常
+        反复使用同一份；按 (start, end, horizons, 数据规模, 数据
+        文件指纹) 生成键，缓存到因子库目录下的 _fwd_cache/，
+        命中时直接读 parquet 跳过整列扫描。数据文件被改写后
+        指纹变化，旧缓存自动失效。
+
+        Args:
+            market_data: 含 close 列的市场数据
+            horizons: 需要的时间窗口列表
+            start: 开始时间
+            end: 结束时间
+
+        Returns:
+            字典，键为时间窗口，值为对应的前瞻收益率 Series
+        """
+        try:
+            stat = Path(self.source.path).stat()
+            fingerprint = f"{stat.st_mtime_ns}-{stat.st_size}"
+        except (AttributeError, OSError):
+            fingerprint = ""  # 数据源不落地文件时退化为仅按日期范围寻址
+        raw = f"{start}|{end}|{tuple(horizons)}|{len(market_data)}|{fingerprint}"
+        key = hashlib.blake2b(raw.encode()).hexdigest()[:16]
+        cache_dir = Path(self.config["library"]["root"]) / "_fwd_cache" / key
+        if cache_dir.exists():
+            try:
+                fwd_returns = {
+                    h: pd.read_parquet(cache_dir / f"{h}.parquet")["r"].rename(
+                        f"fwd_ret_{h}"
+                    )
+                    for h in horizons
+                }
+                print(f"   ✓ 命中前瞻收益缓存: {cache_dir}")
+                return fwd_returns
+            except (OSError, KeyError):
+                pass  # 缓存不完整或损坏，回退到重新计算
+
+        fwd_returns = build_forward_returns(
+            df=market_data,
+            horizons=horizons,
+            price_col="close"
+        )
+        cache_dir.mkdir(parents=True, exist_ok=True)
+        for h, ret in fwd_returns.items():
+            ret.to_frame("r").to_parquet(cache_dir / f"{h}.parquet")
+        return fwd_returns
+
+    def _compute_factor_cached(
+        self,
+        factor_name: str,
+        spec,
+        start: Optional[pd.Timestamp],
+        end: Optional[pd.Timestamp],
+    ) -> pd.Series:
+        """计算（或从磁盘缓存取出）因子值。
+
+        按 (因子名, 版本, 日期范围, 数据文件指纹) 内容寻址，缓存
+        到因子库目录下的 _factor_cache/。反复调整入库阈值重跑
+        管道时，因子值本身不变，命中缓存即可跳过重算；版本号
+        升级或数据文件更新后键变化，自动失效。
+
+        Args:
+            factor_name: 因子名称
+            spec: 因子规范（提供 version）
+            start: 开始时间
+            end: 结束时间
+
+        Returns:
+            因子值 Series
+        """
+        try:
+            stat = Path(self.source.path).stat()
+            fingerprint = f"{stat.st_mtime_ns}-{stat.st_size}"
+        except (AttributeError, OSError):
+            fingerprint = ""  # 数据源不落地文件时退化为仅按日期范围寻址
+        raw = f"{start}|{end}|{fingerprint}"
+        key = hashlib.blake2b(raw.encode()).hexdigest()[:16]
+        cache_dir = Path(self.config["library"]["root"]) / "_factor_cache"
+        path = cache_dir / f"{factor_name}_{spec.version}_{key}.parquet"
+        if path.exists():
+            try:
+                values = pd.read_parquet(path)["value"].rename(factor_name)
+                print("      ✓ 命中因子值缓存")
+                return values
+            except (OSError, KeyError):
+                pass  # 缓存损坏，回退到重新计算
+
+        values = self.engine.compute(
+            factor_name=factor_name,
+            start=start,
+            end=end,
+            universe=None  # 使用默认 universe
+        )
+        cache_dir.mkdir(parents=True, exist_ok=True)
+        values.to_frame("value").to_parquet(path)
+        return values
+
     def _process_single_factor(
         self,
         factor_name: str,
@@ -333,11 +467,11 @@ class FactorPipeline:
             
             # 1. 计算因子值
             print("   🧮 计算因子值...")
-            factor_values = self.engine.compute(
+            factor_values = self._compute_factor_cached(
                 factor_name=factor_name,
+                spec=spec,
                 start=start,
-                end=end,
-                universe=None  # 使用默认 universe
+                end=end
             )
             print(f"      ✓ 因子值数量: {len(factor_values):,}")
             
@@ -1,14 +1,73 @@
 """Data source abstractions and implementations for market data."""
 from __future__ import annotations
 
-import hashlib
-import json
 from abc import ABC, abstractmethod
 from functools import lru_cache
 from pathlib import Path
 from typing import Iterable, Optional
 
+import numpy as np
 import pandas as pd
+import pyarrow as pa
+import pyarrow.dataset as ds
+from pyarrow import csv as pa_csv
+
+try:
+    import polars as pl
+
+    POLARS_AVAILABLE = True
+except ImportError:  # pragma: no cover - polars 为可选加速依赖
+    POLARS_AVAILABLE = False
+
+
+@lru_cache(maxsize=4)
+def _read_file_cached(path: str, mtime_ns: int, size: int) -> pd.DataFrame:
+    """按 (路径, mtime, 大小) 缓存整文件读取结果。
+
+    模块级缓存：多个数据源实例指向同一文件时只读一次磁盘；
+    文件被改写后 mtime/大小变化，键失配自动失效。调用方必须
+    对返回值做浅拷贝再修改（pandas 写时复制保证父帧不被污染）。
+
+    Args:
+        path: 文件的绝对路径字符串
+        mtime_ns: 文件修改时间（纳秒）
+        size: 文件字节数
+
+    Returns:
+        原始 DataFrame
+    """
+    p = Path(path)
+    if p.suffix.lower() == ".parquet":
+        return pd.read_parquet(p)
+    return pd.read_csv(p)
+
+
+@lru_cache(maxsize=8)
+def _parquet_dataset_cached(path: str, mtime_ns: int, size: int) -> ds.Dataset:
+    """按 (路径, mtime, 大小) 缓存 parquet 数据集句柄。
+
+    数据集对象持有已解析的 footer 元数据，可被反复扫描；
+    缓存后同一文件的多次投影读取只解析一次 footer。文件被
+    改写后键失配自动失效。
+
+    Args:
+        path: 文件的绝对路径字符串
+        mtime_ns: 文件修改时间（纳秒）
+        size: 文件字节数
+
+    Returns:
+        可重复扫描的 pyarrow Dataset
+    """
+    # pre_buffer/use_buffered_stream 把逐列块的小读合并成
+    # 少量大读，高延迟存储（NFS/对象存储）上减少停顿
+    fmt = ds.ParquetFileFormat(
+        default_fragment_scan_options=ds.ParquetFragmentScanOptions(
+            pre_buffer=True,
+            use_buffered_stream=True,
+            buffer_size=1 << 20,
+        )
+    )
+    return ds.dataset(path, format=fmt)
 
 
 class MarketDataSource(ABC):
@@ -44,6 +103,33 @@ class MarketDataSource(ABC):
             包含市场数据的 DataFrame，索引为 MultiIndex(date, code)
         """
 
+    def load_arrays(
+        self,
+        start: Optional[pd.Timestamp] = None,
+        end: Optional[pd.Timestamp] = None,
+        fields: Optional[Iterable[str]] = None,
+        freq: str = "1d",
+    ) -> tuple[pd.MultiIndex, dict[str, np.ndarray]]:
+        """按列数组形式加载市场数据。
+
+        面向数值计算路径：返回共享的 MultiIndex 和各字段的底层
+        ndarray（零拷贝视图），调用方可以在连续数组上计算，
+        绕过逐步构造 Series/DataFrame 的索引机制。
+
+        Args:
+            start: 起始日期，None 表示从数据最早日期开始
+            end: 结束日期，None 表示到数据最晚日期
+            fields: 需要的字段列表，None 表示加载所有字段
+            freq: 数据频率，默认 "1d" 表示日频
+
+        Returns:
+            (MultiIndex, 字段名到 ndarray 的字典) 元组
+        """
+        df = self.load(start=start, end=end, fields=fields, freq=freq)
+        return df.index, {
+            col: df[col].to_numpy(copy=False) for col in df.columns
+        }
+
 
 class LocalParquetSource(MarketDataSource):
     """本地 Parquet/CSV 文件数据源实现。
@@ -56,45 +142,145 @@ class LocalParquetSource(MarketDataSource):
     Attributes:
         path: 数据文件路径
         cache: 是否启用缓存机制
+        downcast: 是否将 float64 行情列降为 float32
+        engine: 读取引擎（"pandas" 或 "polars"）
     """
 
-    def __init__(self, path: str | Path, cache: bool = True) -> None:
+    def __init__(
+        self,
+        path: str | Path,
+        cache: bool = True,
+        downcast: bool = True,
+        engine: str = "pandas",
+        price_dtype: str = "float32",
+    ) -> None:
         """初始化本地数据源。
-        
+
         Args:
             path: 数据文件路径（支持 .parquet 和 .csv 格式）
             cache: 是否启用 LRU 缓存，默认 True
+            downcast: 是否在加载时将 float64 列降为 float32，默认 True。
+                因子值下游按秩使用，float32 精度足够，滚动类计算的
+                内存带宽减半；需要双精度累加的环节（累计和等）
+                由计算方自行提升
+            engine: 读取引擎，默认 "pandas"。"polars" 时 Parquet 走
+                polars.scan_parquet 的惰性扫描，谓词/投影在 Rust
+                读取器内部下推，行组并行解码；polars 未安装或文件
+                为 CSV 时回退到 pandas 路径
+            price_dtype: downcast 启用时行情列的目标浮点类型，
+                默认 "float32"
         """
         self.path = Path(path)
         self.cache = cache
+        self.downcast = downcast
+        self.engine = engine
+        self.price_dtype = price_dtype
+
+    def _read(
+        self,
+        fields: Optional[Iterable[str]] = None,
+        start: Optional[pd.Timestamp] = None,
+        end: Optional[pd.Timestamp] = None,
+    ) -> tuple[pd.DataFrame, bool]:
+        """读取文件内容，尽量把列裁剪和日期过滤下推到读取器。
+
+        Parquet 分支通过 pyarrow 的 columns/filters 参数实现
+        投影和谓词下推：只解码请求的列块，并利用行组统计
+        信息跳过日期范围之外的行组，读取字节数随裁剪比例
+        下降。CSV 分支下推列选择（usecols）。下推失败时
+        （如 date 列为字符串无法与时间戳比较）回退为全量读取，
+        由调用方在 pandas 侧过滤。
+
+        Args:
+            fields: 需要的字段列表，None 表示全部
+            start: 起始日期（用于行组过滤）
+            end: 结束日期（用于行组过滤）
 
-    def _read(self) -> pd.DataFrame:
-        """读取文件内容。
-        
-        根据文件后缀名选择相应的读取方法。
-        
         Returns:
-            原始 DataFrame
-            
+            (原始 DataFrame, 是否成功下推过滤) 元组
+
         Raises:
             ValueError: 当文件类型不支持时
         """
-        if self.path.suffix.lower() == ".parquet":
-            df = pd.read_parquet(self.path)
-        elif self.path.suffix.lower() == ".csv":
-            df = pd.read_csv(self.path)
-        else:
-            raise ValueError(f"Unsupported file type: {self.path.suffix}")
-        return df
+        columns = None
+        if fields is not None:
+            # date/code 是索引键，必须随任何字段子集一起读出
+            columns = list(dict.fromkeys(["date", "code", *fields]))
+        suffix = self.path.suffix.lower()
+        if columns is None and start is None and end is None and suffix in (".parquet", ".csv"):
+            # 无裁剪的全量读取走跨实例的模块级缓存；浅拷贝交给
+            # 调用方，写时复制保证 _normalize 的就地改写不污染缓存
+            stat = self.path.stat()
+            df = _read_file_cached(
+                str(self.path.resolve()), stat.st_mtime_ns, stat.st_size
+            )
+            return df.copy(deep=False), False
+        if suffix == ".parquet":
+            expr = None
+            if start is not None:
+                expr = ds.field("date") >= pd.to_datetime(start)
+            if end is not None:
+                cond = ds.field("date") <= pd.to_datetime(end)
+                expr = cond if expr is None else (expr & cond)
+            try:
+                stat = self.path.stat()
+                dataset = _parquet_dataset_cached(
+                    str(self.path.resolve()), stat.st_mtime_ns, stat.st_size
+                )
+                table = dataset.to_table(columns=columns, filter=expr)
+                return table.to_pandas(), expr is not None
+            except (pa.ArrowInvalid, pa.ArrowTypeError, pa.ArrowNotImplementedError):
+                # 文件内 date 类型与过滤值不可比较等情况，退回全量读取
+                df = pd.read_parquet(self.path, columns=columns)
+                return df, False
+        elif suffix == ".csv":
+            # pyarrow 多线程分块解析；列裁剪在转换阶段完成
+            table = pa_csv.read_csv(
+                self.path,
+                read_options=pa_csv.ReadOptions(
+                    block_size=64 << 20, use_threads=True
+                ),
+                convert_options=pa_csv.ConvertOptions(include_columns=columns),
+            )
+            return table.to_pandas(self_destruct=True), False
+        raise ValueError(f"Unsupported file type: {self.path.suffix}")
+
+    def _read_polars(
+        self,
+        fields: Optional[Iterable[str]],
+        start: Optional[pd.Timestamp],
+        end: Optional[pd.Timestamp],
+    ) -> pd.DataFrame:
+        """通过 polars 惰性扫描读取 Parquet 文件。
+
+        scan_parquet 构建惰性查询计划，filter/select 在 collect
+        时下推进 Rust 读取器内部，行组并行解码且不物化中间帧。
+
+        Args:
+            fields: 需要的字段列表，None 表示全部
+            start: 起始日期
+            end: 结束日期
+
+        Returns:
+            已按日期过滤、列裁剪的原始 DataFrame（含 date/code 列）
+        """
+        lf = pl.scan_parquet(self.path, parallel="row_groups", low_memory=False)
+        if start is not None:
+            lf = lf.filter(pl.col("date") >= pd.to_datetime(start))
+        if end is not None:
+            lf = lf.filter(pl.col("date") <= pd.to_datetime(end))
+        if fields is not None:
+            lf = lf.select(list(dict.fromkeys(["date", "code", *fields])))
+        return lf.collect().to_pandas()
 
     def _normalize(self, df: pd.DataFrame) -> pd.DataFrame:
         """规范化数据格式。
         
         执行以下操作：
         1. 验证必需的 date 和 code 列是否存在
-        2. 将 date 列转换为 datetime 类型
+        2. 将 date 列转换为 datetime 类型，code 列转为分类类型
         3. 设置 (date, code) 为 MultiIndex
-        4. 对索引进行排序
+        4. 对索引进行排序（已有序时跳过）
         
         Args:
             df: 原始 DataFrame
@@ -107,10 +293,24 @@ class LocalParquetSource(MarketDataSource):
         """
         if "date" not in df.columns or "code" not in df.columns:
             raise ValueError("Input data must contain 'date' and 'code' columns")
-        df = df.copy()
+        # df 由 _read 新建，可以就地改写，省一次全帧拷贝
         df["date"] = pd.to_datetime(df["date"])
+        if pd.api.types.is_string_dtype(df["code"]) or df["code"].dtype == object:
+            # 字典编码：字符串代码变整数码，省内存且后续按 code/date
+            # 的 groupby 哈希整数而非字符串
+            df["code"] = df["code"].astype("category")
         df.set_index(["date", "code"], inplace=True)
-        df.sort_index(inplace=True)
+        if not df.index.is_monotonic_increasing:
+            # Parquet 落盘时通常已按 (date, code) 排好，跳过冗余排序
+            df.sort_index(inplace=True)
+        if self.downcast:
+            downcast_map = {
+                c: self.price_dtype
+                for c in df.columns
+                if df[c].dtype == "float64"
+            }
+            if downcast_map:
+                df = df.astype(downcast_map)
         return df
 
     def _filter_range(
@@ -126,11 +326,13 @@ class LocalParquetSource(MarketDataSource):
         Returns:
             过滤后的 DataFrame
         """
-        if start is not None:
-            df = df[df.index.get_level_values(0) >= pd.to_datetime(start)]
-        if end is not None:
-            df = df[df.index.get_level_values(0) <= pd.to_datetime(end)]
-        return df
+        if start is None and end is None:
+            return df
+        s = pd.to_datetime(start) if start is not None else None
+        e = pd.to_datetime(end) if end is not None else None
+        # _normalize 保证索引有序：日期层切片走二分查找，不再
+        # 物化全长日期数组和布尔掩码
+        return df.loc[(slice(s, e), slice(None)), :]
 
     def _filter_fields(self, df: pd.DataFrame, fields: Optional[Iterable[str]]) -> pd.DataFrame:
         """选择指定的字段。
@@ -152,26 +354,6 @@ class LocalParquetSource(MarketDataSource):
             raise KeyError(f"Requested fields missing in data: {missing}")
         return df[list(fields)]
 
-    def _cache_key(
-        self, start: Optional[pd.Timestamp], end: Optional[pd.Timestamp], fields: Optional[Iterable[str]], freq: str
-    ) -> str:
-        """生成缓存键。
-        
-        基于查询参数生成唯一的 MD5 哈希值作为缓存键。
-        
-        Args:
-            start: 起始日期
-            end: 结束日期
-            fields: 字段列表
-            freq: 数据频率
-            
-        Returns:
-            缓存键（MD5 哈希字符串）
-        """
-        fields_tuple = tuple(sorted(fields)) if fields is not None else None
-        raw = json.dumps({"start": str(start), "end": str(end), "fields": fields_tuple, "freq": freq})
-        return hashlib.md5(raw.encode()).hexdigest()
-
     def load(
         self,
         start: Optional[pd.Timestamp] = None,
@@ -183,19 +365,72 @@ class LocalParquetSource(MarketDataSource):
             raise ValueError("LocalParquetSource currently supports only daily frequency")
 
         if self.cache:
-            return self._cached_load(start, end, None if fields is None else tuple(fields), freq)
+            # 缓存键直接用可哈希的原生元组：日期归一化为纳秒整数，
+            # 整数哈希只需几十纳秒，远快于 json+MD5 的字符串序列化
+            start_key = None if start is None else pd.Timestamp(start).value
+            end_key = None if end is None else pd.Timestamp(end).value
+            return self._cached_load(start_key, end_key, None if fields is None else tuple(fields), freq)
         return self._load_impl(start, end, fields, freq)
 
     @lru_cache(maxsize=16)
     def _cached_load(
         self,
-        start: Optional[pd.Timestamp],
-        end: Optional[pd.Timestamp],
+        start_ns: Optional[int],
+        end_ns: Optional[int],
         fields: Optional[tuple[str, ...]],
         freq: str,
     ) -> pd.DataFrame:
+        start = None if start_ns is None else pd.Timestamp(start_ns)
+        end = None if end_ns is None else pd.Timestamp(end_ns)
         return self._load_impl(start, end, fields, freq)
 
+    def iter_load(
+        self,
+        start: Optional[pd.Timestamp] = None,
+        end: Optional[pd.Timestamp] = None,
+        fields: Optional[Iterable[str]] = None,
+        batch_rows: int = 250_000,
+    ):
+        """流式加载：按批产出规范化后的数据切片。
+
+        面向大于内存的 Parquet 文件：扫描器逐行组解码并按
+        batch_rows 切批，峰值内存从 O(文件) 降到 O(批)。列裁剪
+        和日期过滤与 load 相同的方式下推。各批内部保证有序，
+        批之间按文件行组顺序产出（本项目落盘前按 date 排序，
+        因此整体也按日期递增）。
+
+        Args:
+            start: 起始日期
+            end: 结束日期
+            fields: 需要的字段列表，None 表示全部
+            batch_rows: 每批最大行数，默认 250_000
+
+        Yields:
+            规范化后的 DataFrame 切片（MultiIndex (date, code)）
+
+        Raises:
+            ValueError: 当文件不是 Parquet 格式时
+        """
+        if self.path.suffix.lower() != ".parquet":
+            raise ValueError("iter_load requires a parquet file")
+        columns = None
+        if fields is not None:
+            columns = list(dict.fromkeys(["date", "code", *fields]))
+        expr = None
+        if start is not None:
+            expr = ds.field("date") >= pd.to_datetime(start)
+        if end is not None:
+            cond = ds.field("date") <= pd.to_datetime(end)
+            expr = cond if expr is None else (expr & cond)
+        stat = self.path.stat()
+        scanner = _parquet_dataset_cached(
+            str(self.path.resolve()), stat.st_mtime_ns, stat.st_size
+        ).scanner(columns=columns, filter=expr, batch_size=batch_rows)
+        for batch in scanner.to_batches():
+            if batch.num_rows == 0:
+                continue
+            yield self._normalize(pa.Table.from_batches([batch]).to_pandas())
+
     def _load_impl(
         self,
         start: Optional[pd.Timestamp],
@@ -203,8 +438,17 @@ class LocalParquetSource(MarketDataSource):
         fields: Optional[Iterable[str]],
         freq: str,
     ) -> pd.DataFrame:
-        df = self._read()
+        if (
+            self.engine == "polars"
+            and POLARS_AVAILABLE
+            and self.path.suffix.lower() == ".parquet"
+        ):
+            df, range_pushed = self._read_polars(fields, start, end), True
+        else:
+            df, range_pushed = self._read(fields, start, end)
         df = self._normalize(df)
-        df = self._filter_range(df, start, end)
+        if not range_pushed:
+            df = self._filter_range(df, start, end)
+        # 列裁剪已在 _read 中完成，这里仅校验字段齐全并统一列序
         df = self._filter_fields(df, fields)
         return df
@@ -5,26 +5,54 @@ import argparse
 from pathlib import Path
 from typing import Optional
 
+import numpy as np
 import pandas as pd
+import pyarrow as pa
+from pyarrow import csv as pa_csv
+
+
+# 行情列在加载时即降为窄类型：OHLC 6-7 位有效数字 float32 足够，
+# 内存带宽减半；需要双精度累加的环节由计算方自行提升
+_PRICE_DTYPES = {
+    "open": "float32",
+    "high": "float32",
+    "low": "float32",
+    "close": "float32",
+}
 
 
 def load_raw(path: str | Path) -> pd.DataFrame:
     """加载原始 CSV 或 Parquet 文件。
-    
+
+    价格列（OHLC）统一降为 float32。CSV 走 pyarrow 的多线程
+    分块解析器：按 64 MiB 块切分后各核并行分词，且价格列在
+    解析阶段直接按目标类型读入，跳过先读 float64 再转换的一趟；
+    Parquet 读后转换。
+
     Args:
         path: 文件路径
-        
+
     Returns:
         加载的 DataFrame
-        
+
     Raises:
         ValueError: 当文件类型不支持时
     """
     path = Path(path)
     if path.suffix.lower() == ".parquet":
-        return pd.read_parquet(path)
+        df = pd.read_parquet(path)
+        cast = {c: t for c, t in _PRICE_DTYPES.items() if c in df.columns}
+        return df.astype(cast, copy=False) if cast else df
     if path.suffix.lower() == ".csv":
-        return pd.read_csv(path)
+        table = pa_csv.read_csv(
+            path,
+            read_options=pa_csv.ReadOptions(block_size=64 << 20, use_threads=True),
+            convert_options=pa_csv.ConvertOptions(
+                column_types={c: pa.float32() for c in _PRICE_DTYPES}
+            ),
+        )
+        # self_destruct: 转换过程中逐列释放 arrow 内存，峰值不翻倍
+        return table.to_pandas(self_destruct=True)
     raise ValueError(f"Unsupported file type: {path.suffix}")
 
 
@@ -41,29 +69,56 @@ def clean(df: pd.DataFrame) -> pd.DataFrame:
     Returns:
         清洗后的 DataFrame
     """
-    df = df.drop_duplicates()
+    # (date, code) 是自然主键，去重只需哈希这两列而非整行；
+    # 缺少键列的非标准输入退回整行去重
+    if {"date", "code"}.issubset(df.columns):
+        df = df.drop_duplicates(subset=["date", "code"], keep="last")
+    else:
+        df = df.drop_duplicates()
     if {"close", "open", "high", "low"}.issubset(df.columns):
         price_cols = ["close", "open", "high", "low"]
-        for col in price_cols:
-            df.loc[df[col] == 0, col] = pd.NA
+        # 整块取出为 float ndarray，一次就地写 NaN，替代逐列的
+        # 布尔掩码赋值（每列两趟遍历）；与 load_raw 一致用 float32
+        arr = df[price_cols].to_numpy(dtype=np.float32, copy=True)
+        arr[arr == 0] = np.nan
+        df[price_cols] = arr
     return df
 
 
-def persist_processed(df: pd.DataFrame, dst: str | Path) -> Path:
+def persist_processed(
+    df: pd.DataFrame,
+    dst: str | Path,
+    compression: str = "zstd",
+    row_group_size: int = 250_000,
+) -> Path:
     """将处理后的数据写入 Parquet 文件。
-    
-    自动创建目标目录（如果不存在）。
-    
+
+    自动创建目标目录（如果不存在）。写入参数面向下游读取
+    优化：zstd 在解码速度相近的前提下比 snappy 省约一半磁盘；
+    code 列字典编码后缩小数倍；先按 date 排序再分行组，行组的
+    min/max 统计紧凑，读取侧的日期范围过滤能整组跳过。
+
     Args:
         df: 待保存的 DataFrame
         dst: 目标文件路径
-        
+        compression: 压缩算法，默认 "zstd"
+        row_group_size: 每个行组的行数，默认 250_000
+
     Returns:
         保存文件的 Path 对象
     """
     dst = Path(dst)
     dst.parent.mkdir(parents=True, exist_ok=True)
-    df.to_parquet(dst)
+    if "date" in df.columns and not df["date"].is_monotonic_increasing:
+        df = df.sort_values("date", kind="stable")
+    df.to_parquet(
+        dst,
+        engine="pyarrow",
+        compression=compression,
+        row_group_size=row_group_size,
+        use_dictionary=["code"] if "code" in df.columns else False,
+        data_page_size=1 << 20,
+    )
     return dst
 
 
@@ -4,6 +4,7 @@ from __future__ import annotations
 from abc import ABC, abstractmethod
 from typing import Optional
 
+import numpy as np
 import pandas as pd
 
 
@@ -84,8 +85,14 @@ class CompositeUniverse(Universe):
         Returns:
             组合后的布尔掩码 Series
         """
-        mask = None
-        for uni in self.universes:
-            current = uni.mask(data)
-            mask = current if mask is None else (mask & current)
-        return mask if mask is not None else pd.Series(True, index=data.index)
+        if not self.universes:
+            return pd.Series(True, index=data.index)
+        # 先收集各子掩码的 ndarray，再一次 reduce 合并，避免每步
+        # 的 pandas 对齐和临时布尔 Series 分配
+        arrs = [
+            uni.mask(data).to_numpy(dtype=bool, copy=False)
+            for uni in self.universes
+        ]
+        out = np.empty_like(arrs[0])
+        np.logical_and.reduce(arrs, axis=0, out=out)
+        return pd.Series(out, index=data.index, copy=False)
@@ -58,7 +58,10 @@ class ICThresholdRule(AdmissionRule):
         Returns:
             (是否通过, 说明) 元组
         """
-        for h, metrics in report.metrics.items():
+        # 按 |IC| 降序检查：最可能达标的窗口在前，命中即返回
+        for h, metrics in sorted(
+            report.metrics.items(), key=lambda kv: -abs(kv[1].rank_ic_mean)
+        ):
             if abs(metrics.rank_ic_mean) >= self.min_ic and abs(metrics.icir) >= self.min_icir:
                 return True, f"horizon {h} passed IC thresholds (IC={metrics.rank_ic_mean:.4f}, ICIR={metrics.icir:.4f})"
         return False, "No horizon meets IC thresholds"
@@ -90,9 +93,13 @@ class TurnoverRule(AdmissionRule):
         Returns:
             (是否通过, 说明) 元组
         """
-        for h, metrics in report.metrics.items():
+        # 按换手率升序检查：最低者不过则全部不过
+        for h, metrics in sorted(
+            report.metrics.items(), key=lambda kv: kv[1].turnover_adjusted
+        ):
             if metrics.turnover_adjusted <= self.max_turnover_adj:
                 return True, f"horizon {h} passes turnover threshold"
+            break
         return False, "Turnover too high for all horizons"
 
 
@@ -137,7 +144,9 @@ class FactorAdmissionStandard:
     Attributes:
         rules: 入库规则列表
     """
-    
+
+    _JUDGE_CACHE_MAX = 1024
+
     def __init__(self, rules: Iterable[AdmissionRule]) -> None:
         """初始化入库标准。
         
@@ -145,21 +154,85 @@ class FactorAdmissionStandard:
             rules: 入库规则的可迭代对象
         """
         self.rules = list(rules)
+        # judge 结果按报告指标签名缓存：规则调参扫描会对同一份
+        # 报告反复判定，命中后 O(1) 返回
+        self._judge_cache: dict = {}
 
-    def judge(self, report: FactorReport) -> tuple[bool, List[str]]:
+    def judge(
+        self, report: FactorReport, early_exit: bool = False
+    ) -> tuple[bool, List[str]]:
         """判断因子是否可入库。
-        
+
         检查所有规则，收集未通过规则的原因。
-        
+
         Args:
             report: 因子评价报告
-            
+            early_exit: 为 True 时首个未通过规则即返回，不再收集
+                后续失败原因（调用方只关心能否入库时用）
+
         Returns:
             (是否全部通过, 未通过原因列表) 元组
         """
+        sig = (
+            report.factor_name,
+            early_exit,
+            tuple(
+                (h, m.rank_ic_mean, m.icir, m.turnover_adjusted)
+                for h, m in sorted(report.metrics.items())
+            ),
+        )
+        cached = self._judge_cache.get(sig)
+        if cached is not None:
+            return cached[0], list(cached[1])
+
         reasons: List[str] = []
         for rule in self.rules:
             passed, msg = rule.check(report)
             if not passed:
                 reasons.append(msg)
+                if early_exit:
+                    break
+        if len(self._judge_cache) >= self._JUDGE_CACHE_MAX:
+            self._judge_cache.pop(next(iter(self._judge_cache)))
+        self._judge_cache[sig] = (len(reasons) == 0, list(reasons))
         return len(reasons) == 0, reasons
+
+    def judge_batch(
+        self, reports: Iterable[FactorReport]
+    ) -> List[Tuple[bool, List[str]]]:
+        """批量判定多份报告是否可入库。
+
+        便宜规则（IC 阈值、换手率）逐份短路过滤；相关性规则只
+        对幸存者执行——它是针对库内因子的昂贵检查，集中在一处
+        执行便于将来替换为对全部幸存者的单次矩阵相关运算。
+
+        与 judge 不同，便宜规则首个失败即停（等价于
+        early_exit=True），原因列表只含首个未通过规则。
+
+        Args:
+            reports: 因子评价报告的可迭代对象
+
+        Returns:
+            与输入顺序对应的 (是否通过, 未通过原因列表) 列表
+        """
+        report_list = list(reports)
+        cheap = [r for r in self.rules if not isinstance(r, CorrelationRule)]
+        expensive = [r for r in self.rules if isinstance(r, CorrelationRule)]
+        failures: List[List[str]] = []
+        survivors: List[int] = []
+        for i, report in enumerate(report_list):
+            reasons: List[str] = []
+            for rule in cheap:
+                passed, msg = rule.check(report)
+                if not passed:
+                    reasons.append(msg)
+                    break
+            failures.append(reasons)
+            if not reasons:
+                survivors.append(i)
+        for i in survivors:
+            for rule in expensive:
+                passed, msg = rule.check(report_list[i])
+                if not passed:
+                    failures[i].append(msg)
+        return [(not reasons, reasons) for reasons in failures]
@@ -1,62 +1,137 @@
 """Factor evaluation utilities."""
 from __future__ import annotations
 
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass, field
 from typing import Dict, Iterable, Optional
 
 import numpy as np
 import pandas as pd
-from numba import jit, prange
+from numba import get_num_threads, get_thread_id, jit, prange
+
+logger = logging.getLogger(__name__)
+
+
+@jit(nopython=True, cache=True)
+def _radix_argsort_f32(x):
+    """对浮点数组做基数排序并返回排序索引。
+
+    先降到 float32 并把位模式重编码成保序的 uint32（负数翻转
+    全部位，非负数置符号位），随后做 4 趟 256 桶的 LSD 基数
+    排序。线性扫描、无分支比较，在几千元素的横截面规模上
+    明显快于基于比较的 argsort；NaN 编码后落在序尾，与
+    np.argsort 的约定一致。LSD 稳定，等值元素保持原始顺序。
+
+    Args:
+        x: 输入浮点数组
+
+    Returns:
+        排序索引数组（升序）
+    """
+    n = x.shape[0]
+    u = x.astype(np.float32).view(np.uint32)
+    keys = np.empty(n, dtype=np.uint32)
+    for i in range(n):
+        ui = u[i]
+        if ui & np.uint32(0x80000000) != np.uint32(0):
+            keys[i] = np.uint32(0xFFFFFFFF) ^ ui
+        else:
+            keys[i] = ui | np.uint32(0x80000000)
+
+    idx = np.arange(n)
+    tmp_keys = np.empty(n, dtype=np.uint32)
+    tmp_idx = np.empty(n, dtype=np.int64)
+    count = np.empty(256, dtype=np.int64)
+    for shift in range(0, 32, 8):
+        count[:] = 0
+        for i in range(n):
+            count[(keys[i] >> shift) & np.uint32(0xFF)] += 1
+        total = 0
+        for b in range(256):
+            c = count[b]
+            count[b] = total
+            total += c
+        for i in range(n):
+            b = (keys[i] >> shift) & np.uint32(0xFF)
+            pos = count[b]
+            count[b] = pos + 1
+            tmp_keys[pos] = keys[i]
+            tmp_idx[pos] = idx[i]
+        keys, tmp_keys = tmp_keys, keys
+        idx, tmp_idx = tmp_idx, idx
+    return idx
 
 
 @jit(nopython=True, cache=True)
 def _rank_data_numba(x):
     """使用 numba 优化的排序函数
-    
+
+    排序走 float32 基数排序（见 _radix_argsort_f32），秩的散射
+    与逆排列合成一步完成，不再单独构建 inv 数组再转浮点。
+
     Args:
         x: 输入数组
-        
+
     Returns:
         排序后的秩数组
     """
     n = len(x)
-    sorter = np.argsort(x)
-    inv = np.empty(n, dtype=np.intp)
-    inv[sorter] = np.arange(n)
-    ranks = inv.astype(np.float64) + 1
+    sorter = _radix_argsort_f32(x)
+    ranks = np.empty(n, dtype=np.float64)
+    for i in range(n):
+        ranks[sorter[i]] = i + 1.0
     return ranks
 
 
 @jit(nopython=True, cache=True)
 def _spearman_numba(x, y):
     """使用 numba 优化的 Spearman 相关系数计算
-    
+
+    秩上的 Pearson 即 Spearman。各阶求和在一趟循环里同时累加
+    （原点矩公式），不再做三次独立的归约，也不分配
+    rank - mean 的中间数组；该核是访存受限的，单趟扫描使内存
+    流量减半。
+
     Args:
         x: 因子值数组
         y: 收益率数组
-        
+
     Returns:
         Spearman 相关系数
     """
-    if len(x) != len(y) or len(x) < 2:
+    n = len(x)
+    if n != len(y) or n < 2:
         return np.nan
-    
+
     # 计算秩
     rank_x = _rank_data_numba(x)
     rank_y = _rank_data_numba(y)
-    
-    # 计算 Pearson 相关系数（秩的相关性即 Spearman）
-    mean_x = np.mean(rank_x)
-    mean_y = np.mean(rank_y)
-    
-    cov = np.sum((rank_x - mean_x) * (rank_y - mean_y))
-    std_x = np.sqrt(np.sum((rank_x - mean_x) ** 2))
-    std_y = np.sqrt(np.sum((rank_y - mean_y) ** 2))
-    
-    if std_x == 0 or std_y == 0:
+
+    # 单趟累加五个求和量，再用原点矩公式合成协方差与方差
+    s_x = 0.0
+    s_y = 0.0
+    s_xx = 0.0
+    s_yy = 0.0
+    s_xy = 0.0
+    for i in range(n):
+        rx = rank_x[i]
+        ry = rank_y[i]
+        s_x += rx
+        s_y += ry
+        s_xx += rx * rx
+        s_yy += ry * ry
+        s_xy += rx * ry
+
+    cov = s_xy - s_x * s_y / n
+    var_x = s_xx - s_x * s_x / n
+    var_y = s_yy - s_y * s_y / n
+
+    if var_x <= 0.0 or var_y <= 0.0:
         return np.nan
-    
-    return cov / (std_x * std_y)
+
+    return cov / np.sqrt(var_x * var_y)
 
 
 @jit(nopython=True, cache=True, parallel=True)
@@ -92,51 +167,186 @@ def _compute_ic_batch(factor_arr, fwd_arr, date_starts, date_ends):
 @jit(nopython=True, cache=True)
 def _compute_turnover_numba(top_codes_matrix, n_top):
     """使用 numba 优化的换手率计算
-    
+
+    相邻两日的交集用布尔成员位图计算：置位前一日成员、累加
+    当日成员、复位前一日，每对日期 O(K) 的无分支线性扫描，
+    替代逐对排序加双指针归并（数据相关分支多，且 -1 填充排到
+    序首会提前截断）。位图只分配一次、跨日期对复用。
+
     Args:
-        top_codes_matrix: shape (n_dates, n_top) 每日前 N 名股票代码（整数编码）
+        top_codes_matrix: shape (n_dates, n_top) 每日前 N 名股票代码（整数编码，-1 为填充）
         n_top: 前 N 名数量
-        
+
     Returns:
         平均换手率
     """
     n_dates = top_codes_matrix.shape[0]
     if n_dates < 2:
         return np.nan
-    
+
+    n_codes = 0
+    for i in range(n_dates):
+        for j in range(top_codes_matrix.shape[1]):
+            c = top_codes_matrix[i, j]
+            if c + 1 > n_codes:
+                n_codes = c + 1
+
+    mask = np.zeros(n_codes, dtype=np.uint8)
     turnovers = np.empty(n_dates - 1, dtype=np.float64)
-    
+
     for i in range(n_dates - 1):
-        # 使用排序后的二路归并算法计算交集
-        current = np.sort(top_codes_matrix[i])
-        next_day = np.sort(top_codes_matrix[i + 1])
-        
-        # 双指针计算交集大小
+        for j in range(top_codes_matrix.shape[1]):
+            c = top_codes_matrix[i, j]
+            if c >= 0:
+                mask[c] = 1
         overlap = 0
-        j = 0
-        k = 0
-        
-        while j < len(current) and k < len(next_day):
-            if current[j] == -1:  # 填充值
-                break
-            if next_day[k] == -1:
-                break
-                
-            if current[j] == next_day[k]:
-                overlap += 1
-                j += 1
-                k += 1
-            elif current[j] < next_day[k]:
-                j += 1
-            else:
-                k += 1
-        
-        turnover = 1.0 - overlap / n_top if n_top > 0 else 0.0
-        turnovers[i] = turnover
-    
+        for j in range(top_codes_matrix.shape[1]):
+            c = top_codes_matrix[i + 1, j]
+            if c >= 0:
+                overlap += mask[c]
+        for j in range(top_codes_matrix.shape[1]):
+            c = top_codes_matrix[i, j]
+            if c >= 0:
+                mask[c] = 0
+        turnovers[i] = 1.0 - overlap / n_top if n_top > 0 else 0.0
+
     return np.mean(turnovers)
 
 
+# numba 的并行运行时不可从多个 Python 线程同时进入（workqueue
+# 层非重入），evaluate 的窗口线程池调用该核前需持有此锁
+_PARALLEL_KERNEL_LOCK = threading.Lock()
+
+# 前瞻收益的透视与排秩跨因子复用：同一批因子共享同一组
+# fwd_returns，对象身份作键，FIFO 逐出；值里持有原 Series 引用
+# 保证 id 在缓存存续期内有效
+_FWD_RANK_CACHE: dict = {}
+_FWD_RANK_CACHE_MAX = 8
+
+
+def _ranked_fwd(
+    fwd: pd.Series, index: pd.Index, columns: pd.Index
+) -> tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    """透视并按行排秩一条前瞻收益，结果按对象身份缓存。
+
+    排秩只依赖前瞻收益自身的有效格与日期网格，与被评价的因子
+    无关；批量评价 F 个因子时同一窗口的透视和排秩只做一次。
+    返回的数组为缓存所有，调用方不得就地修改。
+
+    Args:
+        fwd: 前瞻收益 Series（MultiIndex: date, code）
+        index: 目标日期索引
+        columns: 目标代码列
+
+    Returns:
+        (收益矩阵, 有效格掩码, 每行有效数, 自身掩码下的秩矩阵) 元组
+    """
+    hit = _FWD_RANK_CACHE.get(id(fwd))
+    if hit is not None:
+        ref, hit_index, hit_columns, payload = hit
+        if ref is fwd and hit_index.equals(index) and hit_columns.equals(columns):
+            return payload
+
+    mat = fwd.unstack("code").reindex(index=index, columns=columns)
+    ra = mat.to_numpy(dtype=np.float64, na_value=np.nan, copy=True)
+    rvalid = ~np.isnan(ra)
+    n_r = rvalid.sum(axis=1)
+    rank_r_own = pd.DataFrame(ra).rank(axis=1).to_numpy()
+    payload = (ra, rvalid, n_r, rank_r_own)
+    if len(_FWD_RANK_CACHE) >= _FWD_RANK_CACHE_MAX:
+        _FWD_RANK_CACHE.pop(next(iter(_FWD_RANK_CACHE)))
+    _FWD_RANK_CACHE[id(fwd)] = (fwd, index, columns, payload)
+    return payload
+
+
+_parallel_runtime_ready = False
+
+
+def _ensure_parallel_runtime() -> None:
+    """在主调线程上预启动 numba 并行运行时。
+
+    并行核首次执行会拉起 numba 的线程层；若这次拉起发生在
+    线程池的工作线程里，解释器退出时线程层无法正常收尾导致
+    进程挂起。进池前先在当前线程跑一次最小输入触发初始化。
+    """
+    global _parallel_runtime_ready
+    if not _parallel_runtime_ready:
+        _jaccard_series(np.full((2, 1), -1, dtype=np.int32), 1, 1)
+        _parallel_runtime_ready = True
+
+
+# 线程 id 属于动态全局量，该核不能用 cache=True 落盘
+@jit(nopython=True, parallel=True)
+def _jaccard_series(top_codes, n_top, n_codes):
+    """并行计算相邻日期前 N 名集合的换手率序列。
+
+    每个日期对相互独立，用 prange 并行；成员位图按线程各持
+    一份（get_thread_id 索引），避免共享写竞争。置位前一日、
+    累加当日、复位前一日，单对日期 O(K) 且无 Python 集合。
+
+    Args:
+        top_codes: shape (n_dates, n_top) 每日前 N 名整数编码，-1 为填充
+        n_top: 前 N 名数量
+        n_codes: 代码总数（位图长度）
+
+    Returns:
+        shape (n_dates - 1,) 的换手率数组
+    """
+    n_dates = top_codes.shape[0]
+    turnovers = np.empty(n_dates - 1, dtype=np.float64)
+    buffers = np.zeros((get_num_threads(), n_codes), dtype=np.uint8)
+
+    for i in prange(n_dates - 1):
+        buf = buffers[get_thread_id()]
+        for j in range(n_top):
+            c = top_codes[i, j]
+            if c >= 0:
+                buf[c] = 1
+        overlap = 0
+        for j in range(n_top):
+            c = top_codes[i + 1, j]
+            if c >= 0:
+                overlap += buf[c]
+        for j in range(n_top):
+            c = top_codes[i, j]
+            if c >= 0:
+                buf[c] = 0
+        turnovers[i] = 1.0 - overlap / n_top if n_top > 0 else 0.0
+
+    return turnovers
+
+
+@jit(nopython=True, cache=True)
+def _nan_mean_std(x):
+    """单趟扫描同时计算忽略 NaN 的均值与总体标准差。
+
+    等价于 np.nanmean + np.nanstd 的组合，但只过一遍数组、只建
+    一次 NaN 判断，省掉第二趟归约和两个布尔掩码临时数组。
+
+    Args:
+        x: 输入 float64 数组
+
+    Returns:
+        (均值, 标准差) 元组；无有效元素时均为 NaN
+    """
+    n = 0
+    s = 0.0
+    s2 = 0.0
+    for v in x:
+        if not np.isnan(v):
+            n += 1
+            s += v
+            s2 += v * v
+    if n == 0:
+        return np.nan, np.nan
+    mean = s / n
+    var = s2 / n - mean * mean
+    if var < 0.0:
+        # 原点矩相减的浮点误差可能产生极小负值
+        var = 0.0
+    return mean, np.sqrt(var)
+
+
 @dataclass
 class HorizonMetrics:
     """单个时间窗口的评价指标。
@@ -189,15 +399,20 @@ class FactorEvaluator:
     
     Attributes:
         horizons: 评价的时间窗口列表
+        verbose: 是否输出逐窗口的进度日志
     """
-    
-    def __init__(self, horizons: Iterable[int]) -> None:
+
+    def __init__(self, horizons: Iterable[int], verbose: bool = False) -> None:
         """初始化评价器。
-        
+
         Args:
             horizons: 时间窗口列表
+            verbose: 为 True 时通过 logging 输出逐窗口进度，
+                默认关闭——批量评价成千上万个因子时每次
+                print(flush=True) 的强制刷新开销会累积
         """
         self.horizons = list(horizons)
+        self.verbose = verbose
 
     def evaluate(
         self,
@@ -221,26 +436,70 @@ class FactorEvaluator:
             包含所有指标的 FactorReport 对象
         """
         metrics: Dict[int, HorizonMetrics] = {}
-        print(f"   评价 {len(self.horizons)} 个时间窗口: {self.horizons}")
-        
-        for i, h in enumerate(self.horizons, 1):
-            print(f"   [{i}/{len(self.horizons)}] 窗口 {h} 天...", end=" ", flush=True)
+        if self.verbose:
+            logger.info("评价 %d 个时间窗口: %s", len(self.horizons), self.horizons)
+
+        # 因子矩阵与 universe 掩码在所有窗口间共用，只透视/套用
+        # 一次；每个窗口只需透视自己的前瞻收益并复用因子矩阵
+        factor_mat = factor.unstack("code")
+        if universe_mask is not None:
+            mask_mat = (
+                universe_mask.reindex(factor.index)
+                .fillna(False)
+                .unstack("code")
+                .reindex(index=factor_mat.index, columns=factor_mat.columns)
+                .fillna(False)
+            )
+            factor_mat = factor_mat.where(mask_mat)
+
+        # 因子侧的去 NaN 与 universe 过滤跨窗口不变，提到循环外只做
+        # 一次；循环内每个窗口只需按自己前瞻收益的有效位再筛一道
+        base = factor.dropna()
+        if universe_mask is not None:
+            base = base[
+                universe_mask.reindex(base.index).fillna(False).to_numpy(dtype=bool)
+            ]
+
+        # IC 跨窗口批量计算：因子秩与窗口无关只排一次，前瞻收益
+        # 的透视与排秩经模块级缓存跨因子复用
+        ic_arrays = self._matrix_ic_multi(
+            factor_mat, {h: fwd_returns[h] for h in self.horizons}
+        )
+
+        def _eval_one(h: int) -> HorizonMetrics:
             fwd = fwd_returns[h]
-            aligned_factor, aligned_fwd = self._align(factor, fwd, universe_mask)
-            
-            # 计算 IC（使用 numba 优化）
-            ic_array = self._compute_ic_optimized(aligned_factor, aligned_fwd)
-            rank_ic_mean = np.nanmean(ic_array)
-            ic_std = np.nanstd(ic_array)
+            fwd_arr = (
+                fwd.reindex(base.index).to_numpy(dtype=np.float64, na_value=np.nan)
+                if not fwd.index.equals(base.index)
+                else fwd.to_numpy(dtype=np.float64, na_value=np.nan)
+            )
+            aligned_factor = base[~np.isnan(fwd_arr)]
+
+            # 均值与标准差在一趟归约里同时得到
+            rank_ic_mean, ic_std = _nan_mean_std(ic_arrays[h])
             icir = rank_ic_mean / ic_std if ic_std and not np.isnan(ic_std) else np.nan
-            
+
             # 计算换手率（简化版，更快）
-            print("计算换手率...", end=" ", flush=True)
             turnover_adj = self._turnover_fast(aligned_factor) / h
-            
-            metrics[h] = HorizonMetrics(rank_ic_mean, icir, turnover_adj)
-            print(f"✓ IC={rank_ic_mean:.4f}, ICIR={icir:.4f}, 换手={turnover_adj:.4f}")
-            
+            return HorizonMetrics(rank_ic_mean, icir, turnover_adj)
+
+        # 各窗口互不依赖，多窗口时并行计算：numpy/numba 核在计算
+        # 期间释放 GIL，线程池即可获得接近线性的加速
+        if len(self.horizons) > 1:
+            _ensure_parallel_runtime()
+            with ThreadPoolExecutor(max_workers=len(self.horizons)) as pool:
+                results = list(pool.map(_eval_one, self.horizons))
+        else:
+            results = [_eval_one(h) for h in self.horizons]
+
+        for h, m in zip(self.horizons, results):
+            metrics[h] = m
+            if self.verbose:
+                logger.info(
+                    "窗口 %d 天: IC=%.4f, ICIR=%.4f, 换手=%.4f",
+                    h, m.rank_ic_mean, m.icir, m.turnover_adjusted,
+                )
+
         best_horizon = self._best_horizon(metrics)
         return FactorReport(factor.name, metrics, best_horizon)
 
@@ -248,129 +507,279 @@ class FactorEvaluator:
         self, factor: pd.Series, fwd: pd.Series, universe_mask: Optional[pd.Series]
     ) -> tuple[pd.Series, pd.Series]:
         """对齐因子值和前瞻收益，并应用筛选。
-        
+
+        不经过 concat：索引一致（常见情形，前瞻收益与因子出自
+        同一份行情）时直接取值数组；不一致时用 get_indexer 做一次
+        位置对齐。之后 NaN 过滤与 universe 掩码合成同一个布尔
+        数组一次索引完成，省掉两列临时帧和 MultiIndex 重哈希。
+
         Args:
             factor: 因子值
             fwd: 前瞻收益
             universe_mask: 筛选掩码
-            
+
         Returns:
             对齐并筛选后的 (factor, fwd) 元组
         """
-        joined = pd.concat([factor, fwd], axis=1, keys=["factor", "fwd"]).dropna()
+        if not factor.index.equals(fwd.index):
+            pos = fwd.index.get_indexer(factor.index)
+            keep = pos >= 0
+            factor = factor[keep]
+            fwd = pd.Series(
+                fwd.to_numpy()[pos[keep]], index=factor.index, name=fwd.name
+            )
+        valid = ~(
+            np.isnan(factor.to_numpy(dtype=np.float64, na_value=np.nan))
+            | np.isnan(fwd.to_numpy(dtype=np.float64, na_value=np.nan))
+        )
         if universe_mask is not None:
-            joined = joined[universe_mask.reindex(joined.index).fillna(False)]
-        return joined["factor"], joined["fwd"]
+            valid &= (
+                universe_mask.reindex(factor.index)
+                .fillna(False)
+                .to_numpy(dtype=bool)
+            )
+        return factor[valid], fwd[valid]
 
     def _compute_ic_optimized(self, factor: pd.Series, fwd: pd.Series) -> np.ndarray:
-        """使用 numba 优化的 IC 计算
-        
+        """在长表上向量化计算逐日 Spearman IC。
+
+        不透视成宽矩阵：日内排秩走一次 groupby.rank 的 C 路径，
+        之后全部逐日统计量（计数、各阶求和）用 np.bincount 按日期
+        编码一次聚合得到，Spearman 即秩上的 Pearson。全程没有
+        按日期的 Python 循环，也不构建 (日期 × 代码) 临时矩阵。
+
         Args:
-            factor: 因子值 Series
+            factor: 因子值 Series（MultiIndex: date, code）
             fwd: 前瞻收益 Series
-            
+
         Returns:
-            每个日期的 IC 数组
+            每个日期的 IC 数组（按日期升序）
         """
-        # 准备数据：按日期和代码排序
-        df = pd.DataFrame({"factor": factor, "fwd": fwd})
-        df = df.sort_index(level=["date", "code"])
-        
-        # 获取唯一日期
-        dates = df.index.get_level_values("date").unique()
-        n_dates = len(dates)
-        
-        # 构建每个日期的起始和结束索引
-        date_starts = np.empty(n_dates, dtype=np.int64)
-        date_ends = np.empty(n_dates, dtype=np.int64)
-        
-        pos = 0
-        for i, date in enumerate(dates):
-            # 计算该日期的数据量
-            count = (df.index.get_level_values("date") == date).sum()
-            date_starts[i] = pos
-            date_ends[i] = pos + count
-            pos += count
-        
-        # 调用 numba 优化的批量 IC 计算
-        ic_array = _compute_ic_batch(
-            df["factor"].values,
-            df["fwd"].values,
-            date_starts,
-            date_ends
+        if not factor.index.equals(fwd.index):
+            pos = fwd.index.get_indexer(factor.index)
+            keep = pos >= 0
+            factor = factor[keep]
+            fwd = pd.Series(fwd.to_numpy()[pos[keep]], index=factor.index)
+
+        date_ids, dates = pd.factorize(
+            factor.index.get_level_values("date"), sort=True
         )
-        
+        fa = factor.to_numpy(dtype=np.float64, na_value=np.nan, copy=True)
+        ra = fwd.to_numpy(dtype=np.float64, na_value=np.nan, copy=True)
+        valid = ~np.isnan(fa) & ~np.isnan(ra)
+        fa[~valid] = np.nan
+        ra[~valid] = np.nan
+        ranked = pd.DataFrame({"f": fa, "r": ra}).groupby(date_ids).rank()
+        rank_f = np.nan_to_num(ranked["f"].to_numpy())
+        rank_r = np.nan_to_num(ranked["r"].to_numpy())
+
+        n_dates = len(dates)
+        n = np.bincount(date_ids, weights=valid, minlength=n_dates)
+        s_f = np.bincount(date_ids, weights=rank_f, minlength=n_dates)
+        s_r = np.bincount(date_ids, weights=rank_r, minlength=n_dates)
+        s_ff = np.bincount(date_ids, weights=rank_f * rank_f, minlength=n_dates)
+        s_rr = np.bincount(date_ids, weights=rank_r * rank_r, minlength=n_dates)
+        s_fr = np.bincount(date_ids, weights=rank_f * rank_r, minlength=n_dates)
+
+        with np.errstate(invalid="ignore", divide="ignore"):
+            cov = s_fr - s_f * s_r / n
+            var_f = s_ff - s_f * s_f / n
+            var_r = s_rr - s_r * s_r / n
+            ic_array = cov / np.sqrt(var_f * var_r)
+
+        ic_array[n < 2] = np.nan
+        return ic_array
+
+    def _matrix_ic(self, factor_mat: pd.DataFrame, fwd_mat: pd.DataFrame) -> np.ndarray:
+        """在 (日期 × 代码) 矩阵对上按行计算 Spearman IC。
+
+        按行一次性排秩；秩的逐日 Pearson 即 Spearman，整段计算
+        只有 numpy 矩阵运算，没有按日期的 Python 循环。
+
+        Args:
+            factor_mat: 因子值矩阵（行为日期，列为代码）
+            fwd_mat: 前瞻收益矩阵，行列与 factor_mat 对齐
+
+        Returns:
+            每个日期的 IC 数组
+        """
+        fa = factor_mat.to_numpy(dtype=np.float64, na_value=np.nan, copy=True)
+        ra = fwd_mat.to_numpy(dtype=np.float64, na_value=np.nan, copy=True)
+        valid = ~np.isnan(fa) & ~np.isnan(ra)
+        fa[~valid] = np.nan
+        ra[~valid] = np.nan
+        rank_f = np.nan_to_num(pd.DataFrame(fa).rank(axis=1).to_numpy())
+        rank_r = np.nan_to_num(pd.DataFrame(ra).rank(axis=1).to_numpy())
+        return self._ic_from_ranks(rank_f, rank_r, valid.sum(axis=1))
+
+    @staticmethod
+    def _ic_from_ranks(
+        rank_f: np.ndarray, rank_r: np.ndarray, n_valid: np.ndarray
+    ) -> np.ndarray:
+        """从已置零缺失格的秩矩阵按行计算 Pearson 相关。
+
+        缺失格置 0 后用原点矩公式，零项不影响各求和。
+
+        Args:
+            rank_f: 因子秩矩阵，缺失格为 0
+            rank_r: 前瞻收益秩矩阵，缺失格为 0
+            n_valid: 每行的有效格数
+
+        Returns:
+            每个日期的 IC 数组
+        """
+        n = n_valid.astype(np.float64)
+        with np.errstate(invalid="ignore", divide="ignore"):
+            mean_f = rank_f.sum(axis=1) / n
+            mean_r = rank_r.sum(axis=1) / n
+            cov = (rank_f * rank_r).sum(axis=1) - n * mean_f * mean_r
+            var_f = (rank_f ** 2).sum(axis=1) - n * mean_f ** 2
+            var_r = (rank_r ** 2).sum(axis=1) - n * mean_r ** 2
+            ic_array = cov / np.sqrt(var_f * var_r)
+        ic_array[n < 2] = np.nan
         return ic_array
 
+    def _matrix_ic_multi(
+        self, factor_mat: pd.DataFrame, fwd_series: Dict[int, pd.Series]
+    ) -> Dict[int, np.ndarray]:
+        """对多个窗口批量计算逐日 Spearman IC，双侧共享排秩。
+
+        因子秩不依赖窗口，只按因子自身有效格排一次；前瞻收益的
+        透视与自身掩码下的排秩经 _ranked_fwd 按对象身份缓存，跨
+        因子复用。某一行的联合有效格与单侧有效格不一致时（因子
+        侧典型是临近样本尾部的退市代码，收益侧是因子缺失或
+        universe 剔除），只对这些行按联合有效格重排该侧的秩，
+        结果与逐窗口独立计算完全一致。
+
+        Args:
+            factor_mat: 因子值矩阵（行为日期，列为代码）
+            fwd_series: 窗口到前瞻收益 Series 的字典
+
+        Returns:
+            窗口到每日 IC 数组的字典
+        """
+        fa = factor_mat.to_numpy(dtype=np.float64, na_value=np.nan, copy=True)
+        fvalid = ~np.isnan(fa)
+        n_f = fvalid.sum(axis=1)
+        rank_f_base = pd.DataFrame(fa).rank(axis=1).to_numpy()
+
+        out: Dict[int, np.ndarray] = {}
+        for h, fwd in fwd_series.items():
+            ra, rvalid, n_r, rank_r_own = _ranked_fwd(
+                fwd, factor_mat.index, factor_mat.columns
+            )
+            valid = fvalid & rvalid
+            n_valid = valid.sum(axis=1)
+
+            # 前瞻收益未额外引入缺失的行直接复用共享因子秩
+            differ_f = n_valid != n_f
+            if differ_f.any():
+                fa_sub = np.where(valid[differ_f], fa[differ_f], np.nan)
+                rank_f = rank_f_base.copy()
+                rank_f[differ_f] = pd.DataFrame(fa_sub).rank(axis=1).to_numpy()
+            else:
+                rank_f = rank_f_base
+            rank_f = np.where(valid, rank_f, 0.0)
+
+            # 因子侧未额外引入缺失的行复用缓存的前瞻收益秩；
+            # 缓存数组只读，重排结果写入副本
+            differ_r = n_valid != n_r
+            if differ_r.any():
+                ra_sub = np.where(valid[differ_r], ra[differ_r], np.nan)
+                rank_r = rank_r_own.copy()
+                rank_r[differ_r] = pd.DataFrame(ra_sub).rank(axis=1).to_numpy()
+            else:
+                rank_r = rank_r_own
+            rank_r = np.where(valid, rank_r, 0.0)
+
+            out[h] = self._ic_from_ranks(rank_f, rank_r, n_valid)
+        return out
+
+    def _top_codes_matrix(
+        self, factor: pd.Series, frac: float = 0.2
+    ) -> tuple[np.ndarray, int, int]:
+        """向量化构建每日前 N 名的整数编码矩阵。
+
+        整个构建过程没有按日期的 Python 循环：code 一次性
+        factorize 成 int64，按 (日期, -因子值) lexsort 后每个日期
+        块的前 N 行即当日前 N 名，用扁平索引一次 take 出来。
+
+        Args:
+            factor: 因子值 Series（MultiIndex: date, code）
+            frac: 头部比例，默认取前 20%
+
+        Returns:
+            (top_codes 矩阵 shape (n_dates, n_top)，不足处填 -1,
+             n_top, 代码总数) 元组
+        """
+        date_ids, dates = pd.factorize(
+            factor.index.get_level_values("date"), sort=True
+        )
+        code_ids, codes = pd.factorize(factor.index.get_level_values("code"))
+        values = factor.to_numpy(dtype=np.float64, copy=False)
+        # NaN 压到序尾，避免占据头部名额
+        sort_vals = np.where(np.isnan(values), -np.inf, values)
+        order = np.lexsort((-sort_vals, date_ids))
+
+        counts = np.bincount(date_ids, minlength=len(dates))
+        starts = np.concatenate(([0], np.cumsum(counts)[:-1]))
+        n_top = max(1, int(counts[0] * frac))
+
+        # 每个日期块取前 n_top 个位置；块长不足的位置填 -1。
+        # 编码矩阵存 int32：代码数远小于 2^31，换手率核的内存流量减半
+        offsets = np.arange(n_top)
+        flat = starts[:, None] + offsets[None, :]
+        valid = offsets[None, :] < counts[:, None]
+        top_codes = np.full((len(dates), n_top), -1, dtype=np.int32)
+        top_codes[valid] = code_ids[order[flat[valid]]]
+        return top_codes, n_top, len(codes)
+
     def _turnover(self, factor: pd.Series) -> float:
-        """计算因子的平均换手率（原始版本，较慢）。
-        
-        基于每个日期因子排序后的标的集合变化计算。
-        
+        """计算因子的平均换手率（numpy 向量化版本）。
+
+        取每日因子值前 20% 的标的集合，用布尔成员位图计算相邻
+        两日的重合度：前一日的成员置位，对当日成员求和即交集
+        大小，O(K) 每日且不经过 Python 集合。
+
         Args:
             factor: 因子值 Series
-            
+
         Returns:
             平均换手率（0-1 之间）
         """
-        sorted_codes = factor.groupby(level="date").apply(
-            lambda x: x.sort_values(ascending=False).index.get_level_values(1)
-        )
-        turnovers = []
-        previous = None
-        for codes in sorted_codes:
-            if previous is not None:
-                overlap = len(set(previous) & set(codes))
-                total = len(set(previous) | set(codes))
-                turnovers.append(1 - overlap / total if total else np.nan)
-            previous = codes
-        return float(np.nanmean(turnovers)) if turnovers else np.nan
-    
+        top_codes, n_top, n_codes = self._top_codes_matrix(factor)
+        n_dates = top_codes.shape[0]
+        if n_dates < 2:
+            return np.nan
+
+        bitmap = np.zeros(n_codes, dtype=bool)
+        turnovers = np.empty(n_dates - 1, dtype=np.float64)
+        for i in range(n_dates - 1):
+            prev = top_codes[i][top_codes[i] >= 0]
+            curr = top_codes[i + 1][top_codes[i + 1] >= 0]
+            bitmap[prev] = True
+            overlap = int(bitmap[curr].sum())
+            bitmap[prev] = False
+            turnovers[i] = 1.0 - overlap / n_top if n_top > 0 else 0.0
+        return float(np.mean(turnovers))
+
     def _turnover_fast(self, factor: pd.Series) -> float:
-        """计算因子的平均换手率（numba 优化版本）。
-        
-        使用 numba JIT 加速换手率计算。
-        采样前20%的股票计算换手率。
-        
+        """计算因子的平均换手率（numba 并行版本）。
+
+        采样前20%的股票，日期对之间并行计算位图交集。
+
         Args:
             factor: 因子值 Series
-            
+
         Returns:
             平均换手率（0-1 之间）
         """
-        # 按日期分组
-        dates = sorted(factor.index.get_level_values("date").unique())
-        
-        if len(dates) < 2:
+        top_codes_matrix, n_top, n_codes = self._top_codes_matrix(factor)
+        if top_codes_matrix.shape[0] < 2:
             return np.nan
-        
-        # 为每个日期找出前 20% 的股票
-        grouped = factor.groupby(level="date")
-        n_top = None
-        
-        # 收集每日前 N 名股票代码（转为整数编码）
-        all_codes = factor.index.get_level_values("code").unique()
-        code_to_int = {code: i for i, code in enumerate(all_codes)}
-        
-        top_codes_list = []
-        for date in dates:
-            date_data = grouped.get_group(date).sort_values(ascending=False)
-            if n_top is None:
-                n_top = max(1, int(len(date_data) * 0.2))
-            
-            top_codes = date_data.head(n_top).index.get_level_values("code")
-            top_codes_int = np.array([code_to_int[code] for code in top_codes], dtype=np.int64)
-            
-            # 填充到固定长度
-            if len(top_codes_int) < n_top:
-                top_codes_int = np.pad(top_codes_int, (0, n_top - len(top_codes_int)), constant_values=-1)
-            
-            top_codes_list.append(top_codes_int)
-        
-        top_codes_matrix = np.array(top_codes_list, dtype=np.int64)
-        
-        # 调用 numba 优化的函数
-        return float(_compute_turnover_numba(top_codes_matrix, n_top))
+        with _PARALLEL_KERNEL_LOCK:
+            turnovers = _jaccard_series(top_codes_matrix, n_top, n_codes)
+        return float(np.mean(turnovers))
 
     def _best_horizon(self, metrics: Dict[int, HorizonMetrics]) -> Optional[int]:
         """选择最佳时间窗口。
@@ -386,4 +795,14 @@ class FactorEvaluator:
         """
         if not metrics:
             return None
-        return max(metrics.items(), key=lambda kv: abs(kv[1].rank_ic_mean))[0]
+        horizons = list(metrics)
+        ics = np.fromiter(
+            (abs(metrics[h].rank_ic_mean) for h in horizons),
+            dtype=np.float64,
+            count=len(horizons),
+        )
+        try:
+            return horizons[int(np.nanargmax(ics))]
+        except ValueError:
+            # 全 NaN 时退回首个窗口，与原 max() 的行为一致
+            return horizons[0]
@@ -3,25 +3,29 @@ from __future__ import annotations
 
 from typing import Dict, Iterable
 
+import numpy as np
 import pandas as pd
 
 
 def build(df: pd.DataFrame, horizons: Iterable[int], price_col: str = "close") -> Dict[int, pd.Series]:
     """构建多期前瞻收益率。
-    
-    对每个时间窗口，计算未来 h 期的收益率。
-    
+
+    对每个时间窗口，计算未来 h 期的收益率。价格先透视成
+    (日期 × 代码) 宽矩阵，每个窗口的前瞻移位就是两段行切片
+    相除，所有窗口共享同一次透视；按代码的 groupby 遍历只做
+    一次而不是每个窗口一次。
+
     Args:
         df: 包含价格数据的 DataFrame（MultiIndex: date, code）
         horizons: 时间窗口列表（单位：天）
         price_col: 价格列名，默认 "close"
-        
+
     Returns:
         字典，键为时间窗口，值为对应的前瞻收益率 Series
-        
+
     Raises:
         KeyError: 当价格列不存在时
-        
+
     Example:
         fwd_returns = build(df, [1, 5, 10])
         # 返回 {1: Series, 5: Series, 10: Series}
@@ -29,10 +33,19 @@ def build(df: pd.DataFrame, horizons: Iterable[int], price_col: str = "close") -
     if price_col not in df.columns:
         raise KeyError(f"Price column {price_col} missing in input DataFrame")
     price = df[price_col]
+    wide_df = price.unstack("code")
+    wide = wide_df.to_numpy(dtype=np.float32)
     returns: Dict[int, pd.Series] = {}
     for h in horizons:
-        future = price.groupby(level=1).shift(-h)
-        ret = future / price - 1
+        fwd = np.full_like(wide, np.nan)
+        if h < wide.shape[0]:
+            with np.errstate(invalid="ignore", divide="ignore"):
+                fwd[:-h] = wide[h:] / wide[:-h] - 1
+        ret = (
+            pd.DataFrame(fwd, index=wide_df.index, columns=wide_df.columns)
+            .stack()
+            .reindex(price.index)
+        )
         ret.name = f"fwd_ret_{h}"
         returns[h] = ret
     return returns
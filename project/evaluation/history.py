@@ -6,14 +6,28 @@
 from __future__ import annotations
 
 import json
+import sqlite3
 from datetime import datetime
 from pathlib import Path
 from typing import Optional
 
+# 记录字段顺序，同时是 SQLite 表（factor_name 之外）的列顺序
+_RECORD_FIELDS = (
+    "last_evaluated",
+    "status",
+    "passed",
+    "ic_mean",
+    "icir",
+    "best_horizon",
+    "turnover",
+    "date_range",
+    "error",
+)
+
 
 class EvaluationHistory:
     """因子评价历史记录。
-    
+
     记录结构：
     {
         "factor_name": {
@@ -27,43 +41,183 @@ class EvaluationHistory:
             "error": null
         }
     }
-    
+
+    磁盘存储为 SQLite 单文件：每条评价只 UPSERT 一行，写入量与
+    记录数成线性，替代整文件 JSON 重写的 O(N^2)。内存中仍维护
+    完整的记录字典镜像，读取接口不查库。旧版 JSON 历史文件会在
+    初始化时自动迁移。
+
     Attributes:
         history_file: 历史记录文件路径
         records: 历史记录字典
     """
-    
-    def __init__(self, history_file: str | Path = "factor_evaluation_history.json") -> None:
+
+    # 每累计多少条未提交记录触发一次事务提交
+    _FLUSH_EVERY = 32
+
+    def __init__(self, history_file: str | Path = "factor_evaluation_history.db") -> None:
         """初始化评价历史记录。
-        
+
         Args:
-            history_file: 历史记录文件路径
+            history_file: 历史记录文件路径；若指向旧版 JSON 文件，
+                或同目录存在同名 .json 旧历史，则自动迁移为 SQLite
         """
         self.history_file = Path(history_file)
+        self.history_file.parent.mkdir(parents=True, exist_ok=True)
+        legacy = self._read_legacy_json(self.history_file)
+        if legacy is not None:
+            self.history_file.unlink()
+        # 旧部署的历史是同名 .json 文件：数据库路径本身不是 JSON
+        # 时再查同目录的旧文件，迁移后改名留档，避免历史丢失
+        sibling = self.history_file.with_suffix(".json")
+        sibling_legacy = None
+        if legacy is None and sibling != self.history_file:
+            sibling_legacy = self._read_legacy_json(sibling)
+        self._conn = sqlite3.connect(self.history_file)
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS records ("
+            "factor_name TEXT PRIMARY KEY, "
+            "last_evaluated TEXT, "
+            "status TEXT, "
+            "passed INTEGER, "
+            "ic_mean REAL, "
+            "icir REAL, "
+            "best_horizon INTEGER, "
+            "turnover REAL, "
+            "date_range TEXT, "
+            "error TEXT)"
+        )
+        if legacy:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO records VALUES (?,?,?,?,?,?,?,?,?,?)",
+                [self._to_row(name, record) for name, record in legacy.items()],
+            )
+        if sibling_legacy:
+            # 数据库里已有的记录更新，旧 JSON 只补缺失的因子
+            self._conn.executemany(
+                "INSERT OR IGNORE INTO records VALUES (?,?,?,?,?,?,?,?,?,?)",
+                [self._to_row(name, record) for name, record in sibling_legacy.items()],
+            )
+            sibling.rename(sibling.with_name(sibling.name + ".migrated"))
+        self._conn.commit()
         self.records = self._load()
+        self._dirty = 0
+        # 旁路索引：按状态分类的因子名集合，查询 O(1)，摘要只读长度
+        self._evaluated: set[str] = set()
+        self._passed: set[str] = set()
+        self._failed: set[str] = set()
+        for name, record in self.records.items():
+            self._index_record(name, record)
+
+    @staticmethod
+    def _read_legacy_json(path: Path) -> Optional[dict]:
+        """读取旧版 JSON 历史文件（如果存在）。
+
+        Args:
+            path: 待读取的文件路径
+
+        Returns:
+            旧记录字典；文件不存在或不是 JSON 时返回 None
+        """
+        if not path.exists():
+            return None
+        try:
+            with path.open("r", encoding="utf-8") as f:
+                data = json.load(f)
+            return data if isinstance(data, dict) else None
+        except (json.JSONDecodeError, IOError, UnicodeDecodeError):
+            # SQLite 文件或损坏内容都会落到这里
+            return None
+
+    @staticmethod
+    def _to_row(name: str, record: dict) -> tuple:
+        """将一条记录转换为 SQLite 行。
+
+        Args:
+            name: 因子名称
+            record: 评价记录字典
+
+        Returns:
+            按表列顺序排列的元组
+        """
+        passed = record.get("passed")
+        return (
+            name,
+            record.get("last_evaluated"),
+            record.get("status"),
+            None if passed is None else int(bool(passed)),
+            record.get("ic_mean"),
+            record.get("icir"),
+            record.get("best_horizon"),
+            record.get("turnover"),
+            record.get("date_range"),
+            record.get("error"),
+        )
+
+    def _index_record(self, name: str, record: dict) -> None:
+        """将一条记录并入旁路索引。
+
+        Args:
+            name: 因子名称
+            record: 评价记录字典
+        """
+        if record.get("status") == "success":
+            self._evaluated.add(name)
+            if record.get("passed"):
+                self._passed.add(name)
+            else:
+                self._failed.add(name)
+
+    def _deindex_record(self, name: str) -> None:
+        """将因子从旁路索引中移除。
+
+        Args:
+            name: 因子名称
+        """
+        self._evaluated.discard(name)
+        self._passed.discard(name)
+        self._failed.discard(name)
     
     def _load(self) -> dict:
-        """从文件加载历史记录。
-        
+        """从 SQLite 加载全部历史记录到内存镜像。
+
         Returns:
             历史记录字典
         """
-        if not self.history_file.exists():
-            return {}
-        
+        records: dict = {}
+        for row in self._conn.execute(
+            "SELECT factor_name, " + ", ".join(_RECORD_FIELDS) + " FROM records"
+        ):
+            record = dict(zip(_RECORD_FIELDS, row[1:]))
+            if record["passed"] is not None:
+                record["passed"] = bool(record["passed"])
+            records[row[0]] = record
+        return records
+
+    def flush(self) -> None:
+        """提交尚未落盘的写入事务。
+
+        record_evaluation 的 UPSERT 按批提交以摊薄 fsync 开销，
+        批量评价结束后应调用本方法（或依赖对象销毁时的兜底）
+        确保全部记录落盘。
+        """
+        if self._dirty:
+            self._conn.commit()
+            self._dirty = 0
+
+    def close(self) -> None:
+        """提交未落盘记录并关闭数据库连接。"""
+        self.flush()
+        self._conn.close()
+
+    def __del__(self) -> None:
+        """对象销毁时兜底提交未写入的记录。"""
         try:
-            with self.history_file.open("r", encoding="utf-8") as f:
-                return json.load(f)
-        except (json.JSONDecodeError, IOError):
-            # 如果文件损坏，返回空字典
-            return {}
-    
-    def _save(self) -> None:
-        """保存历史记录到文件。"""
-        self.history_file.parent.mkdir(parents=True, exist_ok=True)
-        with self.history_file.open("w", encoding="utf-8") as f:
-            json.dump(self.records, f, indent=2, ensure_ascii=False)
-    
+            self.close()
+        except Exception:
+            # 解释器退出阶段部分模块可能已卸载，兜底提交失败时静默
+            pass
+
     def is_evaluated(self, factor_name: str) -> bool:
         """检查因子是否已评价过。
         
@@ -73,7 +227,7 @@ class EvaluationHistory:
         Returns:
             True 如果已评价，False 否则
         """
-        return factor_name in self.records and self.records[factor_name].get("status") == "success"
+        return factor_name in self._evaluated
     
     def record_evaluation(
         self,
@@ -111,7 +265,18 @@ class EvaluationHistory:
             "date_range": date_range,
             "error": error,
         }
-        self._save()
+        self._deindex_record(factor_name)
+        self._index_record(factor_name, self.records[factor_name])
+        # 单行 UPSERT：写入量只随本条记录，不再整文件重写；事务
+        # 按批提交，剩余部分由 flush()/析构兜底
+        self._conn.execute(
+            "INSERT OR REPLACE INTO records VALUES (?,?,?,?,?,?,?,?,?,?)",
+            self._to_row(factor_name, self.records[factor_name]),
+        )
+        self._dirty += 1
+        if self._dirty >= self._FLUSH_EVERY:
+            self._conn.commit()
+            self._dirty = 0
     
     def get_record(self, factor_name: str) -> Optional[dict]:
         """获取因子的评价记录。
@@ -137,17 +302,27 @@ class EvaluationHistory:
         """
         if factor_name in self.records:
             del self.records[factor_name]
-            self._save()
+            self._deindex_record(factor_name)
+            self._conn.execute(
+                "DELETE FROM records WHERE factor_name = ?", (factor_name,)
+            )
+            self._conn.commit()
+            self._dirty = 0
             return True
         return False
-    
+
     def clear_all(self) -> None:
         """清空所有评价记录。
-        
+
         用于强制重新评价所有因子。
         """
         self.records = {}
-        self._save()
+        self._evaluated.clear()
+        self._passed.clear()
+        self._failed.clear()
+        self._conn.execute("DELETE FROM records")
+        self._conn.commit()
+        self._dirty = 0
     
     def get_all_evaluated(self) -> list[str]:
         """获取所有已评价的因子名称列表。
@@ -155,8 +330,7 @@ class EvaluationHistory:
         Returns:
             因子名称列表
         """
-        return [name for name, record in self.records.items() 
-                if record.get("status") == "success"]
+        return sorted(self._evaluated)
     
     def get_passed_factors(self) -> list[str]:
         """获取所有通过入库标准的因子名称列表。
@@ -164,8 +338,7 @@ class EvaluationHistory:
         Returns:
             因子名称列表
         """
-        return [name for name, record in self.records.items() 
-                if record.get("status") == "success" and record.get("passed")]
+        return sorted(self._passed)
     
     def get_failed_factors(self) -> list[str]:
         """获取所有未通过入库标准的因子名称列表。
@@ -173,8 +346,7 @@ class EvaluationHistory:
         Returns:
             因子名称列表
         """
-        return [name for name, record in self.records.items() 
-                if record.get("status") == "success" and not record.get("passed")]
+        return sorted(self._failed)
     
     def print_summary(self) -> None:
         """打印评价历史摘要。"""
@@ -182,13 +354,12 @@ class EvaluationHistory:
             print("📝 评价历史: 无记录")
             return
         
+        # 旁路索引维护了各分类计数，摘要无需再扫描全部记录
         total = len(self.records)
-        success = sum(1 for r in self.records.values() if r.get("status") == "success")
+        success = len(self._evaluated)
         failed = total - success
-        passed = sum(1 for r in self.records.values() 
-                    if r.get("status") == "success" and r.get("passed"))
-        rejected = sum(1 for r in self.records.values() 
-                      if r.get("status") == "success" and not r.get("passed"))
+        passed = len(self._passed)
+        rejected = len(self._failed)
         
         print(f"📝 评价历史摘要:")
         print(f"   总计: {total} 个因子")
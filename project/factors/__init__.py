@@ -3,6 +3,7 @@
 本模块负责因子的注册、计算、标准化和存储，包括：
 - 因子注册和规范 (registry.py)
 - 因子计算引擎 (engine.py)
+- 向量化分组运算原语 (fast_ops.py)
 - 因子标准化处理 (standardizer.py)
 - 因子库存储 (library.py)
 """
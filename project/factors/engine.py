@@ -1,7 +1,7 @@
 """FactorEngine orchestrates factor computation with data loading and preprocessing."""
 from __future__ import annotations
 
-from typing import Optional
+from typing import Iterable, Optional
 
 import pandas as pd
 
@@ -47,34 +47,79 @@ class FactorEngine:
         universe: Optional[Universe] = None,
     ) -> pd.Series:
         """计算因子值。
-        
+
         完整流程：
         1. 从注册表获取因子规范
         2. 加载所需的市场数据
         3. 执行因子计算函数
         4. 应用标准化处理
         5. 应用筛选器过滤
-        
+
         Args:
             factor_name: 已注册的因子名称
             start: 起始日期
             end: 结束日期
             universe: 筛选器，None 时使用默认筛选器
-            
+
         Returns:
             计算并处理后的因子值 Series
-            
+
+        Raises:
+            TypeError: 当因子函数返回值不是 Series 时
+        """
+        values, _ = self.compute_with_frame(factor_name, start, end, universe)
+        return values
+
+    def compute_with_frame(
+        self,
+        factor_name: str,
+        start: Optional[pd.Timestamp] = None,
+        end: Optional[pd.Timestamp] = None,
+        universe: Optional[Universe] = None,
+        fields: Optional[Iterable[str]] = None,
+    ) -> tuple[pd.Series, pd.DataFrame]:
+        """计算因子值，同时返回所用的行情数据帧。
+
+        评价流程既要因子值又要行情帧（构建前瞻收益），返回两者
+        让调用方复用同一次数据加载，避免重复读取。
+
+        Args:
+            factor_name: 已注册的因子名称
+            start: 起始日期
+            end: 结束日期
+            universe: 筛选器，None 时使用默认筛选器
+            fields: 加载字段，None 时使用因子声明的 required_fields
+
+        Returns:
+            (因子值 Series, 行情数据 DataFrame) 元组
+
         Raises:
             TypeError: 当因子函数返回值不是 Series 时
         """
         spec = get(factor_name)
-        df = self.source.load(start=start, end=end, fields=spec.required_fields)
+        df = self.source.load(
+            start=start, end=end, fields=fields or spec.required_fields
+        )
         raw_factor = spec.func(df)
         if not isinstance(raw_factor, pd.Series):
             raise TypeError("Factor function must return a pandas Series")
         raw_factor = raw_factor.rename(factor_name)
-        aligned = raw_factor.reindex(df.index)
+        # 因子函数通常原样保留行情索引，此时 reindex 是纯开销
+        aligned = (
+            raw_factor
+            if raw_factor.index.equals(df.index)
+            else raw_factor.reindex(df.index)
+        )
         standardized = self.standardizer.apply(aligned)
         universe_filter = universe or self.default_universe
-        mask = universe_filter.mask(df.join(standardized.rename("factor")))
-        return standardized[mask]
+        # 筛选器只需基准列、量额列和因子列，按需拼窄帧而不是
+        # join 整份行情（整帧拷贝）；索引一致，concat 不触发对齐
+        mask_cols = [df.iloc[:, :1]]
+        mask_cols += [
+            df[[col]] for col in ("volume", "amount")
+            if col in df.columns and col != df.columns[0]
+        ]
+        mask_cols.append(standardized.rename("factor"))
+        mask_input = pd.concat(mask_cols, axis=1, copy=False)
+        mask = universe_filter.mask(mask_input)
+        return standardized[mask], df
@@ -0,0 +1,1312 @@
+"""Vectorized grouped operations on (date, code) panels without pandas GroupBy."""
+from __future__ import annotations
+
+import threading
+from contextlib import contextmanager
+from typing import Iterator, Optional
+
+import numpy as np
+import pandas as pd
+
+try:
+    from numba import guvectorize, njit, prange
+
+    NUMBA_AVAILABLE = True
+except ImportError:  # pragma: no cover - numba 为可选加速依赖
+    NUMBA_AVAILABLE = False
+
+    def njit(*args, **kwargs):  # type: ignore[misc]
+        """numba 缺失时的空装饰器，保持纯 NumPy 回退路径可用。"""
+        def wrapper(func):
+            return func
+        if args and callable(args[0]):
+            return args[0]
+        return wrapper
+
+    prange = range
+
+
+# 运行级缓存：批量计算多个因子时共享相同列上的分组运算结果
+# 多线程批量计算时由 _run_lock 保护读写
+_run_ctx: Optional[dict] = None
+_run_lock = threading.Lock()
+
+
+@contextmanager
+def memoized_run(df: pd.DataFrame) -> Iterator[None]:
+    """开启针对 df 的运行级结果缓存。
+
+    在此上下文中，对 df 原始列执行的分组运算（pct_change、
+    rolling、shift 等）会按 (列名, 运算, 参数) 缓存结果；
+    批量计算多个因子时，相同的中间量只算一次。
+    缓存通过 np.shares_memory 确认输入确实是 df 的列，
+    派生 Series（如收益率）不会误命中。
+
+    Args:
+        df: 批量计算所使用的输入数据 DataFrame
+
+    Yields:
+        None
+    """
+    global _run_ctx
+    columns = {}
+    for col in df.columns:
+        try:
+            columns[col] = df[col].to_numpy()
+        except (TypeError, ValueError):
+            continue
+    prev = _run_ctx
+    _run_ctx = {"columns": columns, "results": {}}
+    try:
+        yield
+    finally:
+        _run_ctx = prev
+
+
+def _memo_key(series: pd.Series, op: str, params: tuple) -> Optional[tuple]:
+    """生成运行级缓存键；series 不是运行 DataFrame 的原始列时返回 None。"""
+    ctx = _run_ctx
+    if ctx is None:
+        return None
+    col_values = ctx["columns"].get(series.name)
+    if col_values is None:
+        return None
+    values = series.to_numpy()
+    if values.shape != col_values.shape:
+        return None
+    if values is not col_values and not np.shares_memory(values, col_values):
+        return None
+    return (series.name, op, params)
+
+
+def _memo_get(key: Optional[tuple]) -> Optional[pd.Series]:
+    """查询运行级缓存（线程安全）。"""
+    if key is None or _run_ctx is None:
+        return None
+    with _run_lock:
+        return _run_ctx["results"].get(key)
+
+
+def _memo_put(key: Optional[tuple], result: pd.Series) -> None:
+    """写入运行级缓存（线程安全）。"""
+    if key is not None and _run_ctx is not None:
+        with _run_lock:
+            _run_ctx["results"][key] = result
+
+
+# 索引级缓存：同一批因子共享同一个 MultiIndex 时，
+# 因子化和 lexsort 的结果只算一次。条目持有索引对象本身的引用，
+# 缓存期间 id 不会被回收复用；用 is 校验命中。
+_sort_cache: dict = {}
+_SORT_CACHE_MAX = 8
+
+
+def _index_sort(index: pd.MultiIndex) -> tuple[np.ndarray, np.ndarray]:
+    """计算（或从缓存取出）索引的排序位置和组编码。
+
+    Args:
+        index: MultiIndex(date, code) 索引
+
+    Returns:
+        (排序位置索引, 排序后的组编码数组) 元组
+    """
+    key = id(index)
+    with _run_lock:
+        entry = _sort_cache.get(key)
+        if entry is not None and entry[0] is index:
+            return entry[1], entry[2]
+    code_ids, _ = pd.factorize(index.get_level_values("code"), sort=False)
+    date_vals = index.get_level_values("date").values
+    sort_idx = np.lexsort((date_vals, code_ids))
+    group_ids = code_ids[sort_idx]
+    bounds = _compute_group_bounds(group_ids)
+    with _run_lock:
+        if len(_sort_cache) >= _SORT_CACHE_MAX:
+            _sort_cache.pop(next(iter(_sort_cache)))
+        _sort_cache[key] = (index, sort_idx, group_ids, bounds)
+    return sort_idx, group_ids
+
+
+def safe_div(numer, denom) -> np.ndarray:
+    """掩码除法：分母为 0 的位置输出 NaN，不加扰动项。
+
+    替代 `a / (b + 1e-6)` 式的防零除写法——扰动项会系统性
+    地偏移结果，且每个元素多付一次加法。np.divide 的 where
+    掩码在单条 SIMD 指令内完成筛选，零分母处保持 NaN。
+
+    Args:
+        numer: 分子（ndarray 或 Series）
+        denom: 分母（ndarray 或 Series）
+
+    Returns:
+        商的 ndarray，分母为 0 处为 NaN
+    """
+    a = np.asarray(numer)
+    b = np.asarray(denom)
+    out = np.full(a.shape, np.nan, dtype=np.result_type(a.dtype, b.dtype, np.float32))
+    np.divide(a, b, out=out, where=b != 0)
+    return out
+
+
+def _group_sort(series: pd.Series) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """对 MultiIndex(date, code) 的 Series 按 (code, date) 做一次性排序。
+
+    将 code 层因子化为整数编码后，用 lexsort 得到按 (code, date)
+    排列的位置索引。排序后同一只股票的数据在内存中连续，
+    后续的滚动/差分运算可以在平铺的 NumPy 数组上一次完成。
+    排序位置和组编码按索引对象缓存，批量计算多个因子时
+    因子化开销只付一次。
+
+    Args:
+        series: 因子输入 Series，索引为 MultiIndex(date, code)
+
+    Returns:
+        (排序后的值数组, 排序后的组编码数组, 排序位置索引) 元组
+    """
+    sort_idx, group_ids = _index_sort(series.index)
+    values = series.to_numpy()
+    # float32 保持原精度以节省带宽，其余类型统一提升为 float64
+    if values.dtype not in (np.float32, np.float64):
+        values = values.astype(np.float64)
+    values = values[sort_idx]
+    return values, group_ids, sort_idx
+
+
+def _scatter_back(out: np.ndarray, sort_idx: np.ndarray, series: pd.Series) -> pd.Series:
+    """将排序空间的计算结果还原为与输入索引对齐的 Series。
+
+    Args:
+        out: 排序空间中的结果数组
+        sort_idx: _group_sort 返回的排序位置索引
+        series: 原始输入 Series（提供目标索引）
+
+    Returns:
+        与输入索引对齐的结果 Series
+    """
+    result = np.empty_like(out)
+    result[sort_idx] = out
+    return pd.Series(result, index=series.index, name=series.name)
+
+
+def _mask_cross_group(out: np.ndarray, group_ids: np.ndarray, lag: int) -> None:
+    """将跨越组边界的行置为 NaN（原地修改）。
+
+    排序后各组首尾相接，位置 i 的 lag 期运算会错误地引用
+    上一组的尾部数据；此处用组编码比较一次性屏蔽这些行。
+
+    Args:
+        out: 待屏蔽的结果数组
+        group_ids: 排序后的组编码数组
+        lag: 运算的回看期数
+    """
+    if lag <= 0 or len(out) == 0:
+        return
+    out[:lag] = np.nan
+    cross = group_ids[lag:] != group_ids[:-lag]
+    out[lag:][cross] = np.nan
+
+
+def grouped_pct_change(series: pd.Series, periods: int) -> pd.Series:
+    """按 code 分组的百分比变化，等价于 groupby(level="code").pct_change(periods)。
+
+    排序一次后在平铺数组上计算 values[t] / values[t-periods] - 1，
+    并屏蔽跨组行，避免 pandas 按组迭代的开销。
+
+    Args:
+        series: 输入 Series，索引为 MultiIndex(date, code)
+        periods: 变化期数
+
+    Returns:
+        百分比变化 Series，索引与输入一致
+    """
+    key = _memo_key(series, "pct_change", (periods,))
+    cached = _memo_get(key)
+    if cached is not None:
+        return cached
+    values, group_ids, sort_idx = _group_sort(series)
+    out = np.full_like(values, np.nan)
+    if len(values) > periods:
+        out[periods:] = values[periods:] / values[:-periods] - 1
+    _mask_cross_group(out, group_ids, periods)
+    result = _scatter_back(out, sort_idx, series)
+    _memo_put(key, result)
+    return result
+
+
+def grouped_pct_change_combo(
+    series: pd.Series, terms: "list[tuple[int, float]]"
+) -> pd.Series:
+    """按 code 分组计算多个期数百分比变化的加权和（单次排序/回填）。
+
+    等价于 sum(w * groupby(level="code").pct_change(p) for p, w in terms)，
+    但只排序和回填一次，各期变化直接在同一平铺数组上累加，
+    避免为每一项物化完整的中间 Series。
+
+    Args:
+        series: 输入 Series，索引为 MultiIndex(date, code)
+        terms: (期数, 权重) 元组列表
+
+    Returns:
+        加权组合 Series，索引与输入一致
+    """
+    values, group_ids, sort_idx = _group_sort(series)
+    out = np.zeros_like(values)
+    for periods, weight in terms:
+        term = np.full_like(values, np.nan)
+        if len(values) > periods:
+            term[periods:] = values[periods:] / values[:-periods] - 1
+        _mask_cross_group(term, group_ids, periods)
+        out += weight * term
+    return _scatter_back(out, sort_idx, series)
+
+
+def grouped_pct_change_multi(
+    series: pd.Series, periods_list: "list[int]"
+) -> "dict[int, pd.Series]":
+    """按 code 分组一次性计算多个期数的百分比变化。
+
+    共享同一次排序/回填设置，对每个期数只做一条向量化
+    差商，各结果分别写入运行级缓存；动量族因子
+    （5/20/60 日）可由一次调用喂饱。
+
+    Args:
+        series: 输入 Series，索引为 MultiIndex(date, code)
+        periods_list: 期数列表
+
+    Returns:
+        期数 -> 百分比变化 Series 的字典
+    """
+    values, group_ids, sort_idx = _group_sort(series)
+    results: dict[int, pd.Series] = {}
+    for periods in periods_list:
+        key = _memo_key(series, "pct_change", (periods,))
+        cached = _memo_get(key)
+        if cached is not None:
+            results[periods] = cached
+            continue
+        out = np.full_like(values, np.nan)
+        if len(values) > periods:
+            out[periods:] = values[periods:] / values[:-periods] - 1
+        _mask_cross_group(out, group_ids, periods)
+        result = _scatter_back(out, sort_idx, series)
+        _memo_put(key, result)
+        results[periods] = result
+    return results
+
+
+def grouped_shift(series: pd.Series, periods: int) -> pd.Series:
+    """按 code 分组的滞后，等价于 groupby(level="code").shift(periods)。
+
+    Args:
+        series: 输入 Series，索引为 MultiIndex(date, code)
+        periods: 滞后期数（须为正数）
+
+    Returns:
+        滞后后的 Series，索引与输入一致
+    """
+    key = _memo_key(series, "shift", (periods,))
+    cached = _memo_get(key)
+    if cached is not None:
+        return cached
+    values, group_ids, sort_idx = _group_sort(series)
+    out = np.full_like(values, np.nan)
+    if len(values) > periods:
+        out[periods:] = values[:-periods]
+    _mask_cross_group(out, group_ids, periods)
+    result = _scatter_back(out, sort_idx, series)
+    _memo_put(key, result)
+    return result
+
+
+def grouped_diff(series: pd.Series, periods: int = 1) -> pd.Series:
+    """按 code 分组的差分，等价于 groupby(level="code").diff(periods)。
+
+    在预分配数组上计算 values[t] - values[t-periods] 并屏蔽跨组行，
+    结果只构造一次 Series，没有 pandas 分组调度和索引重建。
+
+    Args:
+        series: 输入 Series，索引为 MultiIndex(date, code)
+        periods: 差分期数
+
+    Returns:
+        差分 Series，索引与输入一致
+    """
+    key = _memo_key(series, "diff", (periods,))
+    cached = _memo_get(key)
+    if cached is not None:
+        return cached
+    values, group_ids, sort_idx = _group_sort(series)
+    out = np.full_like(values, np.nan)
+    if len(values) > periods:
+        out[periods:] = values[periods:] - values[:-periods]
+    _mask_cross_group(out, group_ids, periods)
+    result = _scatter_back(out, sort_idx, series)
+    _memo_put(key, result)
+    return result
+
+
+def grouped_cumsum(series: pd.Series) -> pd.Series:
+    """按 code 分组的累计和，等价于 groupby(level="code").cumsum()。
+
+    在排序空间做一次全局 cumsum，再减去各组起始位置之前的
+    前缀和（块偏移技巧），避免逐组迭代。累加在 float64 中
+    进行；NaN 位置输出 NaN 但不中断该组后续累计
+    （与 pandas 跳过 NaN 的语义一致）。
+
+    Args:
+        series: 输入 Series，索引为 MultiIndex(date, code)
+
+    Returns:
+        分组累计和 Series，索引与输入一致
+    """
+    key = _memo_key(series, "cumsum", ())
+    cached = _memo_get(key)
+    if cached is not None:
+        return cached
+    values, group_ids, sort_idx = _group_sort(series)
+    nan_mask = np.isnan(values)
+    vals = np.where(nan_mask, 0.0, values.astype(np.float64, copy=False))
+    out = np.cumsum(vals)
+    starts, ends = _group_bounds(group_ids)
+    if len(starts) > 1:
+        base = np.where(starts > 0, out[starts - 1], 0.0)
+        out -= np.repeat(base, ends - starts)
+    out[nan_mask] = np.nan
+    result = _scatter_back(out, sort_idx, series)
+    _memo_put(key, result)
+    return result
+
+
+def _group_bounds(group_ids: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    """取排序后各组的起止偏移，优先复用排序缓存中的结果。
+
+    Args:
+        group_ids: 排序后的组编码数组（同组连续）
+
+    Returns:
+        (starts, ends) 元组，每组对应半开区间 [start, end)
+    """
+    # 组编码数组来自排序缓存时，边界已随排序一并算好
+    with _run_lock:
+        for entry in _sort_cache.values():
+            if entry[2] is group_ids:
+                return entry[3]
+    return _compute_group_bounds(group_ids)
+
+
+def _compute_group_bounds(group_ids: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    """扫描组编码数组计算各组的起止偏移。
+
+    Args:
+        group_ids: 排序后的组编码数组（同组连续）
+
+    Returns:
+        (starts, ends) 元组，每组对应半开区间 [start, end)
+    """
+    n = len(group_ids)
+    if n == 0:
+        empty = np.empty(0, dtype=np.int64)
+        return empty, empty
+    boundaries = np.flatnonzero(group_ids[1:] != group_ids[:-1]) + 1
+    starts = np.concatenate(([0], boundaries)).astype(np.int64)
+    ends = np.concatenate((boundaries, [n])).astype(np.int64)
+    return starts, ends
+
+
+@njit(cache=True, parallel=True, nogil=True)
+def _rolling_moments_numba(values, starts, ends, window, moment):
+    """按组单遍滑动计算滚动矩统计（numba 并行内核）。
+
+    对每组维护窗口内的 1~4 阶幂和，窗口滑动时增量更新，
+    复杂度 O(N)；moment 取 2/3/4 分别输出样本标准差、
+    无偏偏度和无偏超额峰度。窗口内含 NaN 时输出 NaN。
+
+    Args:
+        values: 排序后的平铺值数组（float64）
+        starts: 各组起始偏移
+        ends: 各组结束偏移
+        window: 滚动窗口长度
+        moment: 输出矩阶数（2=std, 3=skew, 4=kurt）
+
+    Returns:
+        与 values 等长的结果数组
+    """
+    n_total = len(values)
+    out = np.full(n_total, np.nan)
+    w = float(window)
+    for g in prange(len(starts)):
+        s = starts[g]
+        e = ends[g]
+        if e - s < window:
+            continue
+        # 以组内首个有效值为偏移量，降低幂和的数值误差
+        # 显式提升到 float64，float32 输入也用双精度累加
+        offset = np.float64(values[s])
+        if np.isnan(offset):
+            offset = 0.0
+        s1 = 0.0
+        s2 = 0.0
+        s3 = 0.0
+        s4 = 0.0
+        nan_count = 0
+        for i in range(s, e):
+            xi = np.float64(values[i])
+            if np.isnan(xi):
+                nan_count += 1
+            else:
+                x = xi - offset
+                s1 += x
+                s2 += x * x
+                s3 += x * x * x
+                s4 += x * x * x * x
+            j = i - window
+            if j >= s:
+                xj = np.float64(values[j])
+                if np.isnan(xj):
+                    nan_count -= 1
+                else:
+                    x = xj - offset
+                    s1 -= x
+                    s2 -= x * x
+                    s3 -= x * x * x
+                    s4 -= x * x * x * x
+            if i - s < window - 1 or nan_count > 0:
+                continue
+            mean = s1 / w
+            m2 = s2 / w - mean * mean
+            if moment == 2:
+                var = (s2 - s1 * s1 / w) / (w - 1.0)
+                out[i] = np.sqrt(var) if var > 0.0 else 0.0
+            elif moment == 3:
+                if m2 <= 0.0:
+                    continue
+                m3 = s3 / w - 3.0 * mean * (s2 / w) + 2.0 * mean ** 3
+                g1 = m3 / m2 ** 1.5
+                out[i] = np.sqrt(w * (w - 1.0)) / (w - 2.0) * g1
+            else:
+                if m2 <= 0.0:
+                    continue
+                m4 = (
+                    s4 / w
+                    - 4.0 * mean * (s3 / w)
+                    + 6.0 * mean * mean * (s2 / w)
+                    - 3.0 * mean ** 4
+                )
+                g2 = m4 / (m2 * m2) - 3.0
+                out[i] = (w - 1.0) / ((w - 2.0) * (w - 3.0)) * ((w + 1.0) * g2 + 6.0)
+    return out
+
+
+@njit(cache=True, parallel=True, nogil=True)
+def _rolling_extrema_numba(values, starts, ends, window, is_max):
+    """单调双端队列滚动最值（numba 并行内核）。
+
+    经典单调队列算法：队尾弹出所有被新元素支配的下标、
+    队首弹出滑出窗口的下标，队首始终是窗口最值，
+    每个元素至多入队/出队一次，复杂度 O(N)（与窗口无关），
+    优于朴素实现的 O(N*W)。窗口内含 NaN 时输出 NaN。
+
+    Args:
+        values: 排序后的平铺值数组
+        starts: 各组起始偏移
+        ends: 各组结束偏移
+        window: 滚动窗口长度
+        is_max: True 求最大值，False 求最小值
+
+    Returns:
+        与 values 等长的结果数组
+    """
+    n_total = len(values)
+    out = np.full(n_total, np.nan)
+    for g in prange(len(starts)):
+        s = starts[g]
+        e = ends[g]
+        if e - s < window:
+            continue
+        dq = np.empty(e - s, dtype=np.int64)
+        head = 0
+        tail = 0
+        nan_count = 0
+        for i in range(s, e):
+            x = values[i]
+            if np.isnan(x):
+                nan_count += 1
+            else:
+                if is_max:
+                    while tail > head and values[dq[tail - 1]] <= x:
+                        tail -= 1
+                else:
+                    while tail > head and values[dq[tail - 1]] >= x:
+                        tail -= 1
+                dq[tail] = i
+                tail += 1
+            j = i - window
+            if j >= s and np.isnan(values[j]):
+                nan_count -= 1
+            while tail > head and dq[head] <= i - window:
+                head += 1
+            if i - s >= window - 1 and nan_count == 0:
+                out[i] = values[dq[head]]
+    return out
+
+
+@njit(cache=True, parallel=True, nogil=True)
+def _rolling_min_max_numba(low_values, high_values, starts, ends, window):
+    """一次扫描同时计算 low 的滚动最小值和 high 的滚动最大值。
+
+    support_resistance 这类区间因子需要成对的最值；
+    两个单调队列在同一循环内维护，组边界定位、
+    窗口推进等开销只付一次。
+
+    Args:
+        low_values: 排序后的 low 值数组
+        high_values: 排序后的 high 值数组
+        starts: 各组起始偏移
+        ends: 各组结束偏移
+        window: 滚动窗口长度
+
+    Returns:
+        (滚动最小值数组, 滚动最大值数组) 元组
+    """
+    n_total = len(low_values)
+    out_min = np.full(n_total, np.nan)
+    out_max = np.full(n_total, np.nan)
+    for g in prange(len(starts)):
+        s = starts[g]
+        e = ends[g]
+        if e - s < window:
+            continue
+        dq_min = np.empty(e - s, dtype=np.int64)
+        dq_max = np.empty(e - s, dtype=np.int64)
+        head_min = 0
+        tail_min = 0
+        head_max = 0
+        tail_max = 0
+        nan_min = 0
+        nan_max = 0
+        for i in range(s, e):
+            lo = low_values[i]
+            if np.isnan(lo):
+                nan_min += 1
+            else:
+                while tail_min > head_min and low_values[dq_min[tail_min - 1]] >= lo:
+                    tail_min -= 1
+                dq_min[tail_min] = i
+                tail_min += 1
+            hi = high_values[i]
+            if np.isnan(hi):
+                nan_max += 1
+            else:
+                while tail_max > head_max and high_values[dq_max[tail_max - 1]] <= hi:
+                    tail_max -= 1
+                dq_max[tail_max] = i
+                tail_max += 1
+            j = i - window
+            if j >= s:
+                if np.isnan(low_values[j]):
+                    nan_min -= 1
+                if np.isnan(high_values[j]):
+                    nan_max -= 1
+            while tail_min > head_min and dq_min[head_min] <= i - window:
+                head_min += 1
+            while tail_max > head_max and dq_max[head_max] <= i - window:
+                head_max += 1
+            if i - s >= window - 1:
+                if nan_min == 0:
+                    out_min[i] = low_values[dq_min[head_min]]
+                if nan_max == 0:
+                    out_max[i] = high_values[dq_max[head_max]]
+    return out_min, out_max
+
+
+def grouped_rolling_min_max(
+    low: pd.Series, high: pd.Series, window: int
+) -> tuple[pd.Series, pd.Series]:
+    """按 code 分组同时计算 low 的滚动最小值和 high 的滚动最大值。
+
+    两列共享同一次排序设置，numba 可用时在单遍内核中
+    成对维护两个单调队列；否则退化为两次 grouped_rolling。
+
+    Args:
+        low: 取最小值的输入 Series（如最低价）
+        high: 取最大值的输入 Series（如最高价）
+        window: 滚动窗口长度
+
+    Returns:
+        (滚动最小值 Series, 滚动最大值 Series) 元组
+    """
+    if not NUMBA_AVAILABLE:
+        return grouped_rolling(low, window, "min"), grouped_rolling(high, window, "max")
+    key_min = _memo_key(low, "rolling", (window, "min"))
+    key_max = _memo_key(high, "rolling", (window, "max"))
+    cached_min = _memo_get(key_min)
+    cached_max = _memo_get(key_max)
+    if cached_min is not None and cached_max is not None:
+        return cached_min, cached_max
+    low_values, group_ids, sort_idx = _group_sort(low)
+    high_values = high.to_numpy()
+    if high_values.dtype not in (np.float32, np.float64):
+        high_values = high_values.astype(np.float64)
+    high_values = high_values[sort_idx]
+    starts, ends = _group_bounds(group_ids)
+    out_min, out_max = _rolling_min_max_numba(
+        low_values.astype(np.float64, copy=False),
+        high_values.astype(np.float64, copy=False),
+        starts, ends, window,
+    )
+    result_min = _scatter_back(out_min, sort_idx, low)
+    result_max = _scatter_back(out_max, sort_idx, high)
+    _memo_put(key_min, result_min)
+    _memo_put(key_max, result_max)
+    return result_min, result_max
+
+
+@njit(cache=True, parallel=True, nogil=True)
+def _rolling_slope_numba(values, starts, ends, window):
+    """滚动 OLS 斜率的单遍内核（自变量为窗口内位置 0..w-1）。
+
+    闭式解 slope = (Σ k*y - x̄ Σ y) / Σ(k - x̄)²，分母是仅依赖
+    窗口长度的常数；窗口滑动时所有权重减 1，Σ k*y 可由
+    Σ y 增量更新，每步 O(1)。窗口内含 NaN 时输出 NaN
+    （NaN 在累加中按 0 处理并计数，离开窗口后恢复精确值）。
+
+    Args:
+        values: 排序后的平铺值数组
+        starts: 各组起始偏移
+        ends: 各组结束偏移
+        window: 滚动窗口长度
+
+    Returns:
+        与 values 等长的结果数组
+    """
+    n_total = len(values)
+    out = np.full(n_total, np.nan)
+    w = float(window)
+    x_mean = (w - 1.0) / 2.0
+    denom = w * (w * w - 1.0) / 12.0
+    for g in prange(len(starts)):
+        s = starts[g]
+        e = ends[g]
+        if e - s < window:
+            continue
+        s_y = 0.0
+        s_ky = 0.0
+        nan_count = 0
+        for i in range(s, e):
+            xi = np.float64(values[i])
+            if np.isnan(xi):
+                xi = 0.0
+                nan_count += 1
+            j = i - window
+            if j >= s:
+                xj = np.float64(values[j])
+                if np.isnan(xj):
+                    xj = 0.0
+                    nan_count -= 1
+                # 旧元素（权重 0）移出，剩余 w-1 个元素权重整体减 1，
+                # 新元素以最大权重 w-1 进入
+                s_ky = s_ky - (s_y - xj) + (w - 1.0) * xi
+                s_y = s_y - xj + xi
+            else:
+                s_ky += (i - s) * xi
+                s_y += xi
+            if i - s >= window - 1 and nan_count == 0:
+                out[i] = (s_ky - x_mean * s_y) / denom
+    return out
+
+
+def grouped_rolling_slope(series: pd.Series, window: int) -> pd.Series:
+    """按 code 分组的滚动 OLS 斜率（自变量为窗口内位置）。
+
+    等价于 groupby(level="code").rolling(window).apply(线性回归斜率)，
+    但用闭式解和运行和增量更新，单遍完成。
+
+    Args:
+        series: 输入 Series，索引为 MultiIndex(date, code)
+        window: 滚动窗口长度
+
+    Returns:
+        滚动斜率 Series，索引与输入一致
+    """
+    key = _memo_key(series, "rolling", (window, "slope"))
+    cached = _memo_get(key)
+    if cached is not None:
+        return cached
+    values, group_ids, sort_idx = _group_sort(series)
+    if NUMBA_AVAILABLE:
+        starts, ends = _group_bounds(group_ids)
+        out = _rolling_slope_numba(
+            values.astype(np.float64, copy=False), starts, ends, window
+        )
+    else:
+        out = np.full(len(values), np.nan)
+        if len(values) >= window:
+            windows = _rolling_windows(values.astype(np.float64, copy=False), window)
+            k = np.arange(window, dtype=np.float64)
+            x_mean = (window - 1.0) / 2.0
+            denom = window * (window ** 2 - 1.0) / 12.0
+            s_y = windows.sum(axis=-1)
+            s_ky = windows @ k
+            out[window - 1:] = (s_ky - x_mean * s_y) / denom
+        _mask_cross_group(out, group_ids, window - 1)
+    result = _scatter_back(out, sort_idx, series)
+    _memo_put(key, result)
+    return result
+
+
+@njit(cache=True, parallel=True, nogil=True)
+def _rolling_bundle_numba(values, starts, ends, window):
+    """一次扫描同时产出滚动 mean/std/skew/kurt（numba 并行内核）。
+
+    与 _rolling_moments_numba 维护相同的 1~4 阶幂和，但把四个
+    统计量一起写出：批量计算多个因子时，同一列同一窗口的
+    多种滚动统计只需一遍内存扫描，额外代价只是少量寄存器内
+    的算术。
+
+    Args:
+        values: 排序后的平铺值数组（float64）
+        starts: 各组起始偏移
+        ends: 各组结束偏移
+        window: 滚动窗口长度
+
+    Returns:
+        (mean, std, skew, kurt) 四个结果数组的元组
+    """
+    n_total = len(values)
+    out_mean = np.full(n_total, np.nan)
+    out_std = np.full(n_total, np.nan)
+    out_skew = np.full(n_total, np.nan)
+    out_kurt = np.full(n_total, np.nan)
+    w = float(window)
+    for g in prange(len(starts)):
+        s = starts[g]
+        e = ends[g]
+        if e - s < window:
+            continue
+        offset = np.float64(values[s])
+        if np.isnan(offset):
+            offset = 0.0
+        s1 = 0.0
+        s2 = 0.0
+        s3 = 0.0
+        s4 = 0.0
+        nan_count = 0
+        for i in range(s, e):
+            xi = np.float64(values[i])
+            if np.isnan(xi):
+                nan_count += 1
+            else:
+                x = xi - offset
+                s1 += x
+                s2 += x * x
+                s3 += x * x * x
+                s4 += x * x * x * x
+            j = i - window
+            if j >= s:
+                xj = np.float64(values[j])
+                if np.isnan(xj):
+                    nan_count -= 1
+                else:
+                    x = xj - offset
+                    s1 -= x
+                    s2 -= x * x
+                    s3 -= x * x * x
+                    s4 -= x * x * x * x
+            if i - s < window - 1 or nan_count > 0:
+                continue
+            mean = s1 / w
+            out_mean[i] = mean + offset
+            var = (s2 - s1 * s1 / w) / (w - 1.0)
+            out_std[i] = np.sqrt(var) if var > 0.0 else 0.0
+            m2 = s2 / w - mean * mean
+            if m2 <= 0.0:
+                continue
+            m3 = s3 / w - 3.0 * mean * (s2 / w) + 2.0 * mean ** 3
+            g1 = m3 / m2 ** 1.5
+            out_skew[i] = np.sqrt(w * (w - 1.0)) / (w - 2.0) * g1
+            m4 = (
+                s4 / w
+                - 4.0 * mean * (s3 / w)
+                + 6.0 * mean * mean * (s2 / w)
+                - 3.0 * mean ** 4
+            )
+            g2 = m4 / (m2 * m2) - 3.0
+            out_kurt[i] = (w - 1.0) / ((w - 2.0) * (w - 3.0)) * ((w + 1.0) * g2 + 6.0)
+    return out_mean, out_std, out_skew, out_kurt
+
+
+@njit(cache=True, parallel=True, nogil=True)
+def _rolling_sum_numba(values, starts, ends, window, as_mean):
+    """运行和式滚动求和/均值（numba 并行内核）。
+
+    维护一个随窗口滑动增减的累加器，每个元素只读一次，
+    O(N) 且与窗口长度无关；窗口内含 NaN 时输出 NaN。
+
+    Args:
+        values: 排序后的平铺值数组
+        starts: 各组起始偏移
+        ends: 各组结束偏移
+        window: 滚动窗口长度
+        as_mean: True 输出均值，False 输出和
+
+    Returns:
+        与 values 等长的结果数组
+    """
+    n_total = len(values)
+    out = np.full(n_total, np.nan)
+    w = float(window)
+    for g in prange(len(starts)):
+        s = starts[g]
+        e = ends[g]
+        if e - s < window:
+            continue
+        acc = 0.0
+        nan_count = 0
+        for i in range(s, e):
+            xi = np.float64(values[i])
+            if np.isnan(xi):
+                nan_count += 1
+            else:
+                acc += xi
+            j = i - window
+            if j >= s:
+                xj = np.float64(values[j])
+                if np.isnan(xj):
+                    nan_count -= 1
+                else:
+                    acc -= xj
+            if i - s >= window - 1 and nan_count == 0:
+                out[i] = acc / w if as_mean else acc
+    return out
+
+
+@njit(cache=True, parallel=True, nogil=True)
+def _mfi_numba(typical_price, money_flow, starts, ends, window):
+    """资金流量指数（MFI）的单遍内核。
+
+    每组维护正/负资金流两个运行和：典型价格较前一日上涨的
+    资金流入正和，下跌的入负和，窗口滑动时增减对应项。
+    取代逐组两次 rolling(window).sum 加掩码的 pandas 路径。
+    资金流含 NaN 的窗口输出 NaN；价格差为 NaN（组首日）的
+    行与原实现一致按 0 贡献处理。
+
+    Args:
+        typical_price: 排序后的典型价格数组
+        money_flow: 排序后的资金流数组
+        starts: 各组起始偏移
+        ends: 各组结束偏移
+        window: 滚动窗口长度
+
+    Returns:
+        与输入等长的 MFI 结果数组
+    """
+    n_total = len(money_flow)
+    out = np.full(n_total, np.nan)
+    for g in prange(len(starts)):
+        s = starts[g]
+        e = ends[g]
+        if e - s < window:
+            continue
+        pos_sum = 0.0
+        neg_sum = 0.0
+        nan_count = 0
+        for i in range(s, e):
+            mf = np.float64(money_flow[i])
+            if np.isnan(mf):
+                nan_count += 1
+            elif i > s:
+                d = np.float64(typical_price[i]) - np.float64(typical_price[i - 1])
+                if d > 0.0:
+                    pos_sum += mf
+                elif d < 0.0:
+                    neg_sum += mf
+            j = i - window
+            if j >= s:
+                mfj = np.float64(money_flow[j])
+                if np.isnan(mfj):
+                    nan_count -= 1
+                elif j > s:
+                    dj = np.float64(typical_price[j]) - np.float64(
+                        typical_price[j - 1]
+                    )
+                    if dj > 0.0:
+                        pos_sum -= mfj
+                    elif dj < 0.0:
+                        neg_sum -= mfj
+            if i - s >= window - 1 and nan_count == 0:
+                out[i] = 100.0 - 100.0 / (1.0 + pos_sum / (neg_sum + 1e-6))
+    return out
+
+
+def grouped_mfi(
+    typical_price: pd.Series, money_flow: pd.Series, window: int
+) -> pd.Series:
+    """按 code 分组计算资金流量指数（MFI）。
+
+    numba 可用时走单遍运行和内核；否则用分组滚动求和原语
+    按原公式组合。
+
+    Args:
+        typical_price: 典型价格 Series，索引为 MultiIndex(date, code)
+        money_flow: 资金流 Series，索引与 typical_price 一致
+        window: 滚动窗口长度
+
+    Returns:
+        MFI Series，索引与输入一致
+    """
+    if not NUMBA_AVAILABLE:
+        price_diff = typical_price.groupby(level="code").diff()
+        pos = grouped_rolling(money_flow * (price_diff > 0), window, "sum")
+        neg = grouped_rolling(money_flow * (price_diff < 0), window, "sum")
+        return 100 - (100 / (1 + pos / (neg.abs() + 1e-6)))
+    tp_values, group_ids, sort_idx = _group_sort(typical_price)
+    mf_values = money_flow.to_numpy()
+    if mf_values.dtype not in (np.float32, np.float64):
+        mf_values = mf_values.astype(np.float64)
+    mf_values = mf_values[sort_idx]
+    starts, ends = _group_bounds(group_ids)
+    out = _mfi_numba(
+        tp_values.astype(np.float64, copy=False),
+        mf_values.astype(np.float64, copy=False),
+        starts, ends, window,
+    )
+    return _scatter_back(out, sort_idx, money_flow)
+
+
+_BUNDLE_OPS = ("mean", "std", "skew", "kurt")
+
+
+def _rolling_bundle(series: pd.Series, window: int, op: str) -> pd.Series:
+    """单遍计算并缓存同一列同一窗口的全部矩类滚动统计。
+
+    仅在运行级缓存激活时由 grouped_rolling 调用：
+    一次扫描产出 mean/std/skew/kurt 并全部写入缓存，
+    批内随后请求其余统计量时直接命中。
+
+    Args:
+        series: 输入 Series，索引为 MultiIndex(date, code)
+        window: 滚动窗口长度
+        op: 本次请求的统计量名称
+
+    Returns:
+        请求的滚动统计 Series
+    """
+    values, group_ids, sort_idx = _group_sort(series)
+    starts, ends = _group_bounds(group_ids)
+    outs = _rolling_bundle_numba(
+        values.astype(np.float64, copy=False), starts, ends, window
+    )
+    requested = None
+    for name, out in zip(_BUNDLE_OPS, outs):
+        result = _scatter_back(out, sort_idx, series)
+        _memo_put(_memo_key(series, "rolling", (window, name)), result)
+        if name == op:
+            requested = result
+    return requested
+
+
+@njit(cache=True, parallel=True, nogil=True)
+def _rolling_std_welford_numba(values, starts, ends, window):
+    """Welford/Chan 增量法滚动样本标准差（numba 并行内核）。
+
+    维护窗口内的运行均值和二阶中心矩 M2：元素进入时用
+    Welford 更新，离开时用 Chan 的逆更新，每步 O(1) 且
+    无需幂和，数值上比平方和差分更稳定（大均值小方差时
+    不会灾难性抵消）。窗口内含 NaN 时输出 NaN。
+
+    Args:
+        values: 排序后的平铺值数组
+        starts: 各组起始偏移
+        ends: 各组结束偏移
+        window: 滚动窗口长度
+
+    Returns:
+        与 values 等长的结果数组
+    """
+    n_total = len(values)
+    out = np.full(n_total, np.nan)
+    for g in prange(len(starts)):
+        s = starts[g]
+        e = ends[g]
+        if e - s < window:
+            continue
+        mean = 0.0
+        m2 = 0.0
+        count = 0
+        nan_count = 0
+        for i in range(s, e):
+            xi = np.float64(values[i])
+            if np.isnan(xi):
+                nan_count += 1
+            else:
+                count += 1
+                d = xi - mean
+                mean += d / count
+                m2 += d * (xi - mean)
+            j = i - window
+            if j >= s:
+                xj = np.float64(values[j])
+                if np.isnan(xj):
+                    nan_count -= 1
+                else:
+                    d = xj - mean
+                    count -= 1
+                    if count > 0:
+                        mean -= d / count
+                        m2 -= d * (xj - mean)
+                    else:
+                        mean = 0.0
+                        m2 = 0.0
+            if i - s >= window - 1 and nan_count == 0:
+                var = m2 / (count - 1.0)
+                out[i] = np.sqrt(var) if var > 0.0 else 0.0
+    return out
+
+
+_NUMBA_MOMENT_OPS = {"std": 2, "skew": 3, "kurt": 4}
+
+
+if NUMBA_AVAILABLE:
+
+    @guvectorize(
+        [
+            "void(float32[:], int64[:], int64, int64, float64[:])",
+            "void(float64[:], int64[:], int64, int64, float64[:])",
+        ],
+        "(n),(n),(),()->(n)",
+        nopython=True,
+        cache=True,
+    )
+    def _rolling_moments_gu(values, group_ids, window, moment, out):
+        """滚动偏度/峰度的 gufunc 内核（NumPy 兼容的广义 ufunc）。
+
+        输入为已按 (code, date) 排序的整个面板向量及对齐的组编码，
+        单遍扫描维护窗口内 1~4 阶幂和（以组首值为偏移量），
+        遇到组边界时重置累加器，无需按组切片调用。
+        LLVM 为内层循环生成 SIMD 友好的机器码。
+
+        Args:
+            values: 排序后的平铺值数组
+            group_ids: 与 values 对齐的组编码
+            window: 滚动窗口长度
+            moment: 输出矩阶数（3=skew, 4=kurt）
+            out: 输出数组（与 values 等长）
+        """
+        n = len(values)
+        w = float(window)
+        out[:] = np.nan
+        i = 0
+        while i < n:
+            # 定位当前组 [s, e)
+            s = i
+            gid = group_ids[s]
+            e = s + 1
+            while e < n and group_ids[e] == gid:
+                e += 1
+            i = e
+            if e - s < window:
+                continue
+            offset = np.float64(values[s])
+            if np.isnan(offset):
+                offset = 0.0
+            s1 = 0.0
+            s2 = 0.0
+            s3 = 0.0
+            s4 = 0.0
+            nan_count = 0
+            for k in range(s, e):
+                xk = np.float64(values[k])
+                if np.isnan(xk):
+                    nan_count += 1
+                else:
+                    x = xk - offset
+                    s1 += x
+                    s2 += x * x
+                    s3 += x * x * x
+                    s4 += x * x * x * x
+                j = k - window
+                if j >= s:
+                    xj = np.float64(values[j])
+                    if np.isnan(xj):
+                        nan_count -= 1
+                    else:
+                        x = xj - offset
+                        s1 -= x
+                        s2 -= x * x
+                        s3 -= x * x * x
+                        s4 -= x * x * x * x
+                if k - s < window - 1 or nan_count > 0:
+                    continue
+                mean = s1 / w
+                m2 = s2 / w - mean * mean
+                if m2 <= 0.0:
+                    continue
+                if moment == 3:
+                    m3 = s3 / w - 3.0 * mean * (s2 / w) + 2.0 * mean ** 3
+                    g1 = m3 / m2 ** 1.5
+                    out[k] = np.sqrt(w * (w - 1.0)) / (w - 2.0) * g1
+                else:
+                    m4 = (
+                        s4 / w
+                        - 4.0 * mean * (s3 / w)
+                        + 6.0 * mean * mean * (s2 / w)
+                        - 3.0 * mean ** 4
+                    )
+                    g2 = m4 / (m2 * m2) - 3.0
+                    out[k] = (
+                        (w - 1.0) / ((w - 2.0) * (w - 3.0)) * ((w + 1.0) * g2 + 6.0)
+                    )
+
+
+def _rolling_windows(values: np.ndarray, window: int) -> np.ndarray:
+    """构建滚动窗口视图，shape 为 (n - window + 1, window)。"""
+    return np.lib.stride_tricks.sliding_window_view(values, window)
+
+
+def grouped_rolling(series: pd.Series, window: int, op: str) -> pd.Series:
+    """按 code 分组的滚动统计，等价于 groupby(level="code").rolling(window).op()。
+
+    支持的运算：mean / std / min / max / sum / skew / kurt。
+    std 使用样本标准差（ddof=1），skew/kurt 使用与 pandas 一致的
+    无偏修正公式。窗口内含 NaN 时结果为 NaN（即 min_periods=window）。
+
+    Args:
+        series: 输入 Series，索引为 MultiIndex(date, code)
+        window: 滚动窗口长度
+        op: 运算名称
+
+    Returns:
+        滚动统计 Series，索引与输入一致
+
+    Raises:
+        ValueError: 当运算名称不支持时
+    """
+    key = _memo_key(series, "rolling", (window, op))
+    cached = _memo_get(key)
+    if cached is not None:
+        return cached
+
+    # 批量运行中矩类统计走单遍 bundle 内核：同一列同一窗口的
+    # mean/std/skew/kurt 一次扫描全部入缓存，后续请求直接命中
+    if NUMBA_AVAILABLE and key is not None and op in _BUNDLE_OPS and window > 4:
+        return _rolling_bundle(series, window, op)
+
+    values, group_ids, sort_idx = _group_sort(series)
+
+    # mean/sum 走运行和内核：每元素一次增减，O(N) 且与窗口无关
+    if NUMBA_AVAILABLE and op in ("mean", "sum") and window > 1:
+        starts, ends = _group_bounds(group_ids)
+        out = _rolling_sum_numba(
+            values.astype(np.float64, copy=False), starts, ends, window, op == "mean"
+        )
+        result = _scatter_back(out, sort_idx, series)
+        _memo_put(key, result)
+        return result
+
+    # min/max 走单调队列内核：O(N) 且与窗口长度无关
+    if NUMBA_AVAILABLE and op in ("min", "max") and window > 1:
+        starts, ends = _group_bounds(group_ids)
+        out = _rolling_extrema_numba(
+            values.astype(np.float64, copy=False), starts, ends, window, op == "max"
+        )
+        result = _scatter_back(out, sort_idx, series)
+        _memo_put(key, result)
+        return result
+
+    # std/skew/kurt 优先走 numba 单遍内核（无窗口矩阵物化）
+    if NUMBA_AVAILABLE and op in _NUMBA_MOMENT_OPS and window > _NUMBA_MOMENT_OPS[op]:
+        moment = _NUMBA_MOMENT_OPS[op]
+        if moment >= 3:
+            # 偏度/峰度走 gufunc 内核，整段排序向量一次调用
+            out = _rolling_moments_gu(
+                values, group_ids.astype(np.int64), window, moment
+            )
+        else:
+            # 标准差走 Welford/Chan 增量内核（数值稳定的单遍方差）
+            starts, ends = _group_bounds(group_ids)
+            out = _rolling_std_welford_numba(
+                values.astype(np.float64, copy=False), starts, ends, window
+            )
+        result = _scatter_back(out, sort_idx, series)
+        _memo_put(key, result)
+        return result
+
+    out = np.full_like(values, np.nan)
+    if len(values) >= window:
+        # 矩类统计在 float32 输入下仍用 float64 计算，避免灾难性抵消
+        if op in _NUMBA_MOMENT_OPS and values.dtype == np.float32:
+            windows = _rolling_windows(values.astype(np.float64), window)
+        else:
+            windows = _rolling_windows(values, window)
+        if op == "mean":
+            stat = windows.mean(axis=-1)
+        elif op == "std":
+            stat = windows.std(axis=-1, ddof=1)
+        elif op == "min":
+            stat = windows.min(axis=-1)
+        elif op == "max":
+            stat = windows.max(axis=-1)
+        elif op == "sum":
+            stat = windows.sum(axis=-1)
+        elif op == "skew":
+            stat = _window_skew(windows)
+        elif op == "kurt":
+            stat = _window_kurt(windows)
+        else:
+            raise ValueError(f"Unsupported rolling op: {op}")
+        out[window - 1:] = stat
+    _mask_cross_group(out, group_ids, window - 1)
+    result = _scatter_back(out, sort_idx, series)
+    _memo_put(key, result)
+    return result
+
+
+def grouped_rolling_corr(x: pd.Series, y: pd.Series, window: int) -> pd.Series:
+    """按 code 分组的滚动 Pearson 相关系数。
+
+    等价于逐组 rolling(window).corr，由滚动均值/标准差原语
+    组合而成：corr = (E[xy] - E[x]E[y]) * n/(n-1) / (s_x * s_y)。
+    各中间量均可被运行级缓存复用，窗口内任一序列含 NaN 时
+    结果为 NaN（与 min_periods=window 语义一致）。
+
+    Args:
+        x: 第一个输入 Series，索引为 MultiIndex(date, code)
+        y: 第二个输入 Series，索引与 x 一致
+        window: 滚动窗口长度
+
+    Returns:
+        滚动相关系数 Series，索引与输入一致
+    """
+    xy = x * y
+    mean_xy = grouped_rolling(xy, window, "mean")
+    mean_x = grouped_rolling(x, window, "mean")
+    mean_y = grouped_rolling(y, window, "mean")
+    std_x = grouped_rolling(x, window, "std")
+    std_y = grouped_rolling(y, window, "std")
+    cov = (mean_xy - mean_x * mean_y) * (window / (window - 1.0))
+    corr = safe_div(cov, std_x * std_y)
+    return pd.Series(corr, index=x.index, name=x.name)
+
+
+def _window_skew(windows: np.ndarray) -> np.ndarray:
+    """计算每个窗口的无偏样本偏度（与 pandas rolling skew 一致）。"""
+    n = windows.shape[-1]
+    mean = windows.mean(axis=-1, keepdims=True)
+    d = windows - mean
+    m2 = (d ** 2).mean(axis=-1)
+    m3 = (d ** 3).mean(axis=-1)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        g1 = m3 / np.power(m2, 1.5)
+    return np.sqrt(n * (n - 1)) / (n - 2) * g1
+
+
+def _window_kurt(windows: np.ndarray) -> np.ndarray:
+    """计算每个窗口的无偏超额峰度（与 pandas rolling kurt 一致）。"""
+    n = windows.shape[-1]
+    mean = windows.mean(axis=-1, keepdims=True)
+    d = windows - mean
+    m2 = (d ** 2).mean(axis=-1)
+    m4 = (d ** 4).mean(axis=-1)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        g2 = m4 / (m2 ** 2) - 3.0
+    return (n - 1) / ((n - 2) * (n - 3)) * ((n + 1) * g2 + 6.0)
@@ -1,15 +1,61 @@
 """Persistent storage for factors, metadata, and reports."""
 from __future__ import annotations
 
+import copy
 import json
+import os
+from functools import lru_cache
 from pathlib import Path
 from typing import Optional
 
+import numpy as np
 import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
 
 from project.factors.registry import FactorSpec
 
 
+@lru_cache(maxsize=32)
+def _read_values_cached(path: str, mtime_ns: int, factor: str) -> pd.Series:
+    """按 (路径, mtime) 缓存因子值文件的读取结果。
+
+    文件被重写后 mtime 变化，旧缓存项自然失效并被 LRU 淘汰。
+
+    Args:
+        path: parquet 文件路径
+        mtime_ns: 文件修改时间（纳秒），仅用作缓存键
+        factor: 因子名称，用于列投影
+
+    Returns:
+        因子值 Series（调用方应浅拷贝后再使用）
+    """
+    # 只投影索引列和因子值列，文件里混入其它列时不付读取
+    # 代价；self_destruct 让 Arrow 缓冲随转换释放，不留双份
+    try:
+        table = pq.read_table(path, columns=["date", "code", factor])
+    except (KeyError, pa.ArrowInvalid):
+        # 列名与因子名不一致的旧文件走整表读取
+        table = pq.read_table(path)
+    df = table.to_pandas(self_destruct=True, split_blocks=True)
+    return df[factor] if factor in df.columns else df.iloc[:, 0]
+
+
+@lru_cache(maxsize=64)
+def _read_report_cached(path: str, mtime_ns: int) -> dict:
+    """按 (路径, mtime) 缓存评价报告的读取结果。
+
+    Args:
+        path: JSON 文件路径
+        mtime_ns: 文件修改时间（纳秒），仅用作缓存键
+
+    Returns:
+        评价报告字典（调用方应深拷贝后再使用）
+    """
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)
+
+
 class FactorLibrary:
     """因子库持久化存储。
     
@@ -23,15 +69,28 @@ class FactorLibrary:
     
     Attributes:
         root: 因子库根目录路径
+        compression: 因子值 parquet 文件的压缩算法
+        row_group_size: 因子值 parquet 文件的 row group 行数
     """
-    
-    def __init__(self, root: str | Path = "factor_store") -> None:
+
+    def __init__(
+        self,
+        root: str | Path = "factor_store",
+        compression: str = "zstd",
+        row_group_size: int = 1_000_000,
+    ) -> None:
         """初始化因子库。
-        
+
         Args:
             root: 因子库根目录路径
+            compression: parquet 压缩算法，默认 zstd（压缩率接近
+                gzip 而解压快数倍）
+            row_group_size: 每个 row group 的行数，默认 100 万，
+                避免小 row group 带来的读取开销
         """
         self.root = Path(root)
+        self.compression = compression
+        self.row_group_size = row_group_size
 
     def _factor_dir(self, factor: str) -> Path:
         """获取因子目录路径。"""
@@ -49,6 +108,10 @@ class FactorLibrary:
         """获取评价报告文件路径。"""
         return self._factor_dir(factor) / "reports" / f"{version}.json"
 
+    def _report_metrics_path(self, factor: str, version: str) -> Path:
+        """获取评价报告指标 parquet 文件路径。"""
+        return self._factor_dir(factor) / "reports" / f"{version}.parquet"
+
     def _expr_path(self, factor: str, version: str) -> Path:
         """获取表达式文件路径。"""
         return self._factor_dir(factor) / "expressions" / f"{version}.py"
@@ -57,6 +120,60 @@ class FactorLibrary:
         """确保目录存在，不存在则创建。"""
         path.parent.mkdir(parents=True, exist_ok=True)
 
+    @staticmethod
+    def _tmp_path(path: Path) -> Path:
+        """获取目标文件的临时写入路径（同目录，保证同文件系统）。"""
+        return path.with_name(path.name + ".tmp")
+
+    @classmethod
+    def _write_json_atomic(cls, path: Path, obj: dict) -> None:
+        """原子写入 JSON 文件：先写临时文件再 rename 就位。
+
+        进程中途被杀时目标路径要么不存在、要么是完整文件，
+        不会留下半截 JSON。
+
+        Args:
+            path: 目标文件路径
+            obj: 要序列化的字典
+        """
+        tmp = cls._tmp_path(path)
+        # 一次性序列化成 bytes 单次写出，省去 json.dump 经 io
+        # 缓冲的大量小段 write；配合 rename 每个文件一写一换名
+        tmp.write_bytes(json.dumps(obj, indent=2, ensure_ascii=False).encode("utf-8"))
+        os.replace(tmp, path)
+
+    @staticmethod
+    def _report_metrics_table(report: dict) -> Optional[pa.Table]:
+        """将报告中的逐窗口指标摊平成长表。
+
+        (horizon, metric, value) 三列布局让跨因子、跨版本的指标
+        扫描走 parquet 的列投影和谓词下推，不必逐个解析 JSON；
+        metric 列字典编码、value 降为 float32，落盘体积远小于
+        缩进 JSON。嵌套的 extra 不参与摊平，JSON 仍是完整报告
+        的权威来源。
+
+        Args:
+            report: 评价报告字典
+
+        Returns:
+            指标长表；报告无 metrics 时返回 None
+        """
+        horizons: list = []
+        names: list = []
+        vals: list = []
+        for h, metrics in sorted(report.get("metrics", {}).items(), key=lambda kv: int(kv[0])):
+            for metric, value in metrics.items():
+                horizons.append(int(h))
+                names.append(metric)
+                vals.append(float(value))
+        if not horizons:
+            return None
+        return pa.table({
+            "horizon": pa.array(horizons, type=pa.int8()),
+            "metric": pa.array(names, type=pa.string()).dictionary_encode(),
+            "value": pa.array(vals, type=pa.float32()),
+        })
+
     def save_factor(self, spec: FactorSpec, values: pd.Series, report: dict | None = None) -> str:
         """保存因子到库中。
         
@@ -81,24 +198,51 @@ class FactorLibrary:
         if value_path.exists():
             raise FileExistsError(f"Version {spec.version} for factor {spec.name} already exists")
 
+        # float32 对标准化后的因子值精度绰绰有余，体积减半；
+        # code 层转 category 让 parquet 落成字典编码的整数列
+        frame = values.astype(np.float32, copy=False).to_frame(name=spec.name)
+        index = frame.index
+        if isinstance(index, pd.MultiIndex) and "code" in index.names:
+            level = index.names.index("code")
+            frame.index = index.set_levels(
+                index.levels[level].astype("category"), level=level
+            )
+
+        # 全部文件先写临时路径再 rename 就位：写到一半被杀不会
+        # 留下半截 parquet/JSON 让后续加载（或版本解析）中毒
         self._ensure_paths(value_path)
-        values.to_frame(name=spec.name).to_parquet(value_path)
+        value_tmp = self._tmp_path(value_path)
+        frame.to_parquet(
+            value_tmp,
+            compression=self.compression,
+            row_group_size=self.row_group_size,
+        )
+        os.replace(value_tmp, value_path)
 
         meta_path = self._meta_path(spec.name, spec.version)
         self._ensure_paths(meta_path)
-        with meta_path.open("w", encoding="utf-8") as f:
-            json.dump(spec.to_dict(), f, indent=2, ensure_ascii=False)
+        self._write_json_atomic(meta_path, spec.to_dict())
 
         if report is not None:
             report_path = self._report_path(spec.name, spec.version)
             self._ensure_paths(report_path)
-            with report_path.open("w", encoding="utf-8") as f:
-                json.dump(report, f, indent=2, ensure_ascii=False)
+            self._write_json_atomic(report_path, report)
+            metrics_table = self._report_metrics_table(report)
+            if metrics_table is not None:
+                metrics_path = self._report_metrics_path(spec.name, spec.version)
+                metrics_tmp = self._tmp_path(metrics_path)
+                pq.write_table(
+                    metrics_table, metrics_tmp,
+                    compression=self.compression, use_dictionary=True,
+                )
+                os.replace(metrics_tmp, metrics_path)
 
         expr_path = self._expr_path(spec.name, spec.version)
         self._ensure_paths(expr_path)
         if spec.expr:
-            expr_path.write_text(spec.expr, encoding="utf-8")
+            expr_tmp = self._tmp_path(expr_path)
+            expr_tmp.write_bytes(spec.expr.encode("utf-8"))
+            os.replace(expr_tmp, expr_path)
         return str(factor_dir)
 
     def _resolve_version(self, factor: str, version: Optional[str]) -> str:
@@ -120,12 +264,22 @@ class FactorLibrary:
         values_dir = factor_dir / "values"
         if version:
             return version
-        if not values_dir.exists():
+        # scandir 单遍取最大 stem：不构造 Path 对象、不整体排序，
+        # 版本多时比 glob + sorted 省一个 O(n log n)
+        latest: Optional[str] = None
+        try:
+            with os.scandir(values_dir) as entries:
+                for entry in entries:
+                    if not entry.name.endswith(".parquet"):
+                        continue
+                    stem = entry.name[: -len(".parquet")]
+                    if latest is None or stem > latest:
+                        latest = stem
+        except FileNotFoundError:
             raise FileNotFoundError(f"No stored versions found for factor {factor}")
-        versions = sorted(p.stem for p in values_dir.glob("*.parquet"))
-        if not versions:
+        if latest is None:
             raise FileNotFoundError(f"No stored versions found for factor {factor}")
-        return versions[-1]
+        return latest
 
     def load_values(self, factor: str, version: Optional[str] = None) -> pd.Series:
         """加载因子值。
@@ -142,8 +296,9 @@ class FactorLibrary:
         """
         resolved_version = self._resolve_version(factor, version)
         path = self._value_path(factor, resolved_version)
-        df = pd.read_parquet(path)
-        return df.iloc[:, 0]
+        values = _read_values_cached(str(path), path.stat().st_mtime_ns, factor)
+        # 浅拷贝隔离缓存：调用方改名、改索引不污染缓存条目
+        return values.copy(deep=False)
 
     def load_report(self, factor: str, version: Optional[str] = None) -> dict:
         """加载评价报告。
@@ -160,5 +315,15 @@ class FactorLibrary:
         """
         resolved_version = self._resolve_version(factor, version)
         path = self._report_path(factor, resolved_version)
-        with path.open(encoding="utf-8") as f:
-            return json.load(f)
+        report = _read_report_cached(str(path), path.stat().st_mtime_ns)
+        # 报告是小字典，深拷贝隔离缓存，调用方可随意修改
+        return copy.deepcopy(report)
+
+    @staticmethod
+    def clear_cache() -> None:
+        """清空因子值和报告的读取缓存。
+
+        长驻进程在库目录被外部批量改写后可调用本方法强制重读。
+        """
+        _read_values_cached.cache_clear()
+        _read_report_cached.cache_clear()
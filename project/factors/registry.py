@@ -6,22 +6,26 @@ import inspect
 import os
 import sys
 from dataclasses import dataclass
+from functools import lru_cache
+from types import CodeType
 from typing import Callable, Dict, Iterable, List, Optional
 
 import pandas as pd
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class FactorSpec:
     """因子规范数据类。
-    
+
     存储因子的完整元数据信息，包括函数、依赖字段、预处理配置等。
-    
+    slots 省去每实例的 __dict__，frozen 保证注册后规范不可变，
+    需要派生变体时用 dataclasses.replace。
+
     Attributes:
         name: 因子名称
         func: 因子计算函数，接受 DataFrame 返回 Series
-        required_fields: 计算所需的数据字段列表
-        horizons: 评价的时间窗口列表
+        required_fields: 计算所需的数据字段元组
+        horizons: 评价的时间窗口元组
         preprocess: 预处理配置字典
         expr_type: 表达式类型，默认 "python"
         expr: 因子表达式源代码
@@ -34,8 +38,8 @@ class FactorSpec:
     """
     name: str
     func: Callable[[pd.DataFrame], pd.Series]
-    required_fields: Iterable[str]
-    horizons: Iterable[int]
+    required_fields: tuple[str, ...]
+    horizons: tuple[int, ...]
     preprocess: dict | None = None
     expr_type: str = "python"
     expr: str | None = None
@@ -60,6 +64,7 @@ class FactorSpec:
             "expr_type": self.expr_type,
             "expr": self.expr,
             "code_hash": self.code_hash,
+            "code_hash_algo": CODE_HASH_ALGO,
             "module": self.module,
             "qualname": self.qualname,
             "git_commit": self.git_commit,
@@ -71,25 +76,54 @@ class FactorSpec:
 _registry: Dict[str, FactorSpec] = {}
 
 
+# 代码哈希算法标识，随元数据落盘；旧元数据无此字段，视为 sha256
+CODE_HASH_ALGO = "blake2b-128"
+
+
+@lru_cache(maxsize=None)
 def _hash_source(source: str) -> str:
-    """计算源代码的 SHA256 哈希值。
-    
+    """计算源代码的哈希值。
+
+    指纹只需防碰撞、不需抗攻击，blake2b 截断到 128 位比 SHA256
+    快且哈希串减半，元数据里记录算法标识以区分旧记录。
+
     Args:
         source: 源代码字符串
-        
+
     Returns:
-        SHA256 哈希值（十六进制字符串）
+        blake2b-128 哈希值（十六进制字符串）
     """
-    return hashlib.sha256(source.encode()).hexdigest()
+    return hashlib.blake2b(source.encode(), digest_size=16).hexdigest()
+
+
+@lru_cache(maxsize=None)
+def _cached_getsource(code: CodeType) -> str:
+    """按代码对象缓存 inspect.getsource 的结果。
+
+    getsource 每次都要打开源文件并按行扫描；同一文件注册几十个
+    因子时重复读取同一份文件。代码对象可哈希且与源码一一对应，
+    天然适合做缓存键。
+
+    Args:
+        code: 函数的代码对象
+
+    Returns:
+        函数源代码字符串
+    """
+    return inspect.getsource(code)
+
+
+# 环境指纹在进程生命周期内不变，模块加载时算一次
+_ENV_FINGERPRINT = {"python": sys.version, "pandas": pd.__version__}
 
 
 def _env_fingerprint() -> dict:
     """生成环境指纹信息。
-    
+
     Returns:
         包含 Python 和 pandas 版本的字典
     """
-    return {"python": sys.version, "pandas": pd.__version__}
+    return dict(_ENV_FINGERPRINT)
 
 
 def register_factor(
@@ -132,15 +166,15 @@ def register_factor(
         if factor_name in _registry:
             raise ValueError(f"Factor {factor_name} already registered")
 
-        source = inspect.getsource(func)
+        source = _cached_getsource(func.__code__)
         module = func.__module__
         qualname = func.__qualname__
         code_hash = _hash_source(source)
         spec = FactorSpec(
             name=factor_name,
             func=func,
-            required_fields=required_fields or [],
-            horizons=horizons or [],
+            required_fields=tuple(required_fields or ()),
+            horizons=tuple(horizons or ()),
             preprocess=preprocess or {},
             expr_type="python",
             expr=source,
@@ -1,11 +1,113 @@
 """Standardization pipeline for factor values."""
 from __future__ import annotations
 
+import threading
 from abc import ABC, abstractmethod
-from typing import Iterable, List
+from typing import Iterable, List, Optional
 
 import numpy as np
 import pandas as pd
+from numba import jit
+
+
+@jit(nopython=True, cache=True)
+def _fused_winsorize_zscore(
+    values: np.ndarray, starts: np.ndarray, ends: np.ndarray, q: float
+) -> np.ndarray:
+    """单遍完成逐日期截面的缩尾加 Z-Score 标准化。
+
+    对每个日期组：收集非 NaN 值并排序，按线性插值取 q 和 1-q
+    分位数（与 pandas quantile 口径一致），截断后计算均值与样本
+    标准差（ddof=1），输出标准化值。NaN 输入、单样本组和零标准差
+    组输出 NaN，与逐策略串行应用的结果一致。
+
+    Args:
+        values: 按日期分组连续排列的因子值数组
+        starts: 每组起始行偏移
+        ends: 每组结束行偏移（开区间）
+        q: 缩尾分位数
+
+    Returns:
+        标准化后的数组，与 values 等长
+    """
+    out = np.full(values.shape[0], np.nan)
+    for g in range(starts.shape[0]):
+        lo_i = starts[g]
+        hi_i = ends[g]
+        n = 0
+        for i in range(lo_i, hi_i):
+            if not np.isnan(values[i]):
+                n += 1
+        if n < 2:
+            continue
+        buf = np.empty(n, dtype=np.float64)
+        k = 0
+        for i in range(lo_i, hi_i):
+            v = values[i]
+            if not np.isnan(v):
+                buf[k] = v
+                k += 1
+        buf.sort()
+        pos = q * (n - 1)
+        j = int(pos)
+        frac = pos - j
+        lower = buf[j] + frac * (buf[min(j + 1, n - 1)] - buf[j])
+        pos = (1.0 - q) * (n - 1)
+        j = int(pos)
+        frac = pos - j
+        upper = buf[j] + frac * (buf[min(j + 1, n - 1)] - buf[j])
+        # 常数组（或上下界重合、截断后必为常数）标准差恰为 0，
+        # 提前判掉，避免均值舍入误差把方差抬成极小正数
+        if buf[0] == buf[n - 1] or lower == upper:
+            continue
+        s = 0.0
+        for j in range(n):
+            v = buf[j]
+            if v < lower:
+                v = lower
+            elif v > upper:
+                v = upper
+            s += v
+        mean = s / n
+        s2 = 0.0
+        for j in range(n):
+            v = buf[j]
+            if v < lower:
+                v = lower
+            elif v > upper:
+                v = upper
+            d = v - mean
+            s2 += d * d
+        var = s2 / (n - 1)
+        if var <= 0.0:
+            continue
+        std = np.sqrt(var)
+        for i in range(lo_i, hi_i):
+            v = values[i]
+            if np.isnan(v):
+                continue
+            if v < lower:
+                v = lower
+            elif v > upper:
+                v = upper
+            out[i] = (v - mean) / std
+    return out
+
+
+def _date_codes(series: pd.Series) -> tuple[np.ndarray, int]:
+    """提取日期层的整数分组编码。
+
+    sort=True 保证编码顺序与 groupby 聚合结果的索引顺序一致，
+    聚合值可直接用编码数组按行广播。
+
+    Args:
+        series: 带 date 层索引的因子值 Series
+
+    Returns:
+        (每行的日期编码数组, 日期组数) 元组
+    """
+    codes, uniques = pd.factorize(series.index.get_level_values("date"), sort=True)
+    return codes, len(uniques)
 
 
 class PreprocessStrategy(ABC):
@@ -29,34 +131,52 @@ class PreprocessStrategy(ABC):
 
 class WinsorizeStrategy(PreprocessStrategy):
     """缩尾处理策略。
-    
-    将极端值截断到指定分位数水平。
-    
+
+    将极端值截断到指定分位数水平。同一实例可能被评价流水线的
+    多个工作线程并发调用 apply，内部临时缓冲按线程隔离。
+
     Attributes:
         q: 缩尾分位数，默认 0.01 表示截断到 1% 和 99% 分位数
     """
-    
+
     def __init__(self, q: float = 0.01) -> None:
         """初始化缩尾策略。
-        
+
         Args:
             q: 缩尾分位数，范围 (0, 0.5)
         """
         self.q = q
+        # 上下界广播的临时数组按线程复用：同尺寸截面反复调用时
+        # 不再每次分配两个全长 float64 数组。缓冲必须线程局部——
+        # 并发评价共享同一实例，共享缓冲会在 np.take 填充与
+        # np.clip 消费之间被其他线程覆盖
+        self._scratch = threading.local()
 
     def apply(self, series: pd.Series) -> pd.Series:
         """对每个日期截面应用缩尾处理。
-        
+
         Args:
             series: 输入 Series
-            
+
         Returns:
             缩尾后的 Series
         """
+        # 每日期一次 quantile 聚合后按行广播，替代逐组调用
+        # Python lambda 的 transform（每组两次解释器往返）
         grouped_by_date = series.groupby(level="date")
-        lower = grouped_by_date.transform(lambda x: x.quantile(self.q))
-        upper = grouped_by_date.transform(lambda x: x.quantile(1 - self.q))
-        return series.clip(lower=lower, upper=upper)
+        q_low = grouped_by_date.quantile(self.q)
+        q_high = grouped_by_date.quantile(1 - self.q)
+        codes, _ = _date_codes(series)
+        n = codes.shape[0]
+        scratch = self._scratch
+        if getattr(scratch, "lower", None) is None or scratch.lower.shape[0] != n:
+            scratch.lower = np.empty(n, dtype=np.float64)
+            scratch.upper = np.empty(n, dtype=np.float64)
+        lower = np.take(q_low.to_numpy(), codes, out=scratch.lower)
+        upper = np.take(q_high.to_numpy(), codes, out=scratch.upper)
+        # 结果数组随返回的 Series 逃逸，不能复用，只有这一次分配
+        clipped = np.clip(series.to_numpy(), lower, upper)
+        return pd.Series(clipped, index=series.index, name=series.name)
 
 
 class ZScoreStrategy(PreprocessStrategy):
@@ -74,10 +194,29 @@ class ZScoreStrategy(PreprocessStrategy):
         Returns:
             标准化后的 Series
         """
-        grouped_by_date = series.groupby(level="date")
-        mean = grouped_by_date.transform("mean")
-        std = grouped_by_date.transform("std")
-        return (series - mean) / std.replace(0, np.nan)
+        # 一次 factorize 加几个 bincount 完成分组均值/标准差，
+        # 替代两个 groupby.transform（各一次分组哈希和结果广播）
+        codes, n_groups = _date_codes(series)
+        x = np.ascontiguousarray(series.to_numpy(), dtype=np.float64)
+        valid = ~np.isnan(x)
+        count = np.bincount(codes, weights=valid, minlength=n_groups)
+        total = np.bincount(codes, weights=np.where(valid, x, 0.0), minlength=n_groups)
+        with np.errstate(invalid="ignore", divide="ignore"):
+            mean = total / count
+            dev = np.where(valid, x - mean[codes], 0.0)
+            sum_sq = np.bincount(codes, weights=dev * dev, minlength=n_groups)
+            # 样本方差（ddof=1）；单样本组 0/0 自然得到 NaN
+            std = np.sqrt(sum_sq / (count - 1.0))
+        # 常数截面标准差恰为 0（pandas 口径下输出 NaN）；均值舍入
+        # 会让上面的平方和略大于 0，用组内 min==max 精确判定
+        group_min = np.full(n_groups, np.inf)
+        group_max = np.full(n_groups, -np.inf)
+        np.fmin.at(group_min, codes, x)
+        np.fmax.at(group_max, codes, x)
+        std[group_min == group_max] = np.nan
+        with np.errstate(invalid="ignore"):
+            out = (x - mean[codes]) / std[codes]
+        return pd.Series(out, index=series.index, name=series.name)
 
 
 class Standardizer:
@@ -106,11 +245,43 @@ class Standardizer:
         Returns:
             处理后的 Series
         """
+        # 最常见的「缩尾 + Z-Score」流水线走融合核：一次分组遍历
+        # 完成全部计算，省去两个策略各自的 groupby 和中间 Series
+        if (
+            len(self.strategies) == 2
+            and type(self.strategies[0]) is WinsorizeStrategy
+            and type(self.strategies[1]) is ZScoreStrategy
+        ):
+            fused = self._apply_fused(series)
+            if fused is not None:
+                return fused
         result = series
         for strategy in self.strategies:
             result = strategy.apply(result)
         return result
 
+    def _apply_fused(self, series: pd.Series) -> Optional[pd.Series]:
+        """尝试走融合的缩尾加 Z-Score 核。
+
+        要求索引按日期分块连续（行情数据的自然排序），否则返回
+        None 回退到逐策略应用。
+
+        Args:
+            series: 输入因子值 Series
+
+        Returns:
+            标准化后的 Series；索引不满足分组连续时返回 None
+        """
+        codes, _ = pd.factorize(series.index.get_level_values("date"))
+        if codes.shape[0] == 0 or np.any(np.diff(codes) < 0):
+            return None
+        counts = np.bincount(codes)
+        ends = np.cumsum(counts)
+        starts = ends - counts
+        values = np.ascontiguousarray(series.to_numpy(), dtype=np.float64)
+        out = _fused_winsorize_zscore(values, starts, ends, self.strategies[0].q)
+        return pd.Series(out, index=series.index, name=series.name)
+
     @classmethod
     def from_config(cls, config: dict) -> "Standardizer":
         """从配置字典创建标准化器。
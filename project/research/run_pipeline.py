@@ -2,39 +2,216 @@
 from __future__ import annotations
 
 import argparse
+import copy
 import json
+import logging
+import multiprocessing
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from functools import lru_cache
 from pathlib import Path
-from typing import Iterable, Optional
-
-import yaml
-
-from project.data_manager.datasource import LocalParquetSource
-from project.data_manager.universe import DefaultUniverse
-from project.evaluation.admission import (
-    CorrelationRule,
-    FactorAdmissionStandard,
-    ICThresholdRule,
-    TurnoverRule,
-)
-from project.evaluation.evaluator import FactorEvaluator
-from project.evaluation.forward_return import build as build_forward_returns
-from project.factors.engine import FactorEngine
-from project.factors.library import FactorLibrary
-from project.factors.registry import get, register_factor
-from project.factors.standardizer import Standardizer
+from typing import Iterable, List, Optional
+
+logger = logging.getLogger(__name__)
+
+# 重量级依赖（pandas/pyarrow/numba 的传递导入，冷启动约 1 秒）
+# 推迟到真正执行流水线时加载：--help、参数错误等路径不再买单
+_DEPS_LOADED = False
+
+
+def _load_deps() -> None:
+    """按需导入流水线依赖并注入模块命名空间。
+
+    幂等：首次调用执行真正的 import，之后直接返回。
+    """
+    global _DEPS_LOADED
+    if _DEPS_LOADED:
+        return
+    global LocalParquetSource, DefaultUniverse
+    global CorrelationRule, FactorAdmissionStandard, ICThresholdRule, TurnoverRule
+    global FactorEvaluator, build_forward_returns
+    global FactorEngine, FactorLibrary, get, list_all, register_factor, Standardizer
+    from project.data_manager.datasource import LocalParquetSource
+    from project.data_manager.universe import DefaultUniverse
+    from project.evaluation.admission import (
+        CorrelationRule,
+        FactorAdmissionStandard,
+        ICThresholdRule,
+        TurnoverRule,
+    )
+    from project.evaluation.evaluator import FactorEvaluator
+    from project.evaluation.forward_return import build as build_forward_returns
+    from project.factors.engine import FactorEngine
+    from project.factors.library import FactorLibrary
+    from project.factors.registry import get, list_all, register_factor
+    from project.factors.standardizer import Standardizer
+    _DEPS_LOADED = True
+
+
+_LAZY_NAMES = frozenset({
+    "LocalParquetSource", "DefaultUniverse",
+    "CorrelationRule", "FactorAdmissionStandard", "ICThresholdRule", "TurnoverRule",
+    "FactorEvaluator", "build_forward_returns",
+    "FactorEngine", "FactorLibrary", "get", "list_all", "register_factor",
+    "Standardizer",
+})
+
+
+def __getattr__(name: str):
+    """对惰性导入的符号保持 from ... import X 兼容。"""
+    if name in _LAZY_NAMES:
+        _load_deps()
+        return globals()[name]
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+@lru_cache(maxsize=16)
+def _load_config_cached(path: str, mtime_ns: int) -> dict:
+    """按 (路径, mtime) 缓存配置文件的解析结果。
+
+    Args:
+        path: 配置文件路径
+        mtime_ns: 文件修改时间（纳秒），仅用作缓存键
+
+    Returns:
+        配置字典（调用方应深拷贝后再使用）
+    """
+    import yaml
+
+    try:
+        # libyaml 的 C 解析器比纯 Python 实现快一个数量级
+        from yaml import CSafeLoader as loader
+    except ImportError:
+        from yaml import SafeLoader as loader
+    # 二进制打开让 libyaml 直接消费字节流，跳过 Python 层解码
+    with open(path, "rb") as f:
+        return yaml.load(f, Loader=loader)
 
 
 def load_config(path: str | Path) -> dict:
     """加载 YAML 配置文件。
-    
+
+    同一配置在批量评价中被每个因子读一次，按 (路径, mtime)
+    缓存解析结果；返回深拷贝，调用方可随意修改。
+
     Args:
         path: 配置文件路径
-        
+
     Returns:
         配置字典
     """
-    with open(path) as f:
-        return yaml.safe_load(f)
+    # resolve 把相对路径、符号链接归一到规范绝对路径，保证
+    # ./cfg.yaml 与绝对路径命中同一缓存条目
+    path = Path(path).resolve()
+    config = _load_config_cached(str(path), path.stat().st_mtime_ns)
+    return copy.deepcopy(config)
+
+
+@lru_cache(maxsize=4)
+def _prepare_context_cached(path: str, mtime_ns: int) -> dict:
+    """按配置文件版本构建并缓存流水线上下文。
+
+    数据源、标准化器和引擎的构建独立于具体因子，逐因子调用时
+    重复构建是 O(因子数) 的纯浪费，还会丢掉数据源实例上的加载
+    缓存。上下文按 (路径, mtime) 共享，调用方按只读约定使用。
+
+    Args:
+        path: 配置文件路径
+        mtime_ns: 文件修改时间（纳秒），仅用作缓存键
+
+    Returns:
+        含 config / source / standardizer / engine 的上下文字典
+    """
+    config = copy.deepcopy(_load_config_cached(path, mtime_ns))
+    source = LocalParquetSource(config["data"]["processed_path"])
+    standardizer = Standardizer.from_config(config.get("standardizer", {}))
+    engine = FactorEngine(source, standardizer, DefaultUniverse())
+    return {
+        "config": config,
+        "source": source,
+        "standardizer": standardizer,
+        "engine": engine,
+    }
+
+
+def prepare_context(config_path: str | Path) -> dict:
+    """准备（或命中缓存的）流水线上下文。
+
+    Args:
+        config_path: 配置文件路径
+
+    Returns:
+        含 config / source / standardizer / engine 的上下文字典
+    """
+    _load_deps()
+    # 与 load_config 同样按规范绝对路径做缓存键
+    path = Path(config_path).resolve()
+    return _prepare_context_cached(str(path), path.stat().st_mtime_ns)
+
+
+def _build_admission(config: dict) -> FactorAdmissionStandard:
+    """根据配置构建入库标准。
+
+    Args:
+        config: 配置字典
+
+    Returns:
+        配置好的 FactorAdmissionStandard 实例
+    """
+    admission_cfg = config.get("admission", {})
+    rules = [
+        ICThresholdRule(admission_cfg.get("min_ic", 0), admission_cfg.get("min_icir", 0)),
+        TurnoverRule(admission_cfg.get("max_turnover_adj", 1.0)),
+        CorrelationRule(admission_cfg.get("max_abs_corr", 0.85)),
+    ]
+    return FactorAdmissionStandard(rules)
+
+
+# 流水线中间结果缓存：同一 (因子, 窗口, 配置版本) 的因子值、
+# 行情帧和前瞻收益只算一次，evaluate→admit 连跑直接复用；
+# FIFO 控制规模，数据按只读约定使用
+_INTERMEDIATE_CACHE: dict = {}
+_INTERMEDIATE_CACHE_MAX = 8
+
+
+def _pipeline_intermediates(
+    engine, spec, factor_name: str,
+    start: Optional[str], end: Optional[str],
+    cache_key: tuple,
+):
+    """计算（或命中缓存的）因子值和前瞻收益。
+
+    行情帧只在前瞻收益构建期间存活：此处不再持有引用，其生命
+    周期完全交给数据源的加载缓存管理，评价阶段的峰值内存只含
+    因子值与前瞻收益。
+
+    Args:
+        engine: 因子引擎实例
+        spec: 因子规范
+        factor_name: 因子名称
+        start: 起始日期字符串
+        end: 结束日期字符串
+        cache_key: 缓存键，需包含配置文件版本信息
+
+    Returns:
+        (因子值 Series, 前瞻收益字典) 元组
+    """
+    cached = _INTERMEDIATE_CACHE.get(cache_key)
+    if cached is not None:
+        return cached
+    # 因子计算和前瞻收益共用同一次数据加载；字段取因子声明
+    # 与收盘价的并集，保证不依赖 close 的因子也能构建前瞻收益
+    fields = tuple(dict.fromkeys([*spec.required_fields, "close"]))
+    factor_values, df = engine.compute_with_frame(
+        factor_name, start=start, end=end, fields=fields
+    )
+    fwd = build_forward_returns(df, spec.horizons, price_col="close")
+    del df
+    if len(_INTERMEDIATE_CACHE) >= _INTERMEDIATE_CACHE_MAX:
+        _INTERMEDIATE_CACHE.pop(next(iter(_INTERMEDIATE_CACHE)))
+    _INTERMEDIATE_CACHE[cache_key] = (factor_values, fwd)
+    return factor_values, fwd
 
 
 def run_and_maybe_admit(
@@ -43,6 +220,7 @@ def run_and_maybe_admit(
     end: Optional[str],
     mode: str,
     config_path: str | Path = "project/config.yaml",
+    report_out: Optional[str | Path] = None,
 ) -> None:
     """执行因子评价和可选的入库流程。
     
@@ -61,35 +239,36 @@ def run_and_maybe_admit(
         mode: 运行模式
             - "evaluate": 仅评价并输出报告
             - "admit": 评价后若通过则入库
-            - "batch": 批量处理（未实现）
+            批量处理请使用 run_batch
         config_path: 配置文件路径
+        report_out: 评价报告输出文件路径；None 时打印到标准输出
+            （文件落盘一次序列化单次写出，绕开终端逐行刷新）
         
     Raises:
         各种异常（数据加载失败、因子不存在等）
     """
-    config = load_config(config_path)
-    source = LocalParquetSource(config["data"]["processed_path"])
-    standardizer = Standardizer.from_config(config.get("standardizer", {}))
-    engine = FactorEngine(source, standardizer, DefaultUniverse())
+    ctx = prepare_context(config_path)
+    config = ctx["config"]
+    engine = ctx["engine"]
     spec = get(factor_name)
 
-    factor_values = engine.compute(factor_name, start=start, end=end)
-    df = source.load(start=start, end=end, fields=spec.required_fields)
-    fwd = build_forward_returns(df, spec.horizons, price_col="close")
+    cfg_path = Path(config_path)
+    cache_key = (factor_name, start, end, str(cfg_path), cfg_path.stat().st_mtime_ns)
+    factor_values, fwd = _pipeline_intermediates(
+        engine, spec, factor_name, start, end, cache_key
+    )
     evaluator = FactorEvaluator(spec.horizons)
     report = evaluator.evaluate(factor_values, fwd)
 
     if mode == "evaluate":
-        print(json.dumps(report.to_dict(), indent=2))
+        payload = json.dumps(report.to_dict(), indent=2)
+        if report_out is not None:
+            Path(report_out).write_bytes(payload.encode("utf-8"))
+        else:
+            print(payload)
         return
 
-    admission_cfg = config.get("admission", {})
-    rules = [
-        ICThresholdRule(admission_cfg.get("min_ic", 0), admission_cfg.get("min_icir", 0)),
-        TurnoverRule(admission_cfg.get("max_turnover_adj", 1.0)),
-        CorrelationRule(admission_cfg.get("max_abs_corr", 0.85)),
-    ]
-    admission = FactorAdmissionStandard(rules)
+    admission = _build_admission(config)
     passed, reasons = admission.judge(report)
 
     if not passed:
@@ -104,6 +283,270 @@ def run_and_maybe_admit(
         print("Admission passed (mode does not save)")
 
 
+# 批量模式的共享上下文：在 fork 前填充，worker 进程按写时复制
+# 继承，行情帧和前瞻收益不经过序列化传递
+_BATCH_CTX: Optional[dict] = None
+
+
+def _fork_safe() -> bool:
+    """判断当前进程是否可以安全 fork 出 worker。
+
+    numba 并行运行时（TBB 线程层）一旦在本进程启动过，fork 之后
+    父进程的线程层销毁会在解释器退出时死锁。此时批量模式退回
+    spawn，worker 在 initializer 中自行重建上下文。
+
+    Returns:
+        True 表示并行运行时尚未启动，fork 安全
+    """
+    try:
+        from numba.np.ufunc.parallel import _is_initialized
+    except ImportError:
+        return True
+    return not _is_initialized
+
+
+def _init_batch_worker(
+    config_path: str,
+    start: Optional[str],
+    end: Optional[str],
+    fields: tuple,
+    horizons: tuple,
+    mode: str,
+    factor_modules: tuple,
+) -> None:
+    """worker 进程的一次性初始化：准备共享评价上下文。
+
+    fork 启动的 worker 已按写时复制继承父进程的 _BATCH_CTX，
+    直接返回；spawn 启动的 worker 从零重建——重新导入注册因子
+    的模块、加载行情并构建前瞻收益。每 worker 一次，而非每因子
+    一次。
+
+    Args:
+        config_path: 配置文件路径（规范绝对路径）
+        start: 起始日期字符串
+        end: 结束日期字符串
+        fields: 加载字段元组
+        horizons: 前瞻收益持有期元组
+        mode: 每个因子的运行模式
+        factor_modules: 注册因子的模块名元组（spawn 下重新导入）
+    """
+    global _BATCH_CTX
+    if _BATCH_CTX is not None:
+        return
+    import importlib
+
+    for module in factor_modules:
+        if module and module != "__main__":
+            importlib.import_module(module)
+    ctx = prepare_context(config_path)
+    df = ctx["source"].load(start=start, end=end, fields=fields)
+    fwd = build_forward_returns(df, list(horizons), price_col="close")
+    del df
+    _BATCH_CTX = {
+        "engine": ctx["engine"],
+        "fields": fields,
+        "fwd": fwd,
+        "start": start,
+        "end": end,
+        "mode": mode,
+        "config": ctx["config"],
+    }
+
+
+def _batch_eval_one(
+    factor_name: str,
+) -> tuple[str, bool, str, Optional[dict], Optional[bool]]:
+    """在 worker 进程中评价（并按模式入库）单个因子。
+
+    从 fork 继承的 _BATCH_CTX 读取共享的引擎、字段并集和前瞻
+    收益，只补算因子自身的计算与评价。
+
+    Args:
+        factor_name: 因子名称
+
+    Returns:
+        (因子名称, 是否成功, 结果描述, 评价报告字典, 是否通过
+        入库) 元组；失败时报告为 None，evaluate 模式下入库结论
+        为 None
+    """
+    ctx = _BATCH_CTX
+    try:
+        spec = get(factor_name)
+        factor_values, _ = ctx["engine"].compute_with_frame(
+            factor_name, start=ctx["start"], end=ctx["end"], fields=ctx["fields"]
+        )
+        fwd = {h: ctx["fwd"][h] for h in spec.horizons}
+        evaluator = FactorEvaluator(spec.horizons)
+        report = evaluator.evaluate(factor_values, fwd)
+        report_dict = report.to_dict()
+
+        if ctx["mode"] == "evaluate":
+            return factor_name, True, "evaluated", report_dict, None
+
+        admission = _build_admission(ctx["config"])
+        passed, reasons = admission.judge(report)
+        if not passed:
+            return factor_name, True, f"admission failed: {reasons}", report_dict, False
+        if ctx["mode"] == "admit":
+            library = FactorLibrary(ctx["config"].get("library", {}).get("root", "factor_store"))
+            library.save_factor(spec, factor_values, report_dict)
+            return factor_name, True, "saved to library", report_dict, True
+        return factor_name, True, "admission passed (mode does not save)", report_dict, True
+    except Exception as exc:  # 单因子失败不影响批次其余因子
+        return factor_name, False, str(exc), None, None
+
+
+def run_batch(
+    factor_names: Iterable[str],
+    start: Optional[str],
+    end: Optional[str],
+    mode: str = "admit",
+    config_path: str | Path = "project/config.yaml",
+    max_workers: Optional[int] = None,
+    report_path: Optional[str | Path] = None,
+) -> None:
+    """批量执行因子评价/入库：共享加载，按因子并行评价。
+
+    逐因子调用 run_and_maybe_admit 会把同一份行情读 N 次、把
+    共同持有期的前瞻收益建 N 次。批量模式先取全部因子
+    required_fields 的并集做一次投影加载、对持有期并集构建一次
+    前瞻收益，然后在进程池中按因子扇出计算与评价——行情帧和
+    前瞻收益通过 fork 写时复制共享，不经序列化。本进程已启动过
+    numba 并行运行时时 fork 不再安全，退回 spawn 并由每个
+    worker 的 initializer 重建一次上下文。
+
+    Args:
+        factor_names: 因子名称的可迭代对象
+        start: 起始日期字符串
+        end: 结束日期字符串
+        mode: 每个因子的运行模式（"evaluate" 或 "admit"）
+        config_path: 配置文件路径
+        max_workers: 进程数，None 时取 CPU 核数与因子数的较小值
+        report_path: 汇总报告 parquet 输出路径，None 时写入当前
+            目录的 report_<时间戳>.parquet
+    """
+    global _BATCH_CTX
+    _load_deps()
+    names = list(dict.fromkeys(factor_names))
+    if not names:
+        print("No factors to run")
+        return
+    ctx = prepare_context(config_path)
+    config = ctx["config"]
+    source = ctx["source"]
+    engine = ctx["engine"]
+
+    specs = []
+    failed = []
+    for name in names:
+        try:
+            specs.append(get(name))
+        except KeyError as exc:
+            failed.append(name)
+            print(f"Factor {name} failed: {exc}")
+    if not specs:
+        print(f"Batch finished: 0/{len(names)} succeeded")
+        return
+
+    # 字段并集 + close：一次投影加载喂饱所有因子和前瞻收益
+    fields = tuple(dict.fromkeys(
+        [field for spec in specs for field in spec.required_fields] + ["close"]
+    ))
+    horizons = tuple(sorted({h for spec in specs for h in spec.horizons}))
+
+    if max_workers is None:
+        max_workers = min(len(specs), os.cpu_count() or 1)
+    # fork 可用时在父进程加载一次、worker 写时复制继承；并行
+    # 运行时已启动则退回 spawn，加载推迟到 worker 的 initializer
+    fork_safe = _fork_safe()
+    if fork_safe:
+        df = source.load(start=start, end=end, fields=fields)
+        fwd = build_forward_returns(df, list(horizons), price_col="close")
+        del df
+        _BATCH_CTX = {
+            "engine": engine,
+            "fields": fields,
+            "fwd": fwd,
+            "start": start,
+            "end": end,
+            "mode": mode,
+            "config": config,
+        }
+    init_args = (
+        str(Path(config_path).resolve()), start, end, fields, horizons, mode,
+        tuple(sorted({spec.module for spec in specs if spec.module})),
+    )
+    # 逐因子进度走 stderr 的单行日志；指标收集到行列表，批次
+    # 结束后一次性写成 parquet——几百个因子时逐因子向 stdout
+    # 打 JSON 会让 worker 串行排队在终端刷新后面
+    rows: List[dict] = []
+    try:
+        with ProcessPoolExecutor(
+            max_workers=max_workers,
+            mp_context=multiprocessing.get_context("fork" if fork_safe else "spawn"),
+            initializer=_init_batch_worker,
+            initargs=init_args,
+        ) as pool:
+            for name, ok, message, report, passed in pool.map(
+                _batch_eval_one, [spec.name for spec in specs]
+            ):
+                if not ok:
+                    failed.append(name)
+                    logger.warning("factor %s failed: %s", name, message)
+                    continue
+                logger.info("factor %s: %s", name, message)
+                best = report.get("best_horizon")
+                for h, metrics in sorted(
+                    report.get("metrics", {}).items(), key=lambda kv: int(kv[0])
+                ):
+                    rows.append({
+                        "factor": name,
+                        "horizon": int(h),
+                        "rank_ic_mean": float(metrics["rank_ic_mean"]),
+                        "icir": float(metrics["icir"]),
+                        "turnover_adjusted": float(metrics["turnover_adjusted"]),
+                        "best_horizon": best,
+                        "passed": passed,
+                        "note": message,
+                    })
+    finally:
+        _BATCH_CTX = None
+
+    if rows:
+        if report_path is None:
+            report_path = Path(f"report_{time.strftime('%Y%m%d_%H%M%S')}.parquet")
+        report_path = Path(report_path)
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+
+        pq.write_table(
+            pa.Table.from_pylist(rows), report_path,
+            compression="zstd", use_dictionary=True,
+        )
+        print(f"Batch report written to {report_path}")
+    print(f"Batch finished: {len(names) - len(failed)}/{len(names)} succeeded")
+
+
+def _resolve_factor_names(spec: str) -> List[str]:
+    """解析批量模式的因子名列表。
+
+    Args:
+        spec: 'all'、逗号分隔的因子名，或 @file（每行一个因子名，
+            # 开头的行视为注释）
+
+    Returns:
+        因子名列表
+    """
+    if spec == "all":
+        _load_deps()
+        return list_all()
+    if spec.startswith("@"):
+        lines = Path(spec[1:]).read_text(encoding="utf-8").splitlines()
+        return [line.strip() for line in lines
+                if line.strip() and not line.lstrip().startswith("#")]
+    return [name for name in spec.split(",") if name]
+
+
 def parse_args() -> argparse.Namespace:
     """解析命令行参数。
     
@@ -111,13 +554,26 @@ def parse_args() -> argparse.Namespace:
         包含解析后参数的 Namespace 对象
     """
     parser = argparse.ArgumentParser(description="Run factor evaluation and optional admission")
-    parser.add_argument("factor", help="Registered factor name")
+    parser.add_argument("factor", nargs="?", default=None,
+                        help="Registered factor name; with --mode batch, a "
+                             "comma-separated list or 'all'")
+    parser.add_argument("--factors", default=None,
+                        help="Batch over these factors: a comma-separated "
+                             "list, 'all', or @file with one name per line")
     parser.add_argument("--start", help="Start date (YYYY-MM-DD)")
     parser.add_argument("--end", help="End date (YYYY-MM-DD)")
     parser.add_argument("--mode", choices=["evaluate", "admit", "batch"], default="evaluate",
-                        help="Mode: evaluate only, or admit to library if passes")
+                        help="Mode: evaluate only, admit to library if passes, "
+                             "or batch-admit across a process pool")
     parser.add_argument("--config", default="project/config.yaml",
                         help="Path to config file")
+    parser.add_argument("--report-out", default=None,
+                        help="Evaluate mode: write the report JSON to this "
+                             "file instead of stdout. Batch mode: path of the "
+                             "consolidated report parquet (default: "
+                             "report_<timestamp>.parquet)")
+    parser.add_argument("--jobs", type=int, default=None,
+                        help="Worker processes for batch mode (default: CPU count)")
     return parser.parse_args()
 
 
@@ -130,7 +586,21 @@ def main() -> None:
         python -m project.research.run_pipeline momentum --start 2020-01-01 --end 2020-12-31 --mode admit
     """
     args = parse_args()
-    run_and_maybe_admit(args.factor, args.start, args.end, args.mode, args.config)
+    if args.factor is None and args.factors is None:
+        raise SystemExit("Provide a factor name or --factors")
+    # --help / 参数错误已在 parse_args 内退出，走到这里才需要依赖
+    _load_deps()
+    if args.factors is not None or args.mode == "batch":
+        logging.basicConfig(level=logging.INFO, format="%(message)s")
+        spec = args.factors if args.factors is not None else args.factor
+        names = _resolve_factor_names(spec)
+        # --mode batch 历史语义为批量入库；--factors 则尊重 --mode
+        batch_mode = "admit" if args.mode == "batch" else args.mode
+        run_batch(names, args.start, args.end, batch_mode, args.config, args.jobs,
+                  report_path=args.report_out)
+    else:
+        run_and_maybe_admit(args.factor, args.start, args.end, args.mode, args.config,
+                            report_out=args.report_out)
 
 
 if __name__ == "__main__":